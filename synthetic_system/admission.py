@@ -0,0 +1,169 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Optional, Tuple
+
+
+class AdmissionDecision(Enum):
+    ACCEPTED = "accepted"
+    REJECTED = "rejected"
+    DEFERRED = "deferred"
+
+
+@dataclass
+class AdmissionResult:
+    decision: AdmissionDecision
+    query_id: Optional[str]
+    reason: str = ""
+    estimated_wait_s: float = 0.0
+    retry_after_s: Optional[float] = None
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+    
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def take(self, now: float, tokens: float = 1) -> bool:
+        self._refill(now)
+        if self.tokens < tokens:
+            return False
+        self.tokens -= tokens
+        return True
+    
+    def wait_time(self, now: float, tokens: float = 1) -> float:
+        self._refill(now)
+        return max(0.0, (tokens - self.tokens) / self.rate) if self.rate > 0 else float("inf")
+
+
+class AdmissionController:
+    
+    def __init__(self, max_queue: int = 10000, priority_shares: Optional[Dict[int, float]] = None,
+                 max_wait_s: Optional[Dict[int, float]] = None, max_deferred: int = 10000,
+                 customer_rate: float = 5.0, customer_burst: float = 20, max_customers: int = 100000,
+                 rate_window_s: float = 30.0, baseline_rate: float = 0.0, clock=time.monotonic):
+        self.max_queue = max_queue
+        self.priority_shares = priority_shares or {}
+        self.max_wait = max_wait_s or {}
+        self.max_deferred = max_deferred
+        self.customer_rate = customer_rate
+        self.customer_burst = customer_burst
+        self.max_customers = max_customers
+        self.rate_window = rate_window_s
+        self.baseline_rate = baseline_rate
+        self.clock = clock
+        self._lock = threading.Lock()
+        
+        self.buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.dispatches: deque = deque()
+        self.dispatch_count = 0
+        self.decisions: Dict[Tuple[str, str], int] = {}
+    
+    def _bucket(self, customer_id: str, now: float) -> TokenBucket:
+        bucket = self.buckets.get(customer_id)
+        if bucket is None:
+            bucket = TokenBucket(self.customer_rate, self.customer_burst, now)
+            self.buckets[customer_id] = bucket
+            if len(self.buckets) > self.max_customers:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(customer_id)
+        return bucket
+    
+    def _expire_dispatches(self, now: float):
+        while self.dispatches and self.dispatches[0][0] <= now - self.rate_window:
+            _, count = self.dispatches.popleft()
+            self.dispatch_count -= count
+    
+    def record_dispatch(self, count: int = 1):
+        with self._lock:
+            now = self.clock()
+            second = int(now)
+            if self.dispatches and self.dispatches[-1][0] == second:
+                self.dispatches[-1][1] += count
+            else:
+                self.dispatches.append([second, count])
+            self.dispatch_count += count
+            self._expire_dispatches(now)
+    
+    def set_baseline_rate(self, rate: float):
+        with self._lock:
+            self.baseline_rate = max(rate, 0.0)
+    
+    def _service_rate(self, now: float) -> float:
+        self._expire_dispatches(now)
+        if not self.dispatches:
+            return self.baseline_rate
+        return self.dispatch_count / max(now - self.dispatches[0][0], 1.0)
+    
+    def _estimate_wait(self, level: int, depth_by_level: Dict[int, int], now: float) -> float:
+        ahead = sum(depth for queued_level, depth in depth_by_level.items() if queued_level >= level)
+        if ahead == 0:
+            return 0.0
+        
+        rate = self._service_rate(now)
+        return ahead / rate if rate > 0 else float("inf")
+    
+    def _over_quota(self, level: int, depth_by_level: Dict[int, int]) -> bool:
+        return sum(depth_by_level.values()) >= self.max_queue * self.priority_shares.get(level, 1.0)
+    
+    def service_rate(self) -> float:
+        with self._lock:
+            return self._service_rate(self.clock())
+    
+    def estimate_wait(self, level: int, depth_by_level: Dict[int, int]) -> float:
+        with self._lock:
+            return self._estimate_wait(level, depth_by_level, self.clock())
+    
+    def can_resume(self, level: int, depth_by_level: Dict[int, int]) -> bool:
+        if self._over_quota(level, depth_by_level):
+            return False
+        
+        limit = self.max_wait.get(level)
+        return limit is None or self.estimate_wait(level, depth_by_level) <= limit
+    
+    def _decide(self, decision: AdmissionDecision, reason: str, estimated_wait: float = 0.0,
+                retry_after: Optional[float] = None) -> Tuple[AdmissionDecision, str, float, Optional[float]]:
+        key = (decision.value, reason or "ok")
+        self.decisions[key] = self.decisions.get(key, 0) + 1
+        return decision, reason, estimated_wait, retry_after
+    
+    def admit(self, customer_id: str, level: int, depth_by_level: Dict[int, int],
+              deferred: int = 0) -> Tuple[AdmissionDecision, str, float, Optional[float]]:
+        with self._lock:
+            now = self.clock()
+            
+            if self._over_quota(level, depth_by_level):
+                return self._decide(AdmissionDecision.REJECTED, "queue_full")
+            
+            bucket = self._bucket(customer_id, now)
+            if not bucket.take(now):
+                return self._decide(AdmissionDecision.REJECTED, "rate_limited", retry_after=bucket.wait_time(now))
+            
+            estimated_wait = self._estimate_wait(level, depth_by_level, now)
+            limit = self.max_wait.get(level)
+            if limit is not None and estimated_wait > limit:
+                retry_after = estimated_wait - limit if estimated_wait != float("inf") else None
+                if deferred < self.max_deferred:
+                    return self._decide(AdmissionDecision.DEFERRED, "estimated_wait", estimated_wait, retry_after)
+                return self._decide(AdmissionDecision.REJECTED, "estimated_wait", estimated_wait, retry_after)
+            
+            return self._decide(AdmissionDecision.ACCEPTED, "", estimated_wait)
+    
+    def get_stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "service_rate_per_s": round(self._service_rate(self.clock()), 2),
+                "tracked_customers": len(self.buckets),
+                "decisions": {f"{decision}:{reason}": count for (decision, reason), count in self.decisions.items()}
+            }
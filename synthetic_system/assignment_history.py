@@ -0,0 +1,267 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class AssignmentRecord:
+    __slots__ = ("assignment_id", "query_id", "customer_id", "query_text", "priority", "submitted_at",
+                 "interviewer_id", "interviewer_name", "target_interviewees", "estimated_start_time",
+                 "estimated_completion_time", "status", "priority_score")
+    
+    def __init__(self, assignment_id: str, query_id: str, customer_id: str, query_text: str, priority: str,
+                 submitted_at: float, interviewer_id: str, interviewer_name: str,
+                 target_interviewees: Tuple[str, ...], estimated_start_time: float,
+                 estimated_completion_time: float, status: str, priority_score: float):
+        self.assignment_id = assignment_id
+        self.query_id = query_id
+        self.customer_id = customer_id
+        self.query_text = query_text
+        self.priority = priority
+        self.submitted_at = submitted_at
+        self.interviewer_id = interviewer_id
+        self.interviewer_name = interviewer_name
+        self.target_interviewees = target_interviewees
+        self.estimated_start_time = estimated_start_time
+        self.estimated_completion_time = estimated_completion_time
+        self.status = status
+        self.priority_score = priority_score
+    
+    @classmethod
+    def from_assignment(cls, assignment) -> "AssignmentRecord":
+        return cls(
+            assignment_id=assignment.assignment_id,
+            query_id=assignment.query.query_id,
+            customer_id=assignment.query.customer_id,
+            query_text=assignment.query.query_text,
+            priority=assignment.query.priority.name,
+            submitted_at=assignment.query.timestamp.timestamp(),
+            interviewer_id=assignment.interviewer.interviewer_id,
+            interviewer_name=assignment.interviewer.name,
+            target_interviewees=tuple(assignment.target_interviewees),
+            estimated_start_time=assignment.estimated_start_time.timestamp(),
+            estimated_completion_time=assignment.estimated_completion_time.timestamp(),
+            status=assignment.status,
+            priority_score=assignment.priority_score
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AssignmentRecord":
+        data = dict(data)
+        data["target_interviewees"] = tuple(data["target_interviewees"])
+        return cls(**data)
+
+
+class SegmentFilter:
+    __slots__ = ("bits", "size", "hashes")
+    
+    def __init__(self, keys: int = 0, bits_per_key: int = 10, hashes: int = 7, bits: Optional[bytes] = None):
+        self.bits = bytearray(bits) if bits is not None else bytearray(max(keys * bits_per_key // 8, 8))
+        self.size = len(self.bits) * 8
+        self.hashes = hashes
+    
+    def _positions(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * step) % self.size for i in range(self.hashes)]
+    
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+    
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+    
+    @classmethod
+    def from_keys(cls, keys) -> "SegmentFilter":
+        keys = list(keys)
+        segment_filter = cls(len(keys))
+        for key in keys:
+            segment_filter.add(key)
+        return segment_filter
+
+
+class AssignmentLog:
+    
+    def __init__(self, directory: str, segment_records: int = 10000, cached_indexes: int = 4):
+        self.directory = directory
+        self.segment_records = segment_records
+        self.cached_indexes = cached_indexes
+        os.makedirs(directory, exist_ok=True)
+        
+        self.sealed_segments: List[int] = []
+        self.segment_filters: Dict[int, SegmentFilter] = {}
+        self._index_cache: "OrderedDict[int, Dict[str, int]]" = OrderedDict()
+        self.records_written = 0
+        
+        segments = sorted(
+            int(name[len("segment_"):-len(".log")]) for name in os.listdir(directory)
+            if name.startswith("segment_") and name.endswith(".log")
+        )
+        for segment in segments:
+            if os.path.exists(self._index_path(segment)):
+                self.sealed_segments.append(segment)
+                self.segment_filters[segment] = self._load_filter(segment)
+                with open(self._index_path(segment)) as f:
+                    self.records_written += len(json.load(f))
+        
+        if segments and segments[-1] not in self.sealed_segments:
+            self.active_segment = segments[-1]
+        else:
+            self.active_segment = segments[-1] + 1 if segments else 0
+        self.active_index, valid_bytes = self._scan_segment(self.active_segment)
+        self.records_written += len(self.active_index)
+        self.active_file = open(self._log_path(self.active_segment), "ab")
+        if self.active_file.tell() > valid_bytes:
+            self.active_file.truncate(valid_bytes)
+            self.active_file.seek(valid_bytes)
+    
+    def _log_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"segment_{segment:06d}.log")
+    
+    def _index_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"segment_{segment:06d}.idx")
+    
+    def _filter_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"segment_{segment:06d}.bloom")
+    
+    def _write_filter(self, segment: int, segment_filter: SegmentFilter):
+        with open(self._filter_path(segment), "wb") as f:
+            f.write(segment_filter.bits)
+    
+    def _load_filter(self, segment: int) -> SegmentFilter:
+        path = self._filter_path(segment)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return SegmentFilter(bits=f.read())
+        
+        with open(self._index_path(segment)) as f:
+            segment_filter = SegmentFilter.from_keys(json.load(f))
+        self._write_filter(segment, segment_filter)
+        return segment_filter
+    
+    def _scan_segment(self, segment: int) -> Tuple[Dict[str, int], int]:
+        index = {}
+        offset = 0
+        path = self._log_path(segment)
+        if not os.path.exists(path):
+            return index, offset
+        
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    index[json.loads(line)["assignment_id"]] = offset
+                except (ValueError, KeyError):
+                    break
+                offset += len(line)
+        return index, offset
+    
+    def append(self, record: AssignmentRecord):
+        offset = self.active_file.tell()
+        self.active_file.write(json.dumps(record.to_dict()).encode('utf-8') + b"\n")
+        self.active_file.flush()
+        self.active_index[record.assignment_id] = offset
+        self.records_written += 1
+        
+        if len(self.active_index) >= self.segment_records:
+            self._seal()
+    
+    def _seal(self):
+        self.active_file.close()
+        segment_filter = SegmentFilter.from_keys(self.active_index)
+        self._write_filter(self.active_segment, segment_filter)
+        with open(self._index_path(self.active_segment), "w") as f:
+            json.dump(self.active_index, f)
+        
+        self.sealed_segments.append(self.active_segment)
+        self.segment_filters[self.active_segment] = segment_filter
+        self.active_segment += 1
+        self.active_index = {}
+        self.active_file = open(self._log_path(self.active_segment), "ab")
+    
+    def _sealed_index(self, segment: int) -> Dict[str, int]:
+        index = self._index_cache.get(segment)
+        if index is None:
+            with open(self._index_path(segment)) as f:
+                index = json.load(f)
+            self._index_cache[segment] = index
+            if len(self._index_cache) > self.cached_indexes:
+                self._index_cache.popitem(last=False)
+        else:
+            self._index_cache.move_to_end(segment)
+        return index
+    
+    def _read(self, segment: int, offset: int) -> AssignmentRecord:
+        with open(self._log_path(segment), "rb") as f:
+            f.seek(offset)
+            return AssignmentRecord.from_dict(json.loads(f.readline()))
+    
+    def get(self, assignment_id: str) -> Optional[AssignmentRecord]:
+        offset = self.active_index.get(assignment_id)
+        if offset is not None:
+            return self._read(self.active_segment, offset)
+        
+        for segment in reversed(self.sealed_segments):
+            if assignment_id not in self.segment_filters[segment]:
+                continue
+            offset = self._sealed_index(segment).get(assignment_id)
+            if offset is not None:
+                return self._read(segment, offset)
+        return None
+    
+    def close(self):
+        self.active_file.close()
+
+
+class AssignmentHistory:
+    
+    def __init__(self, directory: Optional[str] = "assignment_history", recent_size: int = 1000,
+                 segment_records: int = 10000):
+        self.recent: "deque[AssignmentRecord]" = deque()
+        self.recent_by_id: Dict[str, AssignmentRecord] = {}
+        self.recent_size = recent_size
+        self.log = AssignmentLog(directory, segment_records) if directory else None
+        self.total = self.log.records_written if self.log is not None else 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return self.total
+    
+    def add(self, assignment) -> AssignmentRecord:
+        record = AssignmentRecord.from_assignment(assignment)
+        with self._lock:
+            if self.log is not None:
+                self.log.append(record)
+            
+            self.recent.append(record)
+            self.recent_by_id[record.assignment_id] = record
+            if len(self.recent) > self.recent_size:
+                evicted = self.recent.popleft()
+                del self.recent_by_id[evicted.assignment_id]
+            
+            self.total += 1
+        return record
+    
+    def get(self, assignment_id: str) -> Optional[AssignmentRecord]:
+        with self._lock:
+            record = self.recent_by_id.get(assignment_id)
+            if record is None and self.log is not None:
+                record = self.log.get(assignment_id)
+            return record
+    
+    def recent_ids(self, limit: Optional[int] = None) -> List[str]:
+        with self._lock:
+            ids = [record.assignment_id for record in self.recent]
+        return ids if limit is None else ids[:limit]
+    
+    def close(self):
+        if self.log is not None:
+            self.log.close()
@@ -0,0 +1,194 @@
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, Optional
+from rag import AsyncQdrantRAG
+from demographic_index import DemographicIndex
+from routing import (RoutingCore, CustomerQuery, InterviewAssignment, QueryPriority,
+                     PRIORITY_SEARCH_TIERS, wait_budgets_by_level)
+from query_scheduler import AsyncQueryScheduler
+
+
+class AsyncInterviewRoutingSystem(RoutingCore):
+    def __init__(self, rag_system: AsyncQdrantRAG, max_in_flight: int = 1000, aging_seconds: float = 30.0,
+                 history_dir: Optional[str] = "assignment_history", metrics_port: Optional[int] = None,
+                 demographic_index: Optional[DemographicIndex] = None, metrics_host: str = "127.0.0.1"):
+        super().__init__(rag_system, history_dir, metrics_port, metrics_host=metrics_host)
+        self.demographic_index = demographic_index
+        self.query_queue = AsyncQueryScheduler(wait_budgets_by_level(), aging_seconds=aging_seconds)
+        self.max_in_flight = max_in_flight
+        self.in_flight = asyncio.Semaphore(max_in_flight)
+        self.query_tasks = set()
+        
+        self.running = False
+        self.processor_task = None
+        self.monitor_task = None
+    
+    async def start(self):
+        self.running = True
+        self.processor_task = asyncio.create_task(self._process_queue())
+        self.monitor_task = asyncio.create_task(self._monitor_system())
+    
+    async def submit_query(self, customer_id: str, query_text: str,
+                           priority: QueryPriority = QueryPriority.NORMAL,
+                           expected_duration: int = 60,
+                           category: str = "general",
+                           demographics: Optional[Dict[str, Any]] = None) -> str:
+        
+        query = self._create_query(customer_id, query_text, priority, expected_duration, category)
+        self._attach_demographics(query, demographics)
+        
+        await self.query_queue.put(query)
+        self.metrics.count("submitted", priority.name)
+        
+        if self.verbose:
+            self.log.info("query_submitted", f"Query submitted: {query.query_id} - '{query_text[:50]}...'",
+                          sampled=True, query_id=query.query_id, priority=priority.name)
+        return query.query_id
+    
+    async def _process_query(self, query: CustomerQuery) -> Optional[InterviewAssignment]:
+        start = time.perf_counter()
+        rag_result = await self.rag_system.query_with_embedding(
+            query.query_text, query.category, tier=PRIORITY_SEARCH_TIERS[query.priority],
+            interviewee_ids=query.interviewee_ids
+        )
+        self.metrics.observe("rag_latency_ms", (time.perf_counter() - start) * 1000)
+        
+        best_interviewer = self._reserve_or_park(query, rag_result)
+        
+        if not best_interviewer:
+            return None
+        
+        return self._create_assignment(query, best_interviewer, rag_result[0])
+    
+    async def _handle_query(self, query: CustomerQuery):
+        try:
+            if self.verbose:
+                self.log.info("query_processing", f"Processing query: {query.query_id}",
+                              sampled=True, query_id=query.query_id)
+            
+            assignment = await self._process_query(query)
+            
+            if assignment:
+                self._register_assignment(assignment)
+                
+                self._log_assignment(assignment)
+                
+                self._simulate_interview_progress(assignment)
+        
+        except Exception as e:
+            self.log.error("query_failed", f"Error processing query: {e}", query_id=query.query_id)
+        finally:
+            self.in_flight.release()
+    
+    async def _process_queue(self):
+        while self.running:
+            query = await self.query_queue.get()
+            self.metrics.observe("queue_wait_ms", self._query_age_ms(query))
+            
+            await self.in_flight.acquire()
+            task = asyncio.create_task(self._handle_query(query))
+            self.query_tasks.add(task)
+            task.add_done_callback(self.query_tasks.discard)
+    
+    def _simulate_interview_progress(self, assignment: InterviewAssignment):
+        delay = self.interview_duration(assignment)
+        self.completion_timers[assignment.assignment_id] = asyncio.create_task(
+            self._complete_interview(assignment, delay)
+        )
+    
+    async def _complete_interview(self, assignment: InterviewAssignment, delay: float):
+        await asyncio.sleep(delay)
+        
+        if self._release_assignment(assignment, "completed") and self.verbose:
+            self.log.info("interview_completed", f"Interview completed: {assignment.assignment_id}",
+                          sampled=True, assignment_id=assignment.assignment_id)
+    
+    def cancel_assignment(self, assignment_id: str) -> bool:
+        timer = self.completion_timers.get(assignment_id)
+        if timer is not None:
+            timer.cancel()
+        
+        assignment = self.active_assignments.get(assignment_id)
+        if not assignment or not self._release_assignment(assignment, "cancelled"):
+            return False
+        
+        self.log.info("assignment_cancelled", f"Assignment cancelled: {assignment_id}", assignment_id=assignment_id)
+        return True
+    
+    async def _monitor_system(self):
+        while self.running:
+            await asyncio.sleep(30)
+            
+            self._update_metrics()
+            self._simulate_status_changes()
+    
+    async def shutdown(self):
+        self.log.info("router_shutdown", "Shutting down routing system...")
+        self.running = False
+        
+        tasks = [task for task in (self.processor_task, self.monitor_task) if task is not None]
+        tasks.extend(self.query_tasks)
+        tasks.extend(self.completion_timers.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        await self.rag_system.close()
+        self.assignment_history.close()
+        if self.metrics_exporter:
+            self.metrics_exporter.shutdown()
+        self.log.info("router_stopped", "Routing system shutdown complete.")
+        self.log.flush()
+
+
+async def run_demo():
+    print("Starting Async Interview Routing System Demo")
+    print("=" * 60)
+    
+    rag_system = AsyncQdrantRAG()
+    routing_system = AsyncInterviewRoutingSystem(rag_system)
+    await routing_system.start()
+    
+    test_queries = [
+        ("CUST_001", "What are some favorites in the headphones category and what makes them successful", QueryPriority.NORMAL),
+        ("CUST_002", "What do users think of my airfryer lineup of the brand COSORI", QueryPriority.HIGH),
+        ("CUST_003", "What features do popular non-analog watches on the market have", QueryPriority.NORMAL),
+        ("CUST_004", "How does battery life play into consumer appeal", QueryPriority.URGENT),
+        ("CUST_005", "Why are electric toothbrushes popular", QueryPriority.LOW),
+        ("CUST_006", "What makes a good fitness tracker", QueryPriority.NORMAL),
+        ("CUST_007", "Kitchen appliance preferences for small apartments", QueryPriority.HIGH),
+    ]
+    
+    print("\nSubmitting customer queries...")
+    await asyncio.gather(*[
+        routing_system.submit_query(
+            customer_id=customer_id,
+            query_text=query_text,
+            priority=priority,
+            expected_duration=random.randint(45, 75)
+        )
+        for customer_id, query_text, priority in test_queries
+    ])
+    
+    print("\nMonitoring system performance...")
+    for i in range(4):
+        await asyncio.sleep(30)
+        status = routing_system.get_system_status()
+        
+        print(f"\nSystem Status (Check {i+1}/4):")
+        print(f"  Active Assignments: {status['active_assignments']}")
+        print(f"  Completed: {status['completed_assignments']}")
+        print(f"  Queue Size: {status['queue_size']}")
+        print(f"  Available Interviewers: {status['available_interviewers']}/{status['total_interviewers']}")
+    
+    print("\nFinal System Report:")
+    print(json.dumps(routing_system.get_system_status(include_interviewers=True), indent=2))
+    
+    await routing_system.shutdown()
+    print("\nDemo completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_demo())
@@ -0,0 +1,329 @@
+import argparse
+import json
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import numpy as np
+from data_generation import (DEMOGRAPHICS, RACE_WEIGHTS, REGIONS, INTERVIEWERS, INTERVIEW_TYPES, INTERVIEW_LOCATIONS,
+                             RECORDING_QUALITIES, COMPENSATION_AMOUNTS, RECRUITMENT_CHANNELS)
+from demographic_index import DemographicIndex, parse_income_range
+
+AGE_BOUNDS = [25, 30, 35, 40, 45, 50, 55, 60, 65]
+AGE_RANGES = ["18-24", "25-29", "30-34", "35-39", "40-44", "45-49", "50-54", "55-59", "60-64", "65+"]
+NON_WORKING = ['unemployed', 'retired', 'student']
+BASE_DATE = date(2024, 1, 1)
+ID_WIDTH = 3
+
+
+def _state_region(state: str) -> str:
+    for region, states in REGIONS.items():
+        if state in states:
+            return region
+    return 'other'
+
+
+def build_vocabularies() -> Dict[str, List[Any]]:
+    industries = list(DEMOGRAPHICS['occupations'])
+    return {
+        "name": [name for gender in DEMOGRAPHICS['genders'] for name in DEMOGRAPHICS['names'][gender]],
+        "gender": list(DEMOGRAPHICS['genders']),
+        "race": list(DEMOGRAPHICS['races']),
+        "education_level": list(DEMOGRAPHICS['education_levels']),
+        "employment_status": list(DEMOGRAPHICS['employment_statuses']),
+        "income_range": list(DEMOGRAPHICS['income_ranges']),
+        "city": [city for city, _ in DEMOGRAPHICS['cities']],
+        "state": sorted({state for _, state in DEMOGRAPHICS['cities']}),
+        "region": list(REGIONS) + ['other'],
+        "industry": industries + ['none'],
+        "occupation": [occupation for industry in industries for occupation in DEMOGRAPHICS['occupations'][industry]]
+                      + NON_WORKING,
+        "recruitment_channel": list(RECRUITMENT_CHANNELS),
+        "interview_type": list(INTERVIEW_TYPES),
+        "interview_location": list(INTERVIEW_LOCATIONS),
+        "recording_quality": list(RECORDING_QUALITIES),
+        "interviewer_id": list(INTERVIEWERS),
+        "age_range": list(AGE_RANGES),
+    }
+
+
+class BulkProfileGenerator:
+    
+    def __init__(self, seed: Optional[int] = None, chunk_size: int = 100000):
+        self.seed = seed if seed is not None else int(np.random.SeedSequence().entropy)
+        self.chunk_size = chunk_size
+        self.vocabularies = build_vocabularies()
+        vocab = self.vocabularies
+        
+        self.name_offsets = np.cumsum([0] + [len(DEMOGRAPHICS['names'][gender]) for gender in vocab["gender"]])
+        self.race_weights = np.array(RACE_WEIGHTS, dtype=np.float64)
+        self.second_race_cdf = np.cumsum(
+            np.where(np.eye(len(RACE_WEIGHTS), dtype=bool), 0.0, self.race_weights), axis=1
+        )
+        
+        industries = list(DEMOGRAPHICS['occupations'])
+        self.occupation_offsets = np.cumsum([0] + [len(DEMOGRAPHICS['occupations'][industry]) for industry in industries])
+        self.employment_idle = np.array([status in NON_WORKING for status in vocab["employment_status"]])
+        self.employment_occupation = np.array([
+            vocab["occupation"].index(status) if status in NON_WORKING else -1 for status in vocab["employment_status"]
+        ])
+        
+        city_states = [state for _, state in DEMOGRAPHICS['cities']]
+        self.city_state = np.array([vocab["state"].index(state) for state in city_states])
+        self.city_region = np.array([vocab["region"].index(_state_region(state)) for state in city_states])
+        
+        qualities = np.array(list(RECORDING_QUALITIES.values()), dtype=np.float64)
+        self.quality_p = qualities / qualities.sum()
+        self.compensation = np.array(COMPENSATION_AMOUNTS, dtype=np.int64)
+    
+    def _chunk_rngs(self, total: int) -> List[np.random.Generator]:
+        chunks = (total + self.chunk_size - 1) // self.chunk_size
+        return [np.random.default_rng(seed) for seed in np.random.SeedSequence(self.seed).spawn(chunks)]
+    
+    def sample(self, rng: np.random.Generator, start: int, n: int) -> Dict[str, np.ndarray]:
+        vocab = self.vocabularies
+        columns: Dict[str, np.ndarray] = {"row": np.arange(start, start + n, dtype=np.int64)}
+        
+        columns["age"] = rng.integers(18, 75, n, dtype=np.int16)
+        gender = rng.integers(0, len(vocab["gender"]), n, dtype=np.int8)
+        columns["gender"] = gender
+        name_counts = np.diff(self.name_offsets)
+        columns["name"] = (self.name_offsets[gender] + (rng.random(n) * name_counts[gender]).astype(np.int64)).astype(np.int16)
+        
+        columns["race_1"] = rng.choice(len(self.race_weights), n, p=self.race_weights / self.race_weights.sum()).astype(np.int8)
+        cdf = self.second_race_cdf[columns["race_1"]]
+        second = (rng.random(n)[:, None] * cdf[:, -1:] >= cdf).sum(axis=1).astype(np.int8)
+        columns["race_2"] = np.where(rng.integers(1, 3, n) == 2, second, -1).astype(np.int8)
+        
+        columns["education_level"] = rng.integers(0, len(vocab["education_level"]), n, dtype=np.int8)
+        employment = rng.integers(0, len(vocab["employment_status"]), n, dtype=np.int8)
+        columns["employment_status"] = employment
+        columns["income_range"] = rng.integers(0, len(vocab["income_range"]), n, dtype=np.int8)
+        columns["city"] = rng.integers(0, len(vocab["city"]), n, dtype=np.int8)
+        
+        industry = rng.integers(0, len(self.occupation_offsets) - 1, n)
+        occupation_counts = np.diff(self.occupation_offsets)
+        occupation = self.occupation_offsets[industry] + (rng.random(n) * occupation_counts[industry]).astype(np.int64)
+        idle = self.employment_idle[employment]
+        columns["industry"] = np.where(idle, len(vocab["industry"]) - 1, industry).astype(np.int8)
+        columns["occupation"] = np.where(idle, self.employment_occupation[employment], occupation).astype(np.int8)
+        
+        counts = rng.integers(1, 5, n, dtype=np.int8)
+        columns["interview_count"] = counts
+        owner = np.repeat(np.arange(n), counts)
+        total = len(owner)
+        
+        columns["interview_day"] = rng.integers(0, 366, total, dtype=np.int16)
+        columns["start_hour"] = rng.integers(9, 18, total, dtype=np.int8)
+        columns["start_minute"] = (rng.integers(0, 4, total) * 15).astype(np.int8)
+        columns["end_hour"] = rng.integers(9, 18, total, dtype=np.int8)
+        columns["end_minute"] = (rng.integers(0, 4, total) * 15).astype(np.int8)
+        columns["end_offset"] = rng.integers(30, 91, total, dtype=np.int16)
+        duration = rng.integers(30, 91, total, dtype=np.int16)
+        columns["duration_minutes"] = duration
+        columns["interview_type"] = rng.integers(0, len(vocab["interview_type"]), total, dtype=np.int8)
+        columns["interviewer_id"] = rng.integers(0, len(vocab["interviewer_id"]), total, dtype=np.int8)
+        columns["interview_location"] = rng.integers(0, len(vocab["interview_location"]), total, dtype=np.int8)
+        columns["recording_quality"] = rng.choice(len(self.quality_p), total, p=self.quality_p).astype(np.int8)
+        columns["transcript_confidence_score"] = rng.uniform(0.75, 0.98, total)
+        compensation = self.compensation[rng.integers(0, len(self.compensation), total)]
+        columns["compensation_amount"] = compensation.astype(np.int16)
+        
+        total_compensation = np.bincount(owner, weights=compensation, minlength=n)
+        total_duration = np.bincount(owner, weights=duration, minlength=n)
+        columns["total_compensation"] = total_compensation.astype(np.int32)
+        columns["hourly_compensation_rate"] = np.round(total_compensation / (total_duration / 60), 2)
+        
+        columns["recruitment_channel"] = rng.integers(0, len(vocab["recruitment_channel"]), n, dtype=np.int8)
+        return columns
+    
+    def iter_chunks(self, total: int) -> Iterator[Dict[str, np.ndarray]]:
+        for index, rng in enumerate(self._chunk_rngs(total)):
+            start = index * self.chunk_size
+            yield self.sample(rng, start, min(self.chunk_size, total - start))
+    
+    def to_profiles(self, columns: Dict[str, np.ndarray], width: int = ID_WIDTH) -> Iterator[Dict[str, Any]]:
+        vocab = self.vocabularies
+        days = [BASE_DATE + timedelta(days=day) for day in range(366)]
+        day_iso = [day.isoformat() for day in days]
+        day_compact = [day.strftime('%Y%m%d') for day in days]
+        
+        profile_columns = {key: columns[key].tolist() for key in (
+            "row", "age", "gender", "name", "race_1", "race_2", "education_level", "employment_status",
+            "income_range", "city", "industry", "occupation", "interview_count", "total_compensation",
+            "hourly_compensation_rate", "recruitment_channel"
+        )}
+        interview_columns = {key: columns[key].tolist() for key in (
+            "interview_day", "start_hour", "start_minute", "end_hour", "end_minute", "end_offset", "duration_minutes",
+            "interview_type", "interviewer_id", "interview_location", "recording_quality",
+            "transcript_confidence_score", "compensation_amount"
+        )}
+        states = self.city_state.tolist()
+        regions = self.city_region.tolist()
+        age_ranges = {age: AGE_RANGES[index] for age, index in
+                      zip(range(18, 75), np.searchsorted(AGE_BOUNDS, np.arange(18, 75), side="right").tolist())}
+        
+        position = 0
+        for i in range(len(profile_columns["row"])):
+            number = str(profile_columns["row"][i] + 1).zfill(width)
+            age = profile_columns["age"][i]
+            race = [vocab["race"][profile_columns["race_1"][i]]]
+            if profile_columns["race_2"][i] >= 0:
+                race.append(vocab["race"][profile_columns["race_2"][i]])
+            
+            interviews = []
+            for j in range(position, position + profile_columns["interview_count"][i]):
+                day = interview_columns["interview_day"][j]
+                end = interview_columns["end_hour"][j] * 60 + interview_columns["end_minute"][j] + interview_columns["end_offset"][j]
+                interviews.append({
+                    "interview_id": f"IV_{number}_{day_compact[day]}",
+                    "date": day_iso[day],
+                    "start_time": f"{day_iso[day]}T{interview_columns['start_hour'][j]:02d}:{interview_columns['start_minute'][j]:02d}:00Z",
+                    "end_time": f"{day_iso[day]}T{end // 60:02d}:{end % 60:02d}:00Z",
+                    "duration_minutes": interview_columns["duration_minutes"][j],
+                    "interview_type": vocab["interview_type"][interview_columns["interview_type"][j]],
+                    "interviewer_id": vocab["interviewer_id"][interview_columns["interviewer_id"][j]],
+                    "location": vocab["interview_location"][interview_columns["interview_location"][j]],
+                    "recording_quality": vocab["recording_quality"][interview_columns["recording_quality"][j]],
+                    "transcript_confidence_score": interview_columns["transcript_confidence_score"][j],
+                    "completion_status": "completed",
+                    "transcript_file": f"transcript_IV_{number}_{day_compact[day]}.json",
+                    "compensation_amount": interview_columns["compensation_amount"][j]
+                })
+            position += profile_columns["interview_count"][i]
+            
+            city = profile_columns["city"][i]
+            yield {
+                "interviewee_id": f"INT_{number}",
+                "personal_info": {
+                    "name": vocab["name"][profile_columns["name"][i]],
+                    "age": age,
+                    "age_range": age_ranges[age],
+                    "gender": vocab["gender"][profile_columns["gender"][i]],
+                    "race_ethnicity": race,
+                    "education_level": vocab["education_level"][profile_columns["education_level"][i]],
+                    "employment_status": vocab["employment_status"][profile_columns["employment_status"][i]],
+                    "occupation": vocab["occupation"][profile_columns["occupation"][i]],
+                    "industry": vocab["industry"][profile_columns["industry"][i]],
+                    "income_range": vocab["income_range"][profile_columns["income_range"][i]],
+                    "location": {
+                        "city": vocab["city"][city],
+                        "state": vocab["state"][states[city]],
+                        "country": "US",
+                        "region": vocab["region"][regions[city]]
+                    }
+                },
+                "interviews": interviews,
+                "study_participation": {
+                    "recruitment_channel": vocab["recruitment_channel"][profile_columns["recruitment_channel"][i]],
+                    "total_interviews_completed": profile_columns["interview_count"][i],
+                    "total_compensation": profile_columns["total_compensation"][i],
+                    "hourly_compensation_rate": profile_columns["hourly_compensation_rate"][i]
+                }
+            }
+    
+    def write(self, total: int, output_dir: str = "bulk_profiles", output_format: str = "columnar") -> List[Path]:
+        directory = Path(output_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        
+        for index, columns in enumerate(self.iter_chunks(total)):
+            if output_format == "columnar":
+                path = directory / f"profiles_{index:05d}.npz"
+                np.savez(path, **columns)
+            elif output_format == "jsonl":
+                path = directory / f"profiles_{index:05d}.jsonl"
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.writelines(json.dumps(profile) + "\n" for profile in self.to_profiles(columns))
+            else:
+                raise ValueError(f"Unknown output format: {output_format}")
+            paths.append(path)
+        
+        with open(directory / "schema.json", 'w', encoding='utf-8') as f:
+            json.dump({
+                "format": output_format,
+                "count": total,
+                "seed": self.seed,
+                "chunk_size": self.chunk_size,
+                "id_width": ID_WIDTH,
+                "vocabularies": self.vocabularies
+            }, f, indent=2)
+        return paths
+
+
+def load_columnar(output_dir: str = "bulk_profiles") -> Iterator[Dict[str, np.ndarray]]:
+    for path in sorted(Path(output_dir).glob("profiles_*.npz")):
+        with np.load(path) as chunk:
+            yield {key: chunk[key] for key in chunk.files}
+
+
+def load_demographic_index(output_dir: str = "bulk_profiles", **kwargs) -> DemographicIndex:
+    with open(Path(output_dir) / "schema.json", 'r', encoding='utf-8') as f:
+        schema = json.load(f)
+    vocab = schema["vocabularies"]
+    generator = BulkProfileGenerator(schema["seed"], schema["chunk_size"])
+    
+    chunks = list(load_columnar(output_dir))
+    
+    def column(key: str) -> np.ndarray:
+        return np.concatenate([chunk[key] for chunk in chunks]).astype(np.int64)
+    
+    rows = column("row")
+    count = len(rows)
+    all_rows = np.arange(count)
+    owners = np.repeat(all_rows, column("interview_count"))
+    
+    race_1, race_2 = column("race_1"), column("race_2")
+    has_second = race_2 >= 0
+    city = column("city")
+    age = column("age")
+    incomes = np.array([parse_income_range(income) for income in vocab["income_range"]])
+    income = column("income_range")
+    
+    categorical = {
+        "age_range": (all_rows, np.searchsorted(AGE_BOUNDS, age, side="right"), vocab["age_range"]),
+        "race_ethnicity": (np.concatenate([all_rows, all_rows[has_second]]),
+                           np.concatenate([race_1, race_2[has_second]]), vocab["race"]),
+        "state": (all_rows, generator.city_state[city], vocab["state"]),
+        "region": (all_rows, generator.city_region[city], vocab["region"]),
+        "interview_type": (owners, column("interview_type"), vocab["interview_type"]),
+        "interview_location": (owners, column("interview_location"), vocab["interview_location"]),
+    }
+    for field in ("gender", "education_level", "employment_status", "occupation", "industry", "income_range",
+                  "city", "recruitment_channel"):
+        categorical[field] = (all_rows, column(field), vocab[field])
+    
+    numeric = {
+        "age": age,
+        "total_interviews": column("interview_count"),
+        "total_compensation": column("total_compensation"),
+        "hourly_compensation_rate": np.concatenate([chunk["hourly_compensation_rate"] for chunk in chunks]),
+        "income_min": incomes[income, 0],
+        "income_max": incomes[income, 1],
+    }
+    
+    ids = [f"INT_{row + 1:0{schema['id_width']}d}" for row in rows.tolist()]
+    return DemographicIndex.from_columns(ids, categorical, numeric, **kwargs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate interviewee profiles in bulk")
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--chunk-size", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--format", choices=["columnar", "jsonl"], default="columnar")
+    parser.add_argument("--output-dir", default="bulk_profiles")
+    parser.add_argument("--index", action="store_true", help="Build a DemographicIndex from columnar output")
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    generator = BulkProfileGenerator(args.seed, args.chunk_size)
+    paths = generator.write(args.count, args.output_dir, args.format)
+    elapsed = time.perf_counter() - start
+    print(f"Generated {args.count} profiles in {len(paths)} {args.format} chunks in {elapsed:.2f}s "
+          f"({args.count / elapsed:,.0f} profiles/s), seed {generator.seed}")
+    
+    if args.index and args.format == "columnar":
+        start = time.perf_counter()
+        index = load_demographic_index(args.output_dir)
+        print(f"Built demographic index over {len(index)} profiles in {time.perf_counter() - start:.2f}s")
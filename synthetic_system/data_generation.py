@@ -1,77 +1,109 @@
+import argparse
+import asyncio
 import json
 import os
 import random
-import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import google.generativeai as genai
 from dotenv import load_dotenv
+from generation_pipeline import AsyncRateLimiter, GenerationPipeline, StubGenerativeModel
+from generation_state import GenerationManifest, ResponseCache
 
 load_dotenv()
 
+DEMOGRAPHICS = {
+    'ages': list(range(18, 75)),
+    'names': {
+        'male': [
+            'James', 'Robert', 'John', 'Michael', 'William', 'David', 'Richard', 'Joseph', 
+            'Thomas', 'Christopher', 'Charles', 'Daniel', 'Matthew', 'Anthony', 'Mark', 
+            'Donald', 'Steven', 'Paul', 'Andrew', 'Joshua', 'Kenneth', 'Kevin', 'Brian', 
+            'George', 'Timothy', 'Ronald', 'Jason', 'Edward', 'Jeffrey', 'Ryan', 'Jacob', 
+            'Gary', 'Nicholas', 'Eric', 'Jonathan', 'Stephen', 'Larry', 'Justin', 'Scott',
+            'Brandon', 'Benjamin', 'Samuel', 'Gregory', 'Alexander', 'Patrick', 'Frank',
+            'Raymond', 'Jack', 'Dennis', 'Jerry', 'Tyler', 'Aaron', 'Jose', 'Henry',
+            'Adam', 'Douglas', 'Nathan', 'Peter', 'Zachary', 'Kyle', 'Noah', 'Alan'
+        ],
+        'female': [
+            'Mary', 'Patricia', 'Jennifer', 'Linda', 'Elizabeth', 'Barbara', 'Susan', 
+            'Jessica', 'Sarah', 'Karen', 'Nancy', 'Lisa', 'Betty', 'Helen', 'Sandra', 
+            'Donna', 'Carol', 'Ruth', 'Sharon', 'Michelle', 'Laura', 'Emily', 'Kimberly', 
+            'Deborah', 'Dorothy', 'Amy', 'Angela', 'Ashley', 'Brenda', 'Emma', 'Olivia', 
+            'Cynthia', 'Marie', 'Janet', 'Catherine', 'Frances', 'Christine', 'Samantha', 
+            'Debra', 'Rachel', 'Carolyn', 'Janet', 'Virginia', 'Maria', 'Heather', 'Diane',
+            'Julie', 'Joyce', 'Victoria', 'Kelly', 'Christina', 'Joan', 'Evelyn', 'Lauren',
+            'Judith', 'Megan', 'Cheryl', 'Andrea', 'Hannah', 'Jacqueline', 'Martha', 'Gloria'
+        ],
+        'non_binary': [
+            'Alex', 'Jordan', 'Taylor', 'Casey', 'Riley', 'Avery', 'Quinn', 'Blake', 
+            'Cameron', 'Drew', 'Emery', 'Finley', 'Harper', 'Hayden', 'Jamie', 'Kai', 
+            'Logan', 'Morgan', 'Parker', 'Peyton', 'Reagan', 'Reese', 'River', 'Rowan', 
+            'Sage', 'Skyler', 'Sydney', 'Tatum', 'Teagan', 'Phoenix', 'Briar', 'Cedar',
+            'Clover', 'Dove', 'Echo', 'Indigo', 'Lane', 'Marlowe', 'Ocean', 'Onyx',
+            'Rain', 'Scout', 'Story', 'True', 'West', 'Winter', 'Wren', 'Zen'
+        ]
+    },
+    'genders': ['male', 'female', 'non_binary'],
+    'races': ['white', 'black', 'hispanic', 'asian', 'native_american', 'mixed'],
+    'education_levels': ['high_school', 'some_college', 'bachelor\'s degree', 'master\'s degree', 'doctorate'],
+    'employment_statuses': ['full_time', 'part_time', 'unemployed', 'retired', 'student', 'self_employed'],
+    'income_ranges': ['$0-$25k', '$25k-$50k', '$50k-$75k', '$75k-$100k', '$100k-$150k', '$150k+'],
+    'cities': [
+        ('New York', 'NY'), ('Los Angeles', 'CA'), ('Chicago', 'IL'), ('Houston', 'TX'),
+        ('Phoenix', 'AZ'), ('Philadelphia', 'PA'), ('San Antonio', 'TX'), ('San Diego', 'CA'),
+        ('Dallas', 'TX'), ('San Jose', 'CA'), ('Austin', 'TX'), ('Jacksonville', 'FL'),
+        ('Fort Worth', 'TX'), ('Columbus', 'OH'), ('Charlotte', 'NC'), ('San Francisco', 'CA'),
+        ('Indianapolis', 'IN'), ('Seattle', 'WA'), ('Denver', 'CO'), ('Boston', 'MA')
+    ],
+    'occupations': {
+        'technology': ['software engineer', 'data scientist', 'product manager', 'UX designer'],
+        'healthcare': ['nurse', 'doctor', 'therapist', 'pharmacist'],
+        'education': ['teacher', 'professor', 'administrator', 'counselor'],
+        'business': ['manager', 'analyst', 'consultant', 'sales representative'],
+        'retail': ['store manager', 'cashier', 'sales associate', 'buyer'],
+        'other': ['artist', 'writer', 'chef', 'mechanic', 'construction worker']
+    }
+}
+
+RACE_WEIGHTS = [40, 15, 20, 15, 5, 5]
+
+REGIONS = {
+    'northeast': ['NY', 'PA', 'MA', 'CT', 'RI', 'VT', 'NH', 'ME', 'NJ'],
+    'southeast': ['FL', 'GA', 'SC', 'NC', 'VA', 'WV', 'KY', 'TN', 'AL', 'MS', 'LA', 'AR'],
+    'midwest': ['OH', 'MI', 'IN', 'IL', 'WI', 'MN', 'IA', 'MO', 'ND', 'SD', 'NE', 'KS'],
+    'southwest': ['TX', 'OK', 'NM', 'AZ', 'NV'],
+    'west': ['CA', 'OR', 'WA', 'ID', 'MT', 'WY', 'CO', 'UT', 'AK', 'HI']
+}
+
+INTERVIEWERS = [f"STAFF_{str(i).zfill(2)}" for i in range(1, 21)]
+INTERVIEW_TYPES = ['initial_screening', 'follow_up', 'product_feedback', 'user_experience']
+INTERVIEW_LOCATIONS = ['remote', 'in_person']
+RECORDING_QUALITIES = {'excellent': 50, 'good': 35, 'fair': 15}
+COMPENSATION_AMOUNTS = [25, 50, 75, 100]
+RECRUITMENT_CHANNELS = ['email_campaign', 'social_media', 'referral', 'website']
+
 class SyntheticDataGenerator:
-    def __init__(self):
-        genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
+    def __init__(self, model=None, requests_per_minute: float = 60, tokens_per_minute: Optional[float] = None,
+                 concurrency: int = 8, manifest_path: str = "generation_manifest.json",
+                 cache_dir: Optional[str] = "llm_cache"):
+        if model is None:
+            genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
+            model = genai.GenerativeModel('gemini-2.5-flash')
+        self.model = model
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.concurrency = concurrency
+        self.pipeline = None
+        self.manifest = GenerationManifest(manifest_path)
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
 
         self.create_directories()
         self.products = self.load_products()
         
-        self.demographics = {
-            'ages': list(range(18, 75)),
-            'names': {
-                'male': [
-                    'James', 'Robert', 'John', 'Michael', 'William', 'David', 'Richard', 'Joseph', 
-                    'Thomas', 'Christopher', 'Charles', 'Daniel', 'Matthew', 'Anthony', 'Mark', 
-                    'Donald', 'Steven', 'Paul', 'Andrew', 'Joshua', 'Kenneth', 'Kevin', 'Brian', 
-                    'George', 'Timothy', 'Ronald', 'Jason', 'Edward', 'Jeffrey', 'Ryan', 'Jacob', 
-                    'Gary', 'Nicholas', 'Eric', 'Jonathan', 'Stephen', 'Larry', 'Justin', 'Scott',
-                    'Brandon', 'Benjamin', 'Samuel', 'Gregory', 'Alexander', 'Patrick', 'Frank',
-                    'Raymond', 'Jack', 'Dennis', 'Jerry', 'Tyler', 'Aaron', 'Jose', 'Henry',
-                    'Adam', 'Douglas', 'Nathan', 'Peter', 'Zachary', 'Kyle', 'Noah', 'Alan'
-                ],
-                'female': [
-                    'Mary', 'Patricia', 'Jennifer', 'Linda', 'Elizabeth', 'Barbara', 'Susan', 
-                    'Jessica', 'Sarah', 'Karen', 'Nancy', 'Lisa', 'Betty', 'Helen', 'Sandra', 
-                    'Donna', 'Carol', 'Ruth', 'Sharon', 'Michelle', 'Laura', 'Emily', 'Kimberly', 
-                    'Deborah', 'Dorothy', 'Amy', 'Angela', 'Ashley', 'Brenda', 'Emma', 'Olivia', 
-                    'Cynthia', 'Marie', 'Janet', 'Catherine', 'Frances', 'Christine', 'Samantha', 
-                    'Debra', 'Rachel', 'Carolyn', 'Janet', 'Virginia', 'Maria', 'Heather', 'Diane',
-                    'Julie', 'Joyce', 'Victoria', 'Kelly', 'Christina', 'Joan', 'Evelyn', 'Lauren',
-                    'Judith', 'Megan', 'Cheryl', 'Andrea', 'Hannah', 'Jacqueline', 'Martha', 'Gloria'
-                ],
-                'non_binary': [
-                    'Alex', 'Jordan', 'Taylor', 'Casey', 'Riley', 'Avery', 'Quinn', 'Blake', 
-                    'Cameron', 'Drew', 'Emery', 'Finley', 'Harper', 'Hayden', 'Jamie', 'Kai', 
-                    'Logan', 'Morgan', 'Parker', 'Peyton', 'Reagan', 'Reese', 'River', 'Rowan', 
-                    'Sage', 'Skyler', 'Sydney', 'Tatum', 'Teagan', 'Phoenix', 'Briar', 'Cedar',
-                    'Clover', 'Dove', 'Echo', 'Indigo', 'Lane', 'Marlowe', 'Ocean', 'Onyx',
-                    'Rain', 'Scout', 'Story', 'True', 'West', 'Winter', 'Wren', 'Zen'
-                ]
-            },
-            'genders': ['male', 'female', 'non_binary'],
-            'races': ['white', 'black', 'hispanic', 'asian', 'native_american', 'mixed'],
-            'education_levels': ['high_school', 'some_college', 'bachelor\'s degree', 'master\'s degree', 'doctorate'],
-            'employment_statuses': ['full_time', 'part_time', 'unemployed', 'retired', 'student', 'self_employed'],
-            'income_ranges': ['$0-$25k', '$25k-$50k', '$50k-$75k', '$75k-$100k', '$100k-$150k', '$150k+'],
-            'cities': [
-                ('New York', 'NY'), ('Los Angeles', 'CA'), ('Chicago', 'IL'), ('Houston', 'TX'),
-                ('Phoenix', 'AZ'), ('Philadelphia', 'PA'), ('San Antonio', 'TX'), ('San Diego', 'CA'),
-                ('Dallas', 'TX'), ('San Jose', 'CA'), ('Austin', 'TX'), ('Jacksonville', 'FL'),
-                ('Fort Worth', 'TX'), ('Columbus', 'OH'), ('Charlotte', 'NC'), ('San Francisco', 'CA'),
-                ('Indianapolis', 'IN'), ('Seattle', 'WA'), ('Denver', 'CO'), ('Boston', 'MA')
-            ],
-            'occupations': {
-                'technology': ['software engineer', 'data scientist', 'product manager', 'UX designer'],
-                'healthcare': ['nurse', 'doctor', 'therapist', 'pharmacist'],
-                'education': ['teacher', 'professor', 'administrator', 'counselor'],
-                'business': ['manager', 'analyst', 'consultant', 'sales representative'],
-                'retail': ['store manager', 'cashier', 'sales associate', 'buyer'],
-                'other': ['artist', 'writer', 'chef', 'mechanic', 'construction worker']
-            }
-        }
+        self.demographics = DEMOGRAPHICS
         
-        self.interviewers = [f"STAFF_{str(i).zfill(2)}" for i in range(1, 21)]
+        self.interviewers = INTERVIEWERS
         
     def create_directories(self):
         directories = ['metadata', 'reviews', 'transcripts']
@@ -106,15 +138,7 @@ class SyntheticDataGenerator:
             return "65+"
     
     def get_region(self, state: str) -> str:
-        regions = {
-            'northeast': ['NY', 'PA', 'MA', 'CT', 'RI', 'VT', 'NH', 'ME', 'NJ'],
-            'southeast': ['FL', 'GA', 'SC', 'NC', 'VA', 'WV', 'KY', 'TN', 'AL', 'MS', 'LA', 'AR'],
-            'midwest': ['OH', 'MI', 'IN', 'IL', 'WI', 'MN', 'IA', 'MO', 'ND', 'SD', 'NE', 'KS'],
-            'southwest': ['TX', 'OK', 'NM', 'AZ', 'NV'],
-            'west': ['CA', 'OR', 'WA', 'ID', 'MT', 'WY', 'CO', 'UT', 'AK', 'HI']
-        }
-        
-        for region, states in regions.items():
+        for region, states in REGIONS.items():
             if state in states:
                 return region
         return 'other'
@@ -128,7 +152,7 @@ class SyntheticDataGenerator:
         if race_count == 1:
             race = random.choices(
                 self.demographics['races'], 
-                weights=[40, 15, 20, 15, 5, 5], 
+                weights=RACE_WEIGHTS, 
                 k=1
             )
         else:
@@ -136,12 +160,12 @@ class SyntheticDataGenerator:
             race = []
             first_race = random.choices(
                 available_races, 
-                weights=[40, 15, 20, 15, 5, 5], 
+                weights=RACE_WEIGHTS, 
                 k=1
             )[0]
             race.append(first_race)
             available_races.remove(first_race)
-            remaining_weights = [40, 15, 20, 15, 5, 5]
+            remaining_weights = list(RACE_WEIGHTS)
             race_index = self.demographics['races'].index(first_race)
             remaining_weights.pop(race_index)
             
@@ -166,7 +190,6 @@ class SyntheticDataGenerator:
         base_date = datetime(2024, 1, 1)
         for i in range(num_interviews):
             interview_date = base_date + timedelta(days=random.randint(0, 365))
-            interview_types = ['initial_screening', 'follow_up', 'product_feedback', 'user_experience']
             
             interview = {
                 "interview_id": f"IV_{interviewee_id.split('_')[1]}_{interview_date.strftime('%Y%m%d')}",
@@ -180,14 +203,14 @@ class SyntheticDataGenerator:
                     minute=random.choice([0, 15, 30, 45])
                 ) + timedelta(minutes=random.randint(30, 90))).strftime('%Y-%m-%dT%H:%M:%SZ'),
                 "duration_minutes": random.randint(30, 90),
-                "interview_type": random.choice(interview_types),
+                "interview_type": random.choice(INTERVIEW_TYPES),
                 "interviewer_id": random.choice(self.interviewers),
-                "location": random.choice(['remote', 'in_person']),
-                "recording_quality": random.choices(['excellent', 'good', 'fair'], weights=[50, 35, 15])[0],
+                "location": random.choice(INTERVIEW_LOCATIONS),
+                "recording_quality": random.choices(list(RECORDING_QUALITIES), weights=list(RECORDING_QUALITIES.values()))[0],
                 "transcript_confidence_score": random.uniform(0.75, 0.98),
                 "completion_status": "completed",
                 "transcript_file": f"transcript_IV_{interviewee_id.split('_')[1]}_{interview_date.strftime('%Y%m%d')}.json",
-                "compensation_amount": random.choice([25, 50, 75, 100])
+                "compensation_amount": random.choice(COMPENSATION_AMOUNTS)
             }
             interviews.append(interview)
         
@@ -217,7 +240,7 @@ class SyntheticDataGenerator:
             },
             "interviews": interviews,
             "study_participation": {
-                "recruitment_channel": random.choice(['email_campaign', 'social_media', 'referral', 'website']),
+                "recruitment_channel": random.choice(RECRUITMENT_CHANNELS),
                 "total_interviews_completed": len(interviews),
                 "total_compensation": total_compensation,
                 "hourly_compensation_rate": hourly_rate
@@ -238,13 +261,26 @@ class SyntheticDataGenerator:
             with open(f'metadata/metadata_{interviewee_id}.json', 'w') as f:
                 json.dump(profile, f, indent=2)
         
+        self.manifest.record_metadata([profile['interviewee_id'] for profile in metadata_profiles])
         print("Generated 100 metadata profiles")
         return metadata_profiles
     
-    def generate_reviews_for_product(self, product: Dict[str, Any]) -> List[Dict[str, Any]]:
-        print(f"Generating reviews for: {product['product_name']}")
+    def load_or_generate_metadata(self) -> List[Dict[str, Any]]:
+        interviewee_ids = self.manifest.metadata_ids()
+        paths = [f'metadata/metadata_{interviewee_id}.json' for interviewee_id in interviewee_ids]
+        if not interviewee_ids or not all(os.path.exists(path) for path in paths):
+            return self.generate_all_metadata()
+        
+        metadata_profiles = []
+        for path in paths:
+            with open(path, 'r') as f:
+                metadata_profiles.append(json.load(f))
         
-        prompt = f"""For this product, generate 20 reviews with the most content/elaborations and of the GREATEST length:
+        print(f"Reusing {len(metadata_profiles)} metadata profiles from a previous run")
+        return metadata_profiles
+    
+    def review_prompt(self, product: Dict[str, Any]) -> str:
+        return f"""For this product, generate 20 reviews with the most content/elaborations and of the GREATEST length:
 
 {product['product_name']}: {product['description']}
 
@@ -267,21 +303,43 @@ Reviewer Profile: [Brief description of reviewer type/demographics]
 ---
 
 Generate all 20 reviews now."""
-
+    
+    def reviews_path(self, product: Dict[str, Any]) -> str:
+        return f"reviews/reviews_{product['id']:03d}.json"
+    
+    def load_reviews(self, product: Dict[str, Any]) -> List[Dict[str, Any]]:
+        with open(self.reviews_path(product), 'r') as f:
+            return json.load(f)['reviews']
+    
+    def store_reviews(self, product: Dict[str, Any], reviews_text: str) -> List[Dict[str, Any]]:
+        reviews = self.parse_reviews_response(reviews_text, product)
+        
+        with open(self.reviews_path(product), 'w') as f:
+            json.dump({
+                'product': product,
+                'reviews': reviews
+            }, f, indent=2)
+        
+        print(f"Generated {len(reviews)} reviews for {product['product_name']}")
+        return reviews
+    
+    def generate_reviews_for_product(self, product: Dict[str, Any]) -> List[Dict[str, Any]]:
+        print(f"Generating reviews for: {product['product_name']}")
+        
         try:
-            response = self.model.generate_content(prompt)
-            reviews_text = response.text
-            
-            reviews = self.parse_reviews_response(reviews_text, product)
+            response = self.model.generate_content(self.review_prompt(product))
+            return self.store_reviews(product, response.text)
             
-            with open(f"reviews/reviews_{product['id']:03d}.json", 'w') as f:
-                json.dump({
-                    'product': product,
-                    'reviews': reviews
-                }, f, indent=2)
-            
-            print(f"Generated {len(reviews)} reviews for {product['product_name']}")
-            return reviews
+        except Exception as e:
+            print(f"Error generating reviews for {product['product_name']}: {e}")
+            return []
+    
+    async def generate_reviews_for_product_async(self, product: Dict[str, Any]) -> List[Dict[str, Any]]:
+        print(f"Generating reviews for: {product['product_name']}")
+        
+        try:
+            reviews_text = await self.pipeline.generate(self.review_prompt(product))
+            return self.store_reviews(product, reviews_text)
             
         except Exception as e:
             print(f"Error generating reviews for {product['product_name']}: {e}")
@@ -362,12 +420,12 @@ Generate all 20 reviews now."""
         
         return selected_reviews
     
-    def match_review_to_metadata(self, review: Dict[str, Any], metadata_profiles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def match_review_to_metadata(self, review: Dict[str, Any], metadata_profiles: List[Dict[str, Any]], rng=random) -> Dict[str, Any]:
         product_id = review['product_id']
         product = next((p for p in self.products if p['id'] == product_id), None)
         
         if not product:
-            return random.choice(metadata_profiles)
+            return rng.choice(metadata_profiles)
         
         tech_products = ['headphones', 'robot', 'projector', 'scanner', 'usb', 'gaming', 'smart', 'bluetooth']
         fitness_products = ['yoga', 'exercise', 'fitness', 'foam roller', 'resistance', 'dumbbells']
@@ -398,13 +456,13 @@ Generate all 20 reviews now."""
         if not suitable_profiles:
             suitable_profiles = metadata_profiles
         
-        return random.choice(suitable_profiles)
+        return rng.choice(suitable_profiles)
     
-    def generate_interview_transcript(self, review: Dict[str, Any], metadata_profile: Dict[str, Any]) -> Dict[str, Any]:
+    def transcript_prompt(self, review: Dict[str, Any], metadata_profile: Dict[str, Any], rng=random) -> Tuple[str, Dict[str, Any], str, str]:
         product = next((p for p in self.products if p['id'] == review['product_id']), None)
         personal_info = metadata_profile['personal_info']
         
-        interviewer_name = random.choice(['Sarah', 'Mike', 'Jessica', 'David', 'Emily', 'Chris'])
+        interviewer_name = rng.choice(['Sarah', 'Mike', 'Jessica', 'David', 'Emily', 'Chris'])
         interviewee_name = personal_info['name']
         
         prompt = f"""TASK: Generate a customer interview based on the review below. 
@@ -467,6 +525,11 @@ INSTRUCTIONS: Create a realistic interview dialogue that captures the customer's
 
 Format as natural dialogue with speaker names, no special formatting needed."""
 
+        return prompt, product, interviewer_name, interviewee_name
+    
+    def generate_interview_transcript(self, review: Dict[str, Any], metadata_profile: Dict[str, Any]) -> Dict[str, Any]:
+        prompt, product, interviewer_name, interviewee_name = self.transcript_prompt(review, metadata_profile)
+        
         try:
             response = self.model.generate_content(prompt)
             transcript_text = response.text.encode().decode('unicode_escape')
@@ -474,6 +537,18 @@ Format as natural dialogue with speaker names, no special formatting needed."""
             transcript_data = self.parse_transcript(transcript_text, review, metadata_profile, product, interviewer_name, interviewee_name)
             
             return transcript_data
+        
+        except Exception as e:
+            print(f"Error generating transcript: {e}")
+            return None
+    
+    async def generate_interview_transcript_async(self, review: Dict[str, Any], metadata_profile: Dict[str, Any], rng=random) -> Dict[str, Any]:
+        prompt, product, interviewer_name, interviewee_name = self.transcript_prompt(review, metadata_profile, rng)
+        
+        try:
+            transcript_text = (await self.pipeline.generate(prompt)).encode().decode('unicode_escape')
+            
+            return self.parse_transcript(transcript_text, review, metadata_profile, product, interviewer_name, interviewee_name)
             
         except Exception as e:
             print(f"Error generating transcript: {e}")
@@ -541,47 +616,76 @@ Format as natural dialogue with speaker names, no special formatting needed."""
         
         return transcript_data
     
-    def process_all_products(self, metadata_profiles: List[Dict[str, Any]]):
-        print(f"Processing {len(self.products)} products...")
+    async def _process_transcript(self, product: Dict[str, Any], j: int, review: Dict[str, Any],
+                                  metadata_profiles: List[Dict[str, Any]], total: int):
+        transcript_filename = f"transcripts/transcript_{product['id']:03d}_{j+1:02d}.json"
+        if self.manifest.transcript_done(product['id'], j + 1) and os.path.exists(transcript_filename):
+            return
         
-        for i, product in enumerate(self.products, 1):
-            print(f"\n--- Processing Product {i}/{len(self.products)} ---")
-            
-            all_reviews = self.generate_reviews_for_product(product)
-            
-            if not all_reviews:
-                print(f"Skipping {product['product_name']} - no reviews generated")
-                continue
-            
-            selected_reviews = self.select_best_reviews(all_reviews)
-            
-            print(f"Selected {len(selected_reviews)} reviews for transcript generation")
-            
-            for j, review in enumerate(selected_reviews):
-                matched_profile = self.match_review_to_metadata(review, metadata_profiles)
-                
-                transcript = self.generate_interview_transcript(review, matched_profile)
-                
-                if transcript:
-                    transcript_filename = f"transcripts/transcript_{product['id']:03d}_{j+1:02d}.json"
-                    with open(transcript_filename, 'w') as f:
-                        json.dump(transcript, f, indent=2)
-                    
-                    print(f"Generated transcript {j+1}/{len(selected_reviews)}")
-                else:
-                    print(f"Failed to generate transcript {j+1}/{len(selected_reviews)}")
-                
-                time.sleep(2)
+        rng = random.Random(review['review_id'])
+        matched_profile = self.match_review_to_metadata(review, metadata_profiles, rng)
+        
+        transcript = await self.generate_interview_transcript_async(review, matched_profile, rng)
+        
+        if transcript:
+            with open(transcript_filename, 'w') as f:
+                json.dump(transcript, f, indent=2)
+            self.manifest.record_transcript(product['id'], j + 1)
             
-            time.sleep(5)
+            print(f"Generated transcript {j+1}/{total} for {product['product_name']}")
+        else:
+            print(f"Failed to generate transcript {j+1}/{total} for {product['product_name']}")
+    
+    async def _process_product(self, i: int, product: Dict[str, Any], metadata_profiles: List[Dict[str, Any]]):
+        print(f"\n--- Processing Product {i}/{len(self.products)} ---")
+        
+        if self.manifest.reviews_done(product['id']) and os.path.exists(self.reviews_path(product)):
+            all_reviews = self.load_reviews(product)
+        else:
+            all_reviews = await self.generate_reviews_for_product_async(product)
+            if all_reviews:
+                self.manifest.record_reviews(product['id'])
+        
+        if not all_reviews:
+            print(f"Skipping {product['product_name']} - no reviews generated")
+            return
+        
+        selected_reviews = self.select_best_reviews(all_reviews)
+        
+        print(f"Selected {len(selected_reviews)} reviews for transcript generation")
+        
+        await asyncio.gather(*[
+            self._process_transcript(product, j, review, metadata_profiles, len(selected_reviews))
+            for j, review in enumerate(selected_reviews)
+        ])
+    
+    async def process_all_products_async(self, metadata_profiles: List[Dict[str, Any]]):
+        print(f"Processing {len(self.products)} products...")
+        
+        self.pipeline = GenerationPipeline(
+            self.model,
+            AsyncRateLimiter(self.requests_per_minute, self.tokens_per_minute),
+            concurrency=self.concurrency,
+            cache=self.cache
+        )
+        
+        await asyncio.gather(*[
+            self._process_product(i, product, metadata_profiles)
+            for i, product in enumerate(self.products, 1)
+        ])
         
         print("\nAll products processed successfully!")
+        print(f"Generation stats: {self.pipeline.get_stats()}")
+        print(f"Manifest: {self.manifest.summary()}")
+    
+    def process_all_products(self, metadata_profiles: List[Dict[str, Any]]):
+        asyncio.run(self.process_all_products_async(metadata_profiles))
     
     def run_full_pipeline(self):
         print("Starting Synthetic Interview Data Generation Pipeline")
         print("=" * 60)
         
-        metadata_profiles = self.generate_all_metadata()
+        metadata_profiles = self.load_or_generate_metadata()
         
         self.process_all_products(metadata_profiles)
         
@@ -593,5 +697,17 @@ Format as natural dialogue with speaker names, no special formatting needed."""
         print(f"- ~{len(self.products) * 10} interview transcripts in /transcripts/")
 
 if __name__ == "__main__":
-    generator = SyntheticDataGenerator()
+    parser = argparse.ArgumentParser(description="Generate synthetic interviewee profiles, reviews and transcripts")
+    parser.add_argument("--rpm", type=float, default=60, help="Provider requests-per-minute quota")
+    parser.add_argument("--tpm", type=float, default=None, help="Provider input tokens-per-minute quota")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--stub", action="store_true", help="Use a local stub model instead of Gemini")
+    parser.add_argument("--stub-latency", type=float, default=0.5)
+    parser.add_argument("--stub-rpm", type=float, default=None, help="Quota enforced by the stub model (raises 429s)")
+    parser.add_argument("--manifest", default="generation_manifest.json")
+    parser.add_argument("--cache-dir", default="llm_cache", help="Prompt-hash response cache (empty string disables it)")
+    args = parser.parse_args()
+    
+    model = StubGenerativeModel(args.stub_latency, args.stub_rpm) if args.stub else None
+    generator = SyntheticDataGenerator(model, args.rpm, args.tpm, args.concurrency, args.manifest, args.cache_dir)
     generator.run_full_pipeline()
\ No newline at end of file
@@ -0,0 +1,210 @@
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+CATEGORICAL_FIELDS = {
+    "age_range": ("personal_info", "age_range"),
+    "gender": ("personal_info", "gender"),
+    "race_ethnicity": ("personal_info", "race_ethnicity"),
+    "education_level": ("personal_info", "education_level"),
+    "employment_status": ("personal_info", "employment_status"),
+    "occupation": ("personal_info", "occupation"),
+    "industry": ("personal_info", "industry"),
+    "income_range": ("personal_info", "income_range"),
+    "city": ("personal_info", "location", "city"),
+    "state": ("personal_info", "location", "state"),
+    "region": ("personal_info", "location", "region"),
+    "recruitment_channel": ("study_participation", "recruitment_channel"),
+    "interview_type": ("interviews", "interview_type"),
+    "interview_location": ("interviews", "location"),
+}
+
+NUMERIC_FIELDS = {
+    "age": ("personal_info", "age"),
+    "total_interviews": ("study_participation", "total_interviews_completed"),
+    "total_compensation": ("study_participation", "total_compensation"),
+    "hourly_compensation_rate": ("study_participation", "hourly_compensation_rate"),
+}
+
+
+def parse_income_range(income_range: Optional[str]) -> Tuple[float, float]:
+    if not income_range:
+        return float("nan"), float("nan")
+    
+    def dollars(text: str) -> float:
+        text = text.strip().lstrip("$").lower()
+        return float(text[:-1]) * 1000 if text.endswith("k") else float(text)
+    
+    if income_range.endswith("+"):
+        return dollars(income_range[:-1]), float("inf")
+    
+    low, _, high = income_range.partition("-")
+    return dollars(low), dollars(high)
+
+
+def _lookup(profile: Dict[str, Any], path: Tuple[str, ...]) -> List[Any]:
+    values = [profile]
+    for key in path:
+        next_values = []
+        for value in values:
+            if isinstance(value, list):
+                next_values.extend(item.get(key) for item in value if isinstance(item, dict))
+            elif isinstance(value, dict):
+                next_values.append(value.get(key))
+        values = next_values
+    
+    flattened = []
+    for value in values:
+        if isinstance(value, list):
+            flattened.extend(value)
+        elif value is not None:
+            flattened.append(value)
+    return flattened
+
+
+class DemographicIndex:
+    
+    def __init__(self, profiles: Iterable[Dict[str, Any]] = (), filter_cache_size: int = 256):
+        self.filter_cache_size = filter_cache_size
+        self._filter_cache: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._build(list(profiles))
+    
+    @classmethod
+    def from_directory(cls, metadata_dir: str = "metadata", **kwargs) -> "DemographicIndex":
+        profiles = []
+        for path in sorted(Path(metadata_dir).glob("metadata_*.json")):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    profiles.append(json.load(f))
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Error loading metadata {path}: {e}")
+        return cls(profiles, **kwargs)
+    
+    @classmethod
+    def from_columns(cls, ids: List[str], categorical: Dict[str, Tuple[np.ndarray, np.ndarray, List[Any]]],
+                     numeric: Dict[str, np.ndarray], **kwargs) -> "DemographicIndex":
+        index = cls(**kwargs)
+        index._build_columns(list(ids), categorical, numeric)
+        return index
+    
+    def _build(self, profiles: List[Dict[str, Any]]):
+        categorical = {}
+        for field, path in CATEGORICAL_FIELDS.items():
+            rows, codes, vocabulary = [], [], {}
+            for row, profile in enumerate(profiles):
+                for value in _lookup(profile, path):
+                    rows.append(row)
+                    codes.append(vocabulary.setdefault(value, len(vocabulary)))
+            categorical[field] = (np.array(rows, dtype=np.int64), np.array(codes, dtype=np.int64), list(vocabulary))
+        
+        columns = {
+            field: [next(iter(_lookup(profile, path)), float("nan")) for profile in profiles]
+            for field, path in NUMERIC_FIELDS.items()
+        }
+        incomes = [parse_income_range(profile.get("personal_info", {}).get("income_range")) for profile in profiles]
+        columns["income_min"] = [low for low, _ in incomes]
+        columns["income_max"] = [high for _, high in incomes]
+        
+        self._build_columns(
+            [profile["interviewee_id"] for profile in profiles],
+            categorical,
+            {field: np.array(values, dtype=np.float64) for field, values in columns.items()}
+        )
+    
+    def _build_columns(self, ids: List[str], categorical: Dict[str, Tuple[np.ndarray, np.ndarray, List[Any]]],
+                       numeric: Dict[str, np.ndarray]):
+        self.ids = ids
+        self.rows = {interviewee_id: row for row, interviewee_id in enumerate(self.ids)}
+        count = len(self.ids)
+        
+        self.bitmaps: Dict[str, Dict[str, np.ndarray]] = {}
+        for field, (rows, codes, vocabulary) in categorical.items():
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(vocabulary) + 1))
+            bitmaps: Dict[str, np.ndarray] = {}
+            for code, value in enumerate(vocabulary):
+                members = rows[order[bounds[code]:bounds[code + 1]]]
+                if len(members):
+                    bitmap = bitmaps[value] = np.zeros(count, dtype=bool)
+                    bitmap[members] = True
+            self.bitmaps[field] = bitmaps
+        
+        self.numeric: Dict[str, np.ndarray] = {}
+        self.sorted_rows: Dict[str, np.ndarray] = {}
+        self.sorted_values: Dict[str, np.ndarray] = {}
+        for field, values in numeric.items():
+            column = np.asarray(values, dtype=np.float64)
+            order = np.argsort(column, kind="stable")
+            order = order[~np.isnan(column[order])]
+            self.numeric[field] = column
+            self.sorted_rows[field] = order
+            self.sorted_values[field] = column[order]
+        
+        self._filter_cache.clear()
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def fields(self) -> Dict[str, List[str]]:
+        return {
+            **{field: sorted(map(str, bitmaps)) for field, bitmaps in self.bitmaps.items()},
+            **{field: [] for field in self.numeric}
+        }
+    
+    def _categorical_mask(self, field: str, wanted) -> np.ndarray:
+        bitmaps = self.bitmaps[field]
+        values = [wanted] if isinstance(wanted, str) else list(wanted)
+        
+        mask = np.zeros(len(self.ids), dtype=bool)
+        for value in values:
+            bitmap = bitmaps.get(value)
+            if bitmap is not None:
+                mask |= bitmap
+        return mask
+    
+    def _range_mask(self, field: str, bounds) -> np.ndarray:
+        if isinstance(bounds, (int, float)):
+            low = high = bounds
+        else:
+            low, high = bounds
+        
+        sorted_values = self.sorted_values[field]
+        start = 0 if low is None else int(np.searchsorted(sorted_values, low, side="left"))
+        end = len(sorted_values) if high is None else int(np.searchsorted(sorted_values, high, side="right"))
+        
+        mask = np.zeros(len(self.ids), dtype=bool)
+        mask[self.sorted_rows[field][start:end]] = True
+        return mask
+    
+    def mask(self, filters: Dict[str, Any]) -> np.ndarray:
+        mask = np.ones(len(self.ids), dtype=bool)
+        for field, condition in filters.items():
+            if field in self.bitmaps:
+                mask &= self._categorical_mask(field, condition)
+            elif field in self.numeric:
+                mask &= self._range_mask(field, condition)
+            else:
+                raise ValueError(f"Unknown demographic field: {field}")
+        return mask
+    
+    def select(self, filters: Dict[str, Any]) -> List[str]:
+        key = json.dumps(filters, sort_keys=True, default=list)
+        with self._cache_lock:
+            selected = self._filter_cache.get(key)
+            if selected is not None:
+                self._filter_cache.move_to_end(key)
+                return selected
+        
+        selected = [self.ids[row] for row in np.flatnonzero(self.mask(filters))]
+        with self._cache_lock:
+            self._filter_cache[key] = selected
+            if len(self._filter_cache) > self.filter_cache_size:
+                self._filter_cache.popitem(last=False)
+        return selected
+    
+    def count(self, filters: Dict[str, Any]) -> int:
+        return int(self.mask(filters).sum())
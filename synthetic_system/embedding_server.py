@@ -0,0 +1,267 @@
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Tuple, Union, Optional
+import numpy as np
+
+DEFAULT_ADDRESS = "unix:///tmp/rag_embedding.sock"
+
+_HEADER = struct.Struct("!I")
+_SHAPE = struct.Struct("!II")
+
+
+def parse_address(address: str) -> Tuple[int, Union[str, Tuple[str, int]]]:
+    if address.startswith("unix://"):
+        return socket.AF_UNIX, address[len("unix://"):]
+    
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        packet = sock.recv(size - len(data))
+        if not packet:
+            raise ConnectionError("Embedding connection closed")
+        data.extend(packet)
+    return bytes(data)
+
+
+@dataclass
+class EncodeRequest:
+    texts: List[str]
+    done: threading.Event = field(default_factory=threading.Event)
+    embeddings: Optional[np.ndarray] = None
+    error: Optional[str] = None
+
+
+class DynamicBatcher:
+    
+    def __init__(self, model, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.pending = queue.Queue()
+        
+        self.batches_encoded = 0
+        self.texts_encoded = 0
+        
+        self.running = True
+        self.worker_thread = threading.Thread(target=self._run, daemon=True)
+        self.worker_thread.start()
+    
+    def encode(self, texts: List[str]) -> np.ndarray:
+        request = EncodeRequest(texts=texts)
+        self.pending.put(request)
+        request.done.wait()
+        
+        if request.error:
+            raise RuntimeError(request.error)
+        return request.embeddings
+    
+    def _collect_batch(self) -> List[EncodeRequest]:
+        try:
+            first = self.pending.get(timeout=1)
+        except queue.Empty:
+            return []
+        
+        batch = [first]
+        batch_texts = len(first.texts)
+        deadline = time.monotonic() + self.max_wait
+        
+        while batch_texts < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self.pending.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            batch_texts += len(request.texts)
+        
+        return batch
+    
+    def _run(self):
+        while self.running:
+            batch = self._collect_batch()
+            if not batch:
+                continue
+            
+            texts = [text for request in batch for text in request.texts]
+            try:
+                embeddings = np.asarray(
+                    self.model.encode(texts, batch_size=self.max_batch_size), dtype=np.float32
+                )
+                offset = 0
+                for request in batch:
+                    request.embeddings = embeddings[offset:offset + len(request.texts)]
+                    offset += len(request.texts)
+                
+                self.batches_encoded += 1
+                self.texts_encoded += len(texts)
+            except Exception as e:
+                for request in batch:
+                    request.error = str(e)
+            
+            for request in batch:
+                request.done.set()
+    
+    def stop(self):
+        self.running = False
+        self.worker_thread.join(timeout=2)
+
+
+class _EncodeHandler(socketserver.BaseRequestHandler):
+    
+    def handle(self):
+        while True:
+            try:
+                (size,) = _HEADER.unpack(_recv_exact(self.request, _HEADER.size))
+                payload = json.loads(_recv_exact(self.request, size).decode('utf-8'))
+            except (ConnectionError, OSError):
+                return
+            
+            try:
+                embeddings = self.server.batcher.encode(payload["texts"])
+                body = embeddings.astype(np.float32).tobytes()
+                self.request.sendall(_SHAPE.pack(*embeddings.shape) + body)
+            except Exception as e:
+                message = str(e).encode('utf-8')
+                self.request.sendall(_SHAPE.pack(0, len(message)) + message)
+
+
+class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _ThreadingTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    allow_reuse_address = True
+
+
+class EmbeddingServer:
+    
+    def __init__(self, model_name: str = "BAAI/bge-base-en-v1.5", address: str = DEFAULT_ADDRESS,
+                 max_batch_size: int = 64, max_wait_ms: float = 5.0, model=None):
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(model_name)
+        
+        self.address = address
+        self.batcher = DynamicBatcher(model, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+        
+        family, bind_address = parse_address(address)
+        if family == socket.AF_UNIX:
+            if os.path.exists(bind_address):
+                os.unlink(bind_address)
+            self.server = _ThreadingUnixServer(bind_address, _EncodeHandler)
+        else:
+            self.server = _ThreadingTCPServer(bind_address, _EncodeHandler)
+        self.server.batcher = self.batcher
+    
+    def serve_forever(self):
+        print(f"Embedding server listening on {self.address}")
+        self.server.serve_forever()
+    
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        return thread
+    
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.batcher.stop()
+        
+        family, bind_address = parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(bind_address):
+            os.unlink(bind_address)
+
+
+class EmbeddingClient:
+    
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: float = 30.0, batch_size: int = 64):
+        self.address = address
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self._local = threading.local()
+    
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            family, connect_address = parse_address(self.address)
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(connect_address)
+            self._local.sock = sock
+        return sock
+    
+    def _reset(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+        self._local.sock = None
+    
+    def _request(self, texts: List[str]) -> np.ndarray:
+        payload = json.dumps({"texts": texts}).encode('utf-8')
+        sock = self._connection()
+        sock.sendall(_HEADER.pack(len(payload)) + payload)
+        
+        rows, cols = _SHAPE.unpack(_recv_exact(sock, _SHAPE.size))
+        if rows == 0:
+            raise RuntimeError(_recv_exact(sock, cols).decode('utf-8'))
+        
+        body = _recv_exact(sock, rows * cols * 4)
+        return np.frombuffer(body, dtype=np.float32).reshape(rows, cols)
+    
+    def _request_with_retry(self, texts: List[str]) -> np.ndarray:
+        for attempt in range(2):
+            try:
+                return self._request(texts)
+            except ConnectionError:
+                self._reset()
+                if attempt:
+                    raise
+            except OSError:
+                self._reset()
+                raise
+    
+    def encode(self, sentences: Union[str, List[str]], show_progress_bar: bool = False,
+               batch_size: Optional[int] = None, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        
+        batch_size = batch_size or self.batch_size
+        batches = [self._request_with_retry(texts[i:i+batch_size]) for i in range(0, len(texts), batch_size)]
+        embeddings = batches[0] if len(batches) == 1 else np.concatenate(batches)
+        
+        return embeddings[0] if single else embeddings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shared embedding server with dynamic request batching")
+    parser.add_argument("--address", default=DEFAULT_ADDRESS,
+                        help="unix:///path/to.sock or host:port")
+    parser.add_argument("--model", default="BAAI/bge-base-en-v1.5")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    
+    server = EmbeddingServer(args.model, args.address, args.max_batch_size, args.max_wait_ms)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
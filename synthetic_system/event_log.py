@@ -0,0 +1,136 @@
+import atexit
+import json
+import queue
+import random
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+
+class EventLogger:
+    
+    def __init__(self, stream: Optional[TextIO] = None, level: str = "INFO", sample_rate: float = 1.0,
+                 structured: bool = False, max_queue: int = 100000, max_batch: int = 512):
+        self.stream = stream or sys.stdout
+        self.level = LEVELS[level]
+        self.sample_rate = sample_rate
+        self.structured = structured
+        self.max_batch = max_batch
+        
+        self.records: "queue.Queue[Optional[Tuple[float, str, str, str, Dict[str, Any]]]]" = queue.Queue(max_queue)
+        self.dropped = 0
+        self.sampled_out = 0
+        
+        self.writer_thread = threading.Thread(target=self._write, name="event-log-writer", daemon=True)
+        self.writer_thread.start()
+    
+    def enabled(self, level: str) -> bool:
+        return LEVELS[level] >= self.level
+    
+    def log(self, level: str, event: str, message: str = "", sampled: bool = False, **fields):
+        if LEVELS[level] < self.level:
+            return
+        if sampled and self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self.sampled_out += 1
+            return
+        
+        try:
+            self.records.put_nowait((time.time(), level, event, message, fields))
+        except queue.Full:
+            self.dropped += 1
+    
+    def debug(self, event: str, message: str = "", **fields):
+        self.log("DEBUG", event, message, **fields)
+    
+    def info(self, event: str, message: str = "", **fields):
+        self.log("INFO", event, message, **fields)
+    
+    def warning(self, event: str, message: str = "", **fields):
+        self.log("WARNING", event, message, **fields)
+    
+    def error(self, event: str, message: str = "", **fields):
+        self.log("ERROR", event, message, **fields)
+    
+    def _format(self, record: Tuple[float, str, str, str, Dict[str, Any]]) -> str:
+        timestamp, level, event, message, fields = record
+        if self.structured:
+            return json.dumps({"ts": round(timestamp, 6), "level": level, "event": event,
+                               "message": message, **fields}, default=str)
+        if message:
+            return message
+        return " ".join([event] + [f"{key}={value}" for key, value in fields.items()])
+    
+    def _write(self):
+        while True:
+            batch: List[Tuple[float, str, str, str, Dict[str, Any]]] = []
+            record = self.records.get()
+            stop = record is None
+            if not stop:
+                batch.append(record)
+            
+            while not stop and len(batch) < self.max_batch:
+                try:
+                    record = self.records.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    stop = True
+                else:
+                    batch.append(record)
+            
+            try:
+                if batch:
+                    self.stream.write("".join(self._format(record) + "\n" for record in batch))
+                    self.stream.flush()
+            except Exception as e:
+                print(f"Error writing event log batch: {e}", file=sys.stderr)
+            finally:
+                for _ in range(len(batch) + (1 if stop else 0)):
+                    self.records.task_done()
+            
+            if stop:
+                return
+    
+    def flush(self):
+        if self.writer_thread.is_alive():
+            self.records.join()
+    
+    def close(self):
+        if self.writer_thread.is_alive():
+            self.records.put(None)
+            self.writer_thread.join()
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "queued": self.records.qsize(),
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out
+        }
+
+
+_logger: Optional[EventLogger] = None
+_logger_lock = threading.Lock()
+
+
+def get_logger() -> EventLogger:
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            _logger = EventLogger()
+            atexit.register(_logger.close)
+        return _logger
+
+
+def configure_logging(stream: Optional[TextIO] = None, level: str = "INFO", sample_rate: float = 1.0,
+                      structured: bool = False, max_queue: int = 100000) -> EventLogger:
+    logger = get_logger()
+    logger.flush()
+    logger.stream = stream or sys.stdout
+    logger.level = LEVELS[level]
+    logger.sample_rate = sample_rate
+    logger.structured = structured
+    logger.records.maxsize = max_queue
+    return logger
@@ -0,0 +1,208 @@
+import asyncio
+import random
+import re
+import time
+import zlib
+from typing import Dict, Optional
+from google.api_core.exceptions import (DeadlineExceeded, InternalServerError, ResourceExhausted,
+                                        ServiceUnavailable, TooManyRequests)
+from admission import TokenBucket
+from event_log import get_logger
+from generation_state import ResponseCache
+
+RATE_LIMIT_ERRORS = (ResourceExhausted, TooManyRequests)
+TRANSIENT_ERRORS = (ServiceUnavailable, InternalServerError, DeadlineExceeded)
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def retry_delay_hint(error: Exception) -> Optional[float]:
+    for detail in getattr(error, "details", None) or []:
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None:
+            return delay.seconds + delay.nanos / 1e9
+    return None
+
+
+class AsyncRateLimiter:
+    
+    def __init__(self, requests_per_minute: float, tokens_per_minute: Optional[float] = None,
+                 burst_seconds: float = 1.0, throttle_factor: float = 0.75, recovery_step: float = 0.02,
+                 clock=time.monotonic):
+        now = clock()
+        self.clock = clock
+        self.max_rate = requests_per_minute / 60
+        self.throttle_factor = throttle_factor
+        self.recovery_step = recovery_step
+        self.requests = TokenBucket(requests_per_minute / 60, max(1.0, requests_per_minute / 60 * burst_seconds), now)
+        self.tokens = None
+        if tokens_per_minute is not None:
+            self.tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute / 60 * max(burst_seconds, 1.0), now)
+        self.paused_until = 0.0
+        self.waited_s = 0.0
+        self._lock = asyncio.Lock()
+    
+    def throttle(self, seconds: float):
+        self.paused_until = max(self.paused_until, self.clock() + seconds)
+        self.requests.rate = max(self.max_rate * 0.05, self.requests.rate * self.throttle_factor)
+    
+    def recover(self):
+        if self.requests.rate < self.max_rate:
+            self.requests.rate = min(self.max_rate, self.requests.rate + self.max_rate * self.recovery_step)
+    
+    def requests_per_minute(self) -> float:
+        return self.requests.rate * 60
+    
+    async def acquire(self, tokens: int = 0):
+        async with self._lock:
+            while True:
+                now = self.clock()
+                charge = min(tokens, self.tokens.burst) if self.tokens is not None else 0
+                wait = max(self.paused_until - now, self.requests.wait_time(now))
+                if charge:
+                    wait = max(wait, self.tokens.wait_time(now, charge))
+                
+                if wait <= 0:
+                    self.requests.take(now)
+                    if charge:
+                        self.tokens.take(now, charge)
+                    return
+                
+                self.waited_s += wait
+                await asyncio.sleep(wait)
+
+
+class GenerationPipeline:
+    
+    def __init__(self, model, limiter: Optional[AsyncRateLimiter] = None, concurrency: int = 8,
+                 max_retries: int = 6, base_delay_s: float = 2.0, max_delay_s: float = 60.0,
+                 cache: Optional[ResponseCache] = None):
+        self.model = model
+        self.model_name = getattr(model, "model_name", type(model).__name__)
+        self.cache = cache
+        self.limiter = limiter or AsyncRateLimiter(60)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay_s
+        self.max_delay = max_delay_s
+        self.log = get_logger()
+        self.stats: Dict[str, int] = {"requests": 0, "succeeded": 0, "retries": 0, "rate_limited": 0, "failed": 0}
+        self.started = time.monotonic()
+    
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        hint = retry_delay_hint(error)
+        if hint is not None:
+            return min(hint, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+    
+    async def generate(self, prompt: str) -> str:
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(self.model_name, prompt)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        async with self.semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self.limiter.acquire(estimate_tokens(prompt))
+                self.stats["requests"] += 1
+                try:
+                    response = await self.model.generate_content_async(prompt)
+                    self.stats["succeeded"] += 1
+                    self.limiter.recover()
+                    if key is not None:
+                        self.cache.put(key, self.model_name, response.text)
+                    return response.text
+                except RATE_LIMIT_ERRORS + TRANSIENT_ERRORS as e:
+                    if attempt == self.max_retries:
+                        self.stats["failed"] += 1
+                        raise
+                    
+                    delay = self._backoff(attempt, e)
+                    if isinstance(e, RATE_LIMIT_ERRORS):
+                        self.stats["rate_limited"] += 1
+                        self.limiter.throttle(delay)
+                    self.stats["retries"] += 1
+                    self.log.warning("generation_retry", f"Retrying generation in {delay:.1f}s after: {e}",
+                                     attempt=attempt + 1, delay_s=round(delay, 2))
+                    await asyncio.sleep(delay)
+                except Exception:
+                    self.stats["failed"] += 1
+                    raise
+    
+    def get_stats(self) -> Dict[str, float]:
+        elapsed = time.monotonic() - self.started
+        return {
+            **self.stats,
+            "elapsed_s": round(elapsed, 2),
+            "requests_per_minute": round(self.stats["requests"] / elapsed * 60, 1) if elapsed > 0 else 0.0,
+            "limiter_wait_s": round(self.limiter.waited_s, 2),
+            "limiter_rpm": round(self.limiter.requests_per_minute(), 1),
+            **(self.cache.get_stats() if self.cache is not None else {})
+        }
+
+
+class StubResponse:
+    __slots__ = ("text",)
+    
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubGenerativeModel:
+    model_name = "stub"
+    
+    def __init__(self, latency_s: float = 0.5, requests_per_minute: Optional[float] = None):
+        self.latency = latency_s
+        self.quota = None
+        if requests_per_minute is not None:
+            self.quota = TokenBucket(requests_per_minute / 60, max(1.0, requests_per_minute / 60), time.monotonic())
+        self.calls = 0
+    
+    def _reviews(self, rng: random.Random) -> str:
+        sections = []
+        for i in range(20):
+            rating = i // 4 + 1
+            words = " ".join(rng.choice(["battery", "setup", "price", "quality", "daily", "noise", "design",
+                                         "value", "support", "durable", "weeks", "kitchen", "travel"])
+                             for _ in range(rng.randint(40, 120)))
+            sections.append(
+                f"Rating: {rating} stars\n"
+                f"Title: Stub review {i + 1}\n"
+                f"Review: After a few weeks of use my take is {words}.\n"
+                f"Reviewer Profile: Stub reviewer {i + 1}\n"
+            )
+        return "---\n".join(sections)
+    
+    def _transcript(self, prompt: str, rng: random.Random) -> str:
+        host = re.search(r"representative named (\w+)", prompt)
+        guest = re.search(r"Customer named (\w+)", prompt)
+        host = host.group(1) if host else "Sam"
+        guest = guest.group(1) if guest else "Alex"
+        
+        lines = []
+        for turn in range(rng.randint(15, 25)):
+            lines.append(f"{host}: Could you tell me more about how you use it, part {turn + 1}?")
+            lines.append(f"{guest}: Um, mostly on weekdays. The setup was fine but the price felt high at first.")
+        return "\n".join(lines)
+    
+    def _respond(self, prompt: str) -> str:
+        self.calls += 1
+        if self.quota is not None and not self.quota.take(time.monotonic()):
+            raise ResourceExhausted("429 Resource has been exhausted (stub quota)")
+        
+        rng = random.Random(zlib.crc32(prompt.encode("utf-8")))
+        if "generate 20 reviews" in prompt:
+            return self._reviews(rng)
+        return self._transcript(prompt, rng)
+    
+    def generate_content(self, prompt: str) -> StubResponse:
+        time.sleep(self.latency)
+        return StubResponse(self._respond(prompt))
+    
+    async def generate_content_async(self, prompt: str) -> StubResponse:
+        await asyncio.sleep(self.latency)
+        return StubResponse(self._respond(prompt))
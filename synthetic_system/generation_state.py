@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def _write_atomic(path: Path, data: Dict[str, Any], indent: Optional[int] = None):
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent)
+    os.replace(temp_path, path)
+
+
+class ResponseCache:
+    
+    def __init__(self, directory: str = "llm_cache"):
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+    
+    @staticmethod
+    def key(model_name: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model_name}\0{prompt}".encode("utf-8")).hexdigest()
+    
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+    
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                text = json.load(f)["text"]
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return text
+    
+    def put(self, key: str, model_name: str, text: str):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(path, {"key": key, "model": model_name, "created_at": time.time(), "text": text})
+        self.writes += 1
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {"cache_hits": self.hits, "cache_misses": self.misses, "cache_writes": self.writes}
+
+
+class GenerationManifest:
+    
+    def __init__(self, path: str = "generation_manifest.json"):
+        self.path = Path(path)
+        self.state: Dict[str, Any] = {"metadata": [], "products": {}}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+    
+    def _save(self):
+        _write_atomic(self.path, self.state, indent=2)
+    
+    def _product(self, product_id: int) -> Dict[str, Any]:
+        return self.state["products"].setdefault(str(product_id), {"reviews": False, "transcripts": []})
+    
+    def metadata_ids(self) -> List[str]:
+        return list(self.state["metadata"])
+    
+    def record_metadata(self, interviewee_ids: List[str]):
+        self.state["metadata"] = list(interviewee_ids)
+        self._save()
+    
+    def reviews_done(self, product_id: int) -> bool:
+        return self.state["products"].get(str(product_id), {}).get("reviews", False)
+    
+    def record_reviews(self, product_id: int):
+        self._product(product_id)["reviews"] = True
+        self._save()
+    
+    def transcript_done(self, product_id: int, index: int) -> bool:
+        return index in self.state["products"].get(str(product_id), {}).get("transcripts", [])
+    
+    def record_transcript(self, product_id: int, index: int):
+        transcripts = self._product(product_id)["transcripts"]
+        if index not in transcripts:
+            transcripts.append(index)
+            transcripts.sort()
+            self._save()
+    
+    def summary(self) -> Dict[str, int]:
+        products = self.state["products"].values()
+        return {
+            "metadata_profiles": len(self.state["metadata"]),
+            "review_sets": sum(1 for product in products if product["reviews"]),
+            "transcripts": sum(len(product["transcripts"]) for product in products)
+        }
@@ -0,0 +1,265 @@
+import heapq
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+import numpy as np
+
+
+class InterviewerIndex:
+    
+    COLUMNS = ("load", "capacity", "satisfaction", "completion_rate", "hourly_rate",
+               "available", "premium", "static_score")
+    
+    def __init__(self, available_status, encoder=None, specialty_threshold: float = 0.8,
+                 initial_capacity: int = 64, keyword_cache_size: int = 4096):
+        self.available_status = available_status
+        self.encoder = encoder
+        self.specialty_threshold = specialty_threshold
+        
+        self.interviewers = []
+        self.rows: Dict[str, int] = {}
+        self.versions: List[int] = []
+        self.available_count = 0
+        self.row_profiles: List[FrozenSet[int]] = []
+        self.column_profiles: Dict[int, Set[FrozenSet[int]]] = {}
+        self.buckets: Dict[Tuple[Optional[FrozenSet[int]], bool], list] = {}
+        self.profile_cache: Dict[bytes, List[Tuple[Optional[FrozenSet[int]], int]]] = {}
+        
+        self.load = np.zeros(initial_capacity, dtype=np.int32)
+        self.capacity = np.zeros(initial_capacity, dtype=np.int32)
+        self.satisfaction = np.zeros(initial_capacity, dtype=np.float64)
+        self.completion_rate = np.zeros(initial_capacity, dtype=np.float64)
+        self.hourly_rate = np.zeros(initial_capacity, dtype=np.float64)
+        self.available = np.zeros(initial_capacity, dtype=bool)
+        self.premium = np.zeros(initial_capacity, dtype=bool)
+        self.static_score = np.zeros(initial_capacity, dtype=np.float64)
+        
+        self.specialties: List[str] = []
+        self.specialty_columns: Dict[str, int] = {}
+        self.membership = np.zeros((initial_capacity, 0), dtype=np.float32)
+        self.specialty_embeddings: Optional[np.ndarray] = None
+        self.keyword_cache: Dict[str, np.ndarray] = {}
+        self.keyword_cache_size = keyword_cache_size
+    
+    def __len__(self) -> int:
+        return len(self.interviewers)
+    
+    def _grow_rows(self):
+        size = max(len(self.load) * 2, 1)
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(size, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+        
+        membership = np.zeros((size, self.membership.shape[1]), dtype=np.float32)
+        membership[:len(self.membership)] = self.membership
+        self.membership = membership
+    
+    def _specialty_column(self, specialty: str) -> int:
+        column = self.specialty_columns.get(specialty)
+        if column is None:
+            column = len(self.specialties)
+            self.specialties.append(specialty)
+            self.specialty_columns[specialty] = column
+            self.membership = np.hstack([self.membership, np.zeros((len(self.membership), 1), dtype=np.float32)])
+        return column
+    
+    def add(self, interviewer):
+        if len(self.interviewers) == len(self.load):
+            self._grow_rows()
+        
+        row = len(self.interviewers)
+        self.interviewers.append(interviewer)
+        self.rows[interviewer.interviewer_id] = row
+        self.versions.append(0)
+        
+        columns = frozenset(self._specialty_column(specialty) for specialty in interviewer.specialties)
+        self.row_profiles.append(columns)
+        for column in columns:
+            self.membership[row, column] = 1
+            profiles = self.column_profiles.setdefault(column, set())
+            if columns not in profiles:
+                profiles.add(columns)
+                self.profile_cache.clear()
+        
+        self.update(interviewer)
+    
+    def update(self, interviewer):
+        row = self.rows[interviewer.interviewer_id]
+        metrics = interviewer.performance_metrics
+        
+        load = interviewer.current_load
+        capacity = interviewer.max_capacity
+        available = interviewer.status == self.available_status and load < capacity
+        premium = metrics["customer_satisfaction"] > 4.5
+        static_score = (metrics["customer_satisfaction"] +
+                        metrics["completion_rate"] * 3 +
+                        (100 - interviewer.hourly_rate) / 100 * 2)
+        
+        self.load[row] = load
+        self.capacity[row] = capacity
+        self.satisfaction[row] = metrics["customer_satisfaction"]
+        self.completion_rate[row] = metrics["completion_rate"]
+        self.hourly_rate[row] = interviewer.hourly_rate
+        self.available_count += int(available) - int(self.available[row])
+        self.available[row] = available
+        self.premium[row] = premium
+        self.static_score[row] = static_score
+        
+        self.versions[row] += 1
+        if not available:
+            return
+        
+        base_score = (capacity - load) / max(capacity, 1) * 5 + static_score
+        entry = (-base_score, row, self.versions[row])
+        for key in (None, self.row_profiles[row]):
+            bucket_key = (key, premium)
+            heap = self.buckets.setdefault(bucket_key, [])
+            heapq.heappush(heap, entry)
+            if len(heap) > 2 * len(self.interviewers) + 64:
+                self._compact(bucket_key)
+    
+    def _is_current(self, entry: Tuple[float, int, int]) -> bool:
+        _, row, version = entry
+        return self.versions[row] == version
+    
+    def _compact(self, bucket_key: Tuple[Optional[FrozenSet[int]], bool]):
+        heap = [entry for entry in self.buckets[bucket_key] if self._is_current(entry)]
+        heapq.heapify(heap)
+        self.buckets[bucket_key] = heap
+    
+    def _head(self, bucket_key: Tuple[Optional[FrozenSet[int]], bool]) -> Optional[Tuple[float, int, int]]:
+        heap = self.buckets.get(bucket_key)
+        while heap and not self._is_current(heap[0]):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+    
+    def _refresh_specialty_embeddings(self):
+        known = 0 if self.specialty_embeddings is None else len(self.specialty_embeddings)
+        if known == len(self.specialties):
+            return
+        
+        embeddings = np.asarray(self.encoder.encode(self.specialties[known:]), dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.where(norms == 0, 1, norms)
+        
+        if self.specialty_embeddings is None:
+            self.specialty_embeddings = embeddings
+        else:
+            self.specialty_embeddings = np.vstack([self.specialty_embeddings, embeddings])
+    
+    def _keyword_matches(self, query_text: str) -> np.ndarray:
+        matched = self.keyword_cache.get(query_text)
+        if matched is not None and len(matched) == len(self.specialties):
+            return matched
+        
+        text = query_text.lower()
+        matched = np.array([
+            any(word in text for word in specialty.split()) for specialty in self.specialties
+        ], dtype=bool)
+        
+        if len(self.keyword_cache) >= self.keyword_cache_size:
+            self.keyword_cache.clear()
+        self.keyword_cache[query_text] = matched
+        return matched
+    
+    def match_specialties(self, query_text: str, query_embedding: Optional[np.ndarray] = None) -> np.ndarray:
+        matched = self._keyword_matches(query_text).copy()
+        
+        if query_embedding is not None and self.encoder is not None and self.specialties:
+            self._refresh_specialty_embeddings()
+            query_vector = np.asarray(query_embedding, dtype=np.float32)
+            norm = np.linalg.norm(query_vector)
+            if norm > 0 and query_vector.shape[-1] == self.specialty_embeddings.shape[1]:
+                similarities = self.specialty_embeddings @ (query_vector / norm)
+                matched |= similarities >= self.specialty_threshold
+        
+        return matched
+    
+    def calibrate_threshold(self, pairs: Iterable[Tuple[str, str, bool]], min_precision: float = 0.9) -> float:
+        pairs = [(query, self.specialty_columns[specialty], relevant) for query, specialty, relevant in pairs
+                 if specialty in self.specialty_columns]
+        if self.encoder is None or not pairs:
+            return self.specialty_threshold
+        
+        self._refresh_specialty_embeddings()
+        queries = sorted({query for query, _, _ in pairs})
+        query_rows = {query: i for i, query in enumerate(queries)}
+        vectors = np.asarray(self.encoder.encode(queries), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+        
+        similarities = np.array([vectors[query_rows[query]] @ self.specialty_embeddings[column]
+                                 for query, column, _ in pairs])
+        relevant = np.array([is_relevant for _, _, is_relevant in pairs], dtype=bool)
+        order = np.argsort(-similarities)
+        precision = np.cumsum(relevant[order]) / np.arange(1, len(order) + 1)
+        passing = np.flatnonzero(precision >= min_precision)
+        
+        if len(passing):
+            self.specialty_threshold = float(similarities[order[passing[-1]]])
+        else:
+            self.specialty_threshold = float(similarities.max()) + 1e-6
+        return self.specialty_threshold
+    
+    def matching_specialties(self, query_text: str, query_embedding: Optional[np.ndarray] = None) -> List[str]:
+        matched = self.match_specialties(query_text, query_embedding)
+        return [specialty for specialty, is_match in zip(self.specialties, matched) if is_match]
+    
+    def _matched_profiles(self, matched: np.ndarray) -> List[Tuple[Optional[FrozenSet[int]], int]]:
+        cache_key = matched.tobytes()
+        profiles = self.profile_cache.get(cache_key)
+        if profiles is not None:
+            return profiles
+        
+        columns = {int(column) for column in np.flatnonzero(matched)}
+        found = set()
+        for column in columns:
+            found.update(self.column_profiles.get(column, ()))
+        
+        profiles = [(None, 0)] + [(profile, len(profile & columns)) for profile in found]
+        if len(self.profile_cache) >= self.keyword_cache_size:
+            self.profile_cache.clear()
+        self.profile_cache[cache_key] = profiles
+        return profiles
+    
+    def candidates(self, matched: np.ndarray) -> np.ndarray:
+        rows = set()
+        for profile, _ in self._matched_profiles(matched):
+            for premium in (True, False):
+                head = self._head((profile, premium))
+                if head is not None:
+                    rows.add(head[1])
+        
+        return np.fromiter(sorted(rows), dtype=np.int64, count=len(rows))
+    
+    def scores(self, matched: np.ndarray, high_priority: bool, rows: np.ndarray) -> np.ndarray:
+        capacity = self.capacity[rows]
+        scores = self.membership[rows] @ matched.astype(np.float32) * 10
+        scores = scores + (capacity - self.load[rows]) / np.maximum(capacity, 1) * 5
+        scores += self.static_score[rows]
+        if high_priority:
+            scores += self.premium[rows] * 5
+        
+        return np.where(self.available[rows], scores, -np.inf)
+    
+    def best(self, query_text: str, high_priority: bool,
+             query_embedding: Optional[np.ndarray] = None) -> Optional[object]:
+        if not self.interviewers:
+            return None
+        
+        matched = self.match_specialties(query_text, query_embedding)
+        best_key = None
+        for profile, matches in self._matched_profiles(matched):
+            for premium in (True, False):
+                head = self._head((profile, premium))
+                if head is None:
+                    continue
+                
+                score = matches * 10 - head[0]
+                if high_priority and premium:
+                    score += 5
+                key = (-score, head[1])
+                if best_key is None or key < best_key:
+                    best_key = key
+        
+        return None if best_key is None else self.interviewers[best_key[1]]
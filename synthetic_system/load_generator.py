@@ -0,0 +1,331 @@
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from rag import ProductCategorizer
+from routing import InterviewRoutingSystem, QueryPriority
+from simulation import StubRAG
+
+QUERY_TEMPLATES = [
+    "What do customers like most about the {product}",
+    "What are the main complaints about the {product}",
+    "How does the {product} compare to competing products",
+    "Would buyers of the {product} purchase it again and why",
+    "What features of the {product} matter most to everyday users",
+    "How do customers feel about the price of the {product}",
+]
+
+DEFAULT_PRIORITY_MIX = {
+    QueryPriority.LOW: 0.2,
+    QueryPriority.NORMAL: 0.5,
+    QueryPriority.HIGH: 0.2,
+    QueryPriority.URGENT: 0.1,
+}
+
+
+class LatencyStubRAG(StubRAG):
+    
+    def __init__(self, latency_ms: float = 0.0, per_query_ms: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency_ms / 1000
+        self.per_query = per_query_ms / 1000
+    
+    def query_with_embedding(self, user_query: str, category: Optional[str] = None,
+                             tier=None, latency_budget_ms: Optional[float] = None,
+                             interviewee_ids: Optional[List[str]] = None):
+        time.sleep(self.latency + self.per_query)
+        return super().query_with_embedding(user_query, category, tier, interviewee_ids=interviewee_ids)
+    
+    def query_batch_with_embeddings(self, user_queries: List[str], categories=None, tiers=None,
+                                    interviewee_ids=None):
+        time.sleep(self.latency + self.per_query * len(user_queries))
+        interviewee_ids = interviewee_ids or [None] * len(user_queries)
+        return [StubRAG.query_with_embedding(self, user_query, interviewee_ids=ids)
+                for user_query, ids in zip(user_queries, interviewee_ids)]
+
+
+class QueryCatalog:
+    
+    def __init__(self, products_path: str = "products.txt",
+                 category_mix: Optional[Dict[str, float]] = None,
+                 templates: Optional[List[str]] = None):
+        with open(products_path, 'r') as f:
+            products = json.load(f)["products"]
+        
+        self.templates = templates or QUERY_TEMPLATES
+        self.products_by_category: Dict[str, List[str]] = {}
+        for product in products:
+            name = product["product_name"].split(",")[0].strip()
+            category = ProductCategorizer.categorize(product["product_name"]) or ProductCategorizer.DEFAULT_CATEGORY
+            self.products_by_category.setdefault(category, []).append(name)
+        
+        category_mix = category_mix or {category: len(names) for category, names in self.products_by_category.items()}
+        self.categories = [category for category in category_mix if self.products_by_category.get(category)]
+        if not self.categories:
+            raise ValueError(f"No products found for categories: {', '.join(category_mix)}")
+        self.category_weights = [category_mix[category] for category in self.categories]
+    
+    def sample(self, rng: random.Random) -> Tuple[str, str]:
+        category = rng.choices(self.categories, self.category_weights)[0]
+        product = rng.choice(self.products_by_category[category])
+        return rng.choice(self.templates).format(product=product), category
+
+
+def poisson_gaps(rate_per_second: float, rng: random.Random) -> Iterator[float]:
+    while True:
+        yield rng.expovariate(rate_per_second)
+
+
+def bursty_gaps(rate_per_second: float, rng: random.Random, burst_factor: float = 5.0,
+                burst_fraction: float = 0.1, mean_burst_seconds: float = 2.0) -> Iterator[float]:
+    burst_rate = rate_per_second * burst_factor
+    idle_rate = max((rate_per_second - burst_fraction * burst_rate) / (1 - burst_fraction), rate_per_second * 0.01)
+    mean_idle_seconds = mean_burst_seconds * (1 - burst_fraction) / burst_fraction
+    
+    in_burst = False
+    state_remaining = rng.expovariate(1 / mean_idle_seconds)
+    carried = 0.0
+    while True:
+        gap = rng.expovariate(burst_rate if in_burst else idle_rate)
+        if gap <= state_remaining:
+            state_remaining -= gap
+            yield carried + gap
+            carried = 0.0
+        else:
+            carried += state_remaining
+            in_burst = not in_burst
+            state_remaining = rng.expovariate(1 / (mean_burst_seconds if in_burst else mean_idle_seconds))
+
+
+class LoadGenerator:
+    
+    def __init__(self, routing_system: InterviewRoutingSystem, catalog: QueryCatalog,
+                 priority_mix: Optional[Dict[QueryPriority, float]] = None,
+                 sample_interval: float = 0.5, seed: Optional[int] = None):
+        self.routing_system = routing_system
+        self.catalog = catalog
+        self.priority_mix = priority_mix or DEFAULT_PRIORITY_MIX
+        self.sample_interval = sample_interval
+        self.rng = random.Random(seed)
+        
+        self.submitted = 0
+        self.rejected = 0
+        self.late_submissions = 0
+        self.timeline: List[Dict[str, float]] = []
+        self._sampling = False
+    
+    def _sample(self, started: float):
+        while self._sampling:
+            routing_system = self.routing_system
+            self.timeline.append({
+                "t_s": round(time.monotonic() - started, 2),
+                "submitted": self.submitted,
+                "assigned": routing_system.total_queries_processed,
+                "queue_size": routing_system.query_queue.qsize(),
+                "waiting_room_size": len(routing_system.waiting_room),
+                "active_assignments": len(routing_system.active_assignments)
+            })
+            time.sleep(self.sample_interval)
+    
+    def run(self, duration_s: float, gaps: Iterator[float], drain_timeout: float = 10.0) -> Dict[str, Any]:
+        priorities = list(self.priority_mix)
+        weights = list(self.priority_mix.values())
+        
+        started = time.monotonic()
+        self._sampling = True
+        sampler = threading.Thread(target=self._sample, args=(started,), daemon=True)
+        sampler.start()
+        
+        next_arrival = started
+        end = started + duration_s
+        while True:
+            next_arrival += next(gaps)
+            if next_arrival >= end:
+                break
+            
+            delay = next_arrival - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -0.05:
+                self.late_submissions += 1
+            
+            query_text, category = self.catalog.sample(self.rng)
+            query_id = self.routing_system.submit_query(
+                customer_id=f"LOAD_{self.submitted:07d}",
+                query_text=query_text,
+                priority=self.rng.choices(priorities, weights)[0],
+                expected_duration=self.rng.randint(45, 75),
+                category=category
+            )
+            self.submitted += 1
+            if query_id is None:
+                self.rejected += 1
+        
+        offered_seconds = time.monotonic() - started
+        drain_deadline = time.monotonic() + drain_timeout
+        while self.routing_system.query_queue.qsize() and time.monotonic() < drain_deadline:
+            time.sleep(0.05)
+        elapsed = time.monotonic() - started
+        
+        self._sampling = False
+        sampler.join(timeout=self.sample_interval * 2)
+        
+        return self.report(offered_seconds, elapsed)
+    
+    def _waiting_room_growth(self, offered_seconds: float) -> float:
+        sizes = [point["waiting_room_size"] for point in self.timeline if point["t_s"] <= offered_seconds]
+        if len(sizes) < 2:
+            return 0.0
+        
+        half = len(sizes) // 2
+        return round(sum(sizes[half:]) / (len(sizes) - half) - sum(sizes[:half]) / half, 2)
+    
+    def report(self, offered_seconds: float, elapsed: float) -> Dict[str, Any]:
+        routing_system = self.routing_system
+        snapshot = routing_system.metrics.snapshot()
+        assigned = routing_system.total_queries_processed
+        queued = routing_system.query_queue.qsize()
+        parked = len(routing_system.waiting_room)
+        deferred = sum(len(queries) for queries in getattr(routing_system, "deferred", {}).values())
+        routed = self.submitted - self.rejected - queued - parked - deferred
+        queue_sizes = [point["queue_size"] for point in self.timeline] or [0]
+        
+        return {
+            "offered_rate": round(self.submitted / offered_seconds, 2) if offered_seconds > 0 else 0.0,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "late_submissions": self.late_submissions,
+            "routed": routed,
+            "routed_throughput": round(routed / elapsed, 2) if elapsed > 0 else 0.0,
+            "assigned_throughput": round(assigned / elapsed, 2) if elapsed > 0 else 0.0,
+            "unrouted_at_end": queued + deferred,
+            "waiting_room_at_end": parked,
+            "waiting_room_growth": self._waiting_room_growth(offered_seconds),
+            "queue_depth": {
+                "max": max(queue_sizes),
+                "mean": round(sum(queue_sizes) / len(queue_sizes), 2)
+            },
+            "latency_ms": snapshot["latency_ms"],
+            "timeline": self.timeline
+        }
+
+
+def parse_mix(spec: Optional[str]) -> Optional[Dict[str, float]]:
+    if not spec:
+        return None
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight) if weight else 1.0
+    return mix
+
+
+def run_benchmark(rate: float, duration_s: float, process: str = "poisson", burst_factor: float = 5.0,
+                  priority_mix: Optional[Dict[QueryPriority, float]] = None,
+                  category_mix: Optional[Dict[str, float]] = None,
+                  num_workers: int = 4, batch_size: int = 16,
+                  rag_latency_ms: float = 2.0, rag_per_query_ms: float = 0.5,
+                  fleet_copies: int = 1, max_capacity: Optional[int] = None,
+                  interview_seconds: Optional[float] = None,
+                  products_path: str = "products.txt", seed: Optional[int] = None) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    catalog = QueryCatalog(products_path, category_mix)
+    routing_system = InterviewRoutingSystem(
+        LatencyStubRAG(rag_latency_ms, rag_per_query_ms),
+        num_workers=num_workers, batch_size=batch_size, history_dir=None
+    )
+    routing_system.verbose = False
+    if interview_seconds is not None:
+        routing_system.interview_duration = lambda assignment: rng.expovariate(1 / interview_seconds)
+        routing_system.mean_interview_s = interview_seconds
+    routing_system.scale_fleet(fleet_copies, max_capacity)
+    
+    if process == "bursty":
+        gaps = bursty_gaps(rate, rng, burst_factor=burst_factor)
+    else:
+        gaps = poisson_gaps(rate, rng)
+    
+    generator = LoadGenerator(routing_system, catalog, priority_mix, seed=seed)
+    try:
+        report = generator.run(duration_s, gaps)
+    finally:
+        routing_system.shutdown()
+    
+    report["target_rate"] = rate
+    report["process"] = process
+    return report
+
+
+def find_saturation(rates: List[float], duration_s: float, tolerance: float = 0.95,
+                    **benchmark_kwargs) -> Dict[str, Any]:
+    results = []
+    saturation_rate = None
+    for rate in rates:
+        report = run_benchmark(rate, duration_s, **benchmark_kwargs)
+        report.pop("timeline")
+        results.append(report)
+        print(f"rate={rate:.1f}/s offered={report['offered_rate']:.1f}/s routed={report['routed_throughput']:.1f}/s "
+              f"queue_max={report['queue_depth']['max']} waiting_room={report['waiting_room_at_end']} "
+              f"assignment_p99={report['latency_ms']['assignment_latency_ms'].get('p99', 0)}ms")
+        
+        if (report["routed_throughput"] < tolerance * report["offered_rate"] or report["unrouted_at_end"] or
+                report["waiting_room_at_end"] or report["waiting_room_growth"] > 0):
+            saturation_rate = rate
+            break
+    
+    return {"saturation_rate": saturation_rate, "runs": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline load generator for InterviewRoutingSystem")
+    parser.add_argument("--rate", type=float, default=50.0, help="Target arrivals per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of offered load")
+    parser.add_argument("--process", choices=["poisson", "bursty"], default="poisson")
+    parser.add_argument("--burst-factor", type=float, default=5.0)
+    parser.add_argument("--priority-mix", default=None, help="e.g. LOW=0.2,NORMAL=0.5,HIGH=0.2,URGENT=0.1")
+    parser.add_argument("--category-mix", default=None, help="e.g. technology=2,home=1")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--rag-latency-ms", type=float, default=2.0, help="Fixed stub RAG latency per call")
+    parser.add_argument("--rag-per-query-ms", type=float, default=0.5, help="Extra stub RAG latency per query")
+    parser.add_argument("--fleet-copies", type=int, default=1)
+    parser.add_argument("--max-capacity", type=int, default=None)
+    parser.add_argument("--interview-seconds", type=float, default=None, help="Mean simulated interview length")
+    parser.add_argument("--sweep", default=None, help="Comma-separated rates; stops at the first saturated one")
+    parser.add_argument("--products", default="products.txt")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+    args = parser.parse_args()
+    
+    priority_mix = parse_mix(args.priority_mix)
+    benchmark_kwargs = dict(
+        process=args.process,
+        burst_factor=args.burst_factor,
+        priority_mix={QueryPriority[name]: weight for name, weight in priority_mix.items()} if priority_mix else None,
+        category_mix=parse_mix(args.category_mix),
+        num_workers=args.workers,
+        batch_size=args.batch_size,
+        rag_latency_ms=args.rag_latency_ms,
+        rag_per_query_ms=args.rag_per_query_ms,
+        fleet_copies=args.fleet_copies,
+        max_capacity=args.max_capacity,
+        interview_seconds=args.interview_seconds,
+        products_path=args.products,
+        seed=args.seed
+    )
+    
+    if args.sweep:
+        result = find_saturation([float(rate) for rate in args.sweep.split(",")], args.duration, **benchmark_kwargs)
+    else:
+        result = run_benchmark(args.rate, args.duration, **benchmark_kwargs)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Report written to {os.path.abspath(args.output)}")
+    else:
+        result.pop("timeline", None)
+        print(json.dumps(result, indent=2))
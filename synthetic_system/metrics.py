@@ -0,0 +1,203 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+SUB_BUCKET_BITS = 5
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+MAX_SHIFT = 40
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "count", "total", "min", "max")
+    
+    def __init__(self):
+        self.counts = [0] * (SUB_BUCKET_COUNT + MAX_SHIFT * SUB_BUCKET_HALF)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+    
+    @staticmethod
+    def _index(micros: int) -> int:
+        if micros < SUB_BUCKET_COUNT:
+            return micros
+        shift = min(micros.bit_length() - SUB_BUCKET_BITS, MAX_SHIFT)
+        top = min(micros >> shift, SUB_BUCKET_COUNT - 1)
+        return SUB_BUCKET_COUNT + (shift - 1) * SUB_BUCKET_HALF + (top - SUB_BUCKET_HALF)
+    
+    @staticmethod
+    def _bucket_midpoint(index: int) -> float:
+        if index < SUB_BUCKET_COUNT:
+            return float(index)
+        offset = index - SUB_BUCKET_COUNT
+        shift = offset // SUB_BUCKET_HALF + 1
+        top = offset % SUB_BUCKET_HALF + SUB_BUCKET_HALF
+        return (top << shift) + (1 << shift) / 2
+    
+    def record(self, value_ms: float):
+        micros = max(int(value_ms * 1000), 0)
+        self.counts[self._index(micros)] += 1
+        self.count += 1
+        self.total += value_ms
+        self.min = value_ms if self.min is None else min(self.min, value_ms)
+        self.max = value_ms if self.max is None else max(self.max, value_ms)
+    
+    def percentile(self, percent: float) -> float:
+        if not self.count:
+            return 0.0
+        
+        threshold = max(1, int(round(self.count * percent / 100)))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= threshold:
+                return min(max(self._bucket_midpoint(index) / 1000, self.min), self.max)
+        return self.max
+    
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+    
+    def summary(self, scale: float = 1.0, digits: int = 2) -> Dict[str, float]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "p50": round(self.percentile(50) * scale, digits),
+            "p95": round(self.percentile(95) * scale, digits),
+            "p99": round(self.percentile(99) * scale, digits),
+            "max": round(self.max * scale, digits),
+            "mean": round(self.mean() * scale, digits)
+        }
+
+
+class RouterMetrics:
+    
+    HISTOGRAMS = ("queue_wait_ms", "rag_latency_ms", "assignment_latency_ms", "interview_duration_ms")
+    
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.started_at = clock()
+        self._lock = threading.Lock()
+        
+        self.histograms: Dict[str, LatencyHistogram] = {name: LatencyHistogram() for name in self.HISTOGRAMS}
+        self.events: Dict[str, Dict[str, int]] = {}
+        self.interviewer_completions: Dict[str, int] = {}
+        
+        self.total_capacity = 0
+        self.current_load = 0
+    
+    def observe(self, name: str, value_ms: float):
+        with self._lock:
+            self.histograms[name].record(value_ms)
+    
+    def count(self, event: str, priority: str):
+        with self._lock:
+            counts = self.events.setdefault(event, {})
+            counts[priority] = counts.get(priority, 0) + 1
+    
+    def interview_finished(self, interviewer_id: str, priority: str, duration_ms: float, status: str):
+        with self._lock:
+            counts = self.events.setdefault(status, {})
+            counts[priority] = counts.get(priority, 0) + 1
+            if status == "completed":
+                self.histograms["interview_duration_ms"].record(duration_ms)
+                self.interviewer_completions[interviewer_id] = self.interviewer_completions.get(interviewer_id, 0) + 1
+    
+    def add_capacity(self, capacity: int):
+        with self._lock:
+            self.total_capacity += capacity
+    
+    def load_changed(self, delta: int):
+        with self._lock:
+            self.current_load += delta
+    
+    def utilization(self) -> float:
+        return (self.current_load / self.total_capacity) * 100 if self.total_capacity > 0 else 0
+    
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            uptime_minutes = max((self.clock() - self.started_at) / 60, 1e-9)
+            return {
+                "uptime_s": round(uptime_minutes * 60, 1),
+                "utilization": round(self.utilization(), 2),
+                "latency_ms": {name: histogram.summary() for name, histogram in self.histograms.items()},
+                "events": {event: dict(counts) for event, counts in self.events.items()},
+                "throughput_per_min": {
+                    "by_priority": {
+                        priority: round(count / uptime_minutes, 3)
+                        for priority, count in self.events.get("completed", {}).items()
+                    },
+                    "by_interviewer": {
+                        interviewer_id: round(count / uptime_minutes, 3)
+                        for interviewer_id, count in self.interviewer_completions.items()
+                    }
+                }
+            }
+    
+    def render_prometheus(self, prefix: str = "interview_router") -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, histogram in self.histograms.items():
+                metric = f"{prefix}_{name}"
+                lines.append(f"# TYPE {metric} summary")
+                for quantile in (0.5, 0.95, 0.99):
+                    lines.append(f'{metric}{{quantile="{quantile}"}} {histogram.percentile(quantile * 100):.3f}')
+                lines.append(f"{metric}_sum {histogram.total:.3f}")
+                lines.append(f"{metric}_count {histogram.count}")
+            
+            for event, counts in self.events.items():
+                metric = f"{prefix}_queries_{event}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for priority, count in sorted(counts.items()):
+                    lines.append(f'{metric}{{priority="{priority}"}} {count}')
+            
+            metric = f"{prefix}_interviewer_completed_total"
+            lines.append(f"# TYPE {metric} counter")
+            for interviewer_id, count in sorted(self.interviewer_completions.items()):
+                lines.append(f'{metric}{{interviewer="{interviewer_id}"}} {count}')
+            
+            lines.append(f"# TYPE {prefix}_load gauge")
+            lines.append(f"{prefix}_load {self.current_load}")
+            lines.append(f"# TYPE {prefix}_capacity gauge")
+            lines.append(f"{prefix}_capacity {self.total_capacity}")
+        
+        return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        
+        body = self.server.metrics.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsExporter:
+    
+    def __init__(self, metrics: RouterMetrics, port: int = 9464, host: str = "127.0.0.1"):
+        self.server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        self.server.daemon_threads = True
+        self.server.metrics = metrics
+        self.thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        host, port = self.server.server_address[:2]
+        print(f"Metrics exporter listening on {host}:{port}/metrics")
+    
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
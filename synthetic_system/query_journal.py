@@ -0,0 +1,172 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Set, Tuple
+from event_log import get_logger
+
+QUEUED = "queued"
+ASSIGNED = "assigned"
+
+
+class QueryJournal:
+    
+    def __init__(self, path: str = "query_journal.db", max_batch: int = 1000, synchronous: str = "FULL"):
+        self.path = path
+        self.max_batch = max_batch
+        self.log = get_logger()
+        
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(f"PRAGMA synchronous={synchronous}")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS queries ("
+            "query_id TEXT PRIMARY KEY, state TEXT NOT NULL, record TEXT NOT NULL, "
+            "interviewer_id TEXT, updated_at REAL NOT NULL)"
+        )
+        
+        self._condition = threading.Condition()
+        self._pending: List[Tuple[int, str, tuple]] = []
+        self._sequence = 0
+        self._processed_sequence = 0
+        self._durable_sequence = 0
+        self._waiting: Set[int] = set()
+        self._errors: Dict[int, sqlite3.Error] = {}
+        self.batches_committed = 0
+        self.batches_failed = 0
+        self.records_failed = 0
+        self.records_committed = 0
+        self.largest_batch = 0
+        self.commit_seconds = 0.0
+        
+        self.running = True
+        self.writer_thread = threading.Thread(target=self._write_batches, name="query-journal-writer", daemon=True)
+        self.writer_thread.start()
+    
+    def _enqueue(self, operation: str, params: tuple, wait: bool):
+        with self._condition:
+            if not self.running:
+                raise RuntimeError("Query journal is closed")
+            self._sequence += 1
+            sequence = self._sequence
+            self._pending.append((sequence, operation, params))
+            self._condition.notify_all()
+            
+            if wait:
+                self._waiting.add(sequence)
+                while self._processed_sequence < sequence:
+                    self._condition.wait()
+                self._waiting.discard(sequence)
+                error = self._errors.pop(sequence, None)
+                if error is not None:
+                    raise error
+    
+    def record_submitted(self, query_id: str, record: Dict[str, Any], wait: bool = True):
+        self._enqueue("submit", (query_id, QUEUED, json.dumps(record), time.time()), wait)
+    
+    def record_assigned(self, query_id: str, interviewer_id: str):
+        self._enqueue("assign", (ASSIGNED, interviewer_id, time.time(), query_id), False)
+    
+    def record_finished(self, query_id: str):
+        self._enqueue("finish", (query_id,), False)
+    
+    def flush(self):
+        with self._condition:
+            sequence = self._sequence
+            while self._processed_sequence < sequence and self.writer_thread.is_alive():
+                self._condition.wait(timeout=1)
+    
+    def _apply(self, batch: List[Tuple[int, str, tuple]]):
+        statements = {
+            "submit": "INSERT OR REPLACE INTO queries (query_id, state, record, interviewer_id, updated_at) "
+                      "VALUES (?, ?, ?, NULL, ?)",
+            "assign": "UPDATE queries SET state = ?, interviewer_id = ?, updated_at = ? WHERE query_id = ?",
+            "finish": "DELETE FROM queries WHERE query_id = ?",
+        }
+        
+        self.connection.execute("BEGIN")
+        try:
+            start = 0
+            while start < len(batch):
+                operation = batch[start][1]
+                end = start
+                while end < len(batch) and batch[end][1] == operation:
+                    end += 1
+                self.connection.executemany(statements[operation], [params for _, _, params in batch[start:end]])
+                start = end
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+    
+    def _write_batches(self):
+        while True:
+            with self._condition:
+                while not self._pending and self.running:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+                sequence = batch[-1][0]
+            
+            start = time.perf_counter()
+            try:
+                self._apply(batch)
+            except sqlite3.Error as e:
+                self.log.error("journal_commit_failed", f"Error committing query journal batch of {len(batch)}: {e}",
+                               first_sequence=batch[0][0], last_sequence=sequence)
+                with self._condition:
+                    for entry_sequence, _, _ in batch:
+                        if entry_sequence in self._waiting:
+                            self._errors[entry_sequence] = e
+                    self._processed_sequence = sequence
+                    self.batches_failed += 1
+                    self.records_failed += len(batch)
+                    self._condition.notify_all()
+                continue
+            elapsed = time.perf_counter() - start
+            
+            with self._condition:
+                self._processed_sequence = sequence
+                self._durable_sequence = sequence
+                self.batches_committed += 1
+                self.records_committed += len(batch)
+                self.largest_batch = max(self.largest_batch, len(batch))
+                self.commit_seconds += elapsed
+                self._condition.notify_all()
+    
+    def replay(self) -> List[Tuple[str, Dict[str, Any]]]:
+        self.flush()
+        with self._condition:
+            rows = self.connection.execute(
+                "SELECT state, record FROM queries ORDER BY rowid"
+            ).fetchall()
+            self.connection.execute(
+                "UPDATE queries SET state = ?, interviewer_id = NULL WHERE state = ?", (QUEUED, ASSIGNED)
+            )
+        return [(state, json.loads(record)) for state, record in rows]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._condition:
+            batches = self.batches_committed
+            return {
+                "pending": len(self._pending),
+                "batches_committed": batches,
+                "records_committed": self.records_committed,
+                "batches_failed": self.batches_failed,
+                "records_failed": self.records_failed,
+                "mean_batch_size": round(self.records_committed / batches, 2) if batches else 0.0,
+                "largest_batch": self.largest_batch,
+                "mean_commit_ms": round(self.commit_seconds / batches * 1000, 3) if batches else 0.0
+            }
+    
+    def close(self):
+        with self._condition:
+            self.running = False
+            self._condition.notify_all()
+        self.writer_thread.join()
+        
+        self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.connection.close()
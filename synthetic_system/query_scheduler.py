@@ -0,0 +1,196 @@
+import asyncio
+import heapq
+import itertools
+import queue
+import threading
+import time
+from typing import Callable, Dict, Optional
+from metrics import LatencyHistogram
+
+
+class ScheduledQuery:
+    __slots__ = ("query", "sequence", "enqueued_at", "level", "level_entered_at", "deadline", "taken")
+    
+    def __init__(self, query, sequence: int, enqueued_at: float, level: int, deadline: float):
+        self.query = query
+        self.sequence = sequence
+        self.enqueued_at = enqueued_at
+        self.level = level
+        self.level_entered_at = enqueued_at
+        self.deadline = deadline
+        self.taken = False
+
+
+class QueryScheduler:
+    
+    def __init__(self, wait_budgets: Dict[int, float], aging_seconds: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.levels = sorted(wait_budgets, reverse=True)
+        self.aging_levels = self.levels[2:]
+        self.wait_budgets = wait_budgets
+        self.aging_seconds = aging_seconds
+        self.clock = clock
+        
+        self._heaps: Dict[int, list] = {level: [] for level in self.levels}
+        self._arrivals: Dict[int, list] = {level: [] for level in self.aging_levels}
+        self._depths: Dict[int, int] = {level: 0 for level in self.levels}
+        self._sequence = itertools.count()
+        
+        self.wait_times: Dict[int, LatencyHistogram] = {level: LatencyHistogram() for level in self.levels}
+        self.promotions = 0
+        self.deadline_misses = 0
+    
+    def __len__(self) -> int:
+        return sum(self._depths.values())
+    
+    def _enter_level(self, entry: ScheduledQuery, level: int, entered_at: float):
+        entry.level = level
+        entry.level_entered_at = entered_at
+        self._depths[level] += 1
+        heapq.heappush(self._heaps[level], (entry.deadline, entry.sequence, level, entry))
+        if level in self._arrivals:
+            heapq.heappush(self._arrivals[level], (entered_at, entry.sequence, level, entry))
+    
+    def push(self, query):
+        now = self.clock()
+        level = query.priority.value
+        entry = ScheduledQuery(query, next(self._sequence), now, level, now + self.wait_budgets[level])
+        self._enter_level(entry, level, now)
+    
+    def _head(self, level: int) -> Optional[ScheduledQuery]:
+        heap = self._heaps[level]
+        while heap:
+            entry, entry_level = heap[0][3], heap[0][2]
+            if not entry.taken and entry.level == entry_level:
+                return entry
+            heapq.heappop(heap)
+        return None
+    
+    def _promote(self, entry: ScheduledQuery, promoted_at: float):
+        next_level = self.levels[self.levels.index(entry.level) - 1]
+        self._depths[entry.level] -= 1
+        entry.deadline = min(entry.deadline, promoted_at + self.wait_budgets[next_level])
+        self._enter_level(entry, next_level, promoted_at)
+        self.promotions += 1
+    
+    def _age(self, now: float):
+        for level in reversed(self.aging_levels):
+            arrivals = self._arrivals[level]
+            while arrivals and arrivals[0][0] + self.aging_seconds <= now:
+                entered_at, _, entry_level, entry = heapq.heappop(arrivals)
+                if not entry.taken and entry.level == entry_level:
+                    self._promote(entry, entered_at + self.aging_seconds)
+            
+            head = self._head(level)
+            while head is not None and head.deadline <= now:
+                self._promote(head, now)
+                head = self._head(level)
+    
+    def pop(self) -> Optional[object]:
+        now = self.clock()
+        self._age(now)
+        
+        for level in self.levels:
+            entry = self._head(level)
+            if entry is None:
+                continue
+            
+            heapq.heappop(self._heaps[level])
+            entry.taken = True
+            self._depths[level] -= 1
+            
+            if now > entry.deadline:
+                self.deadline_misses += 1
+            self.wait_times[entry.query.priority.value].record((now - entry.enqueued_at) * 1000)
+            return entry.query
+        
+        return None
+    
+    def qsize(self) -> int:
+        return len(self)
+    
+    def depth_by_priority(self) -> Dict[int, int]:
+        return dict(self._depths)
+    
+    def get_stats(self) -> Dict[int, Dict[str, float]]:
+        stats = {}
+        for level in self.levels:
+            wait_times = self.wait_times[level]
+            level_stats = {"depth": self._depths[level]}
+            if wait_times.count:
+                level_stats.update({
+                    "dequeued": wait_times.count,
+                    "p50_wait_s": round(wait_times.percentile(50) / 1000, 3),
+                    "p95_wait_s": round(wait_times.percentile(95) / 1000, 3),
+                    "p99_wait_s": round(wait_times.percentile(99) / 1000, 3),
+                    "max_wait_s": round(wait_times.max / 1000, 3)
+                })
+            stats[level] = level_stats
+        return stats
+    
+    def snapshot(self) -> Dict[int, Dict[str, float]]:
+        return self.get_stats()
+
+
+class BlockingQueryScheduler(QueryScheduler):
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._condition = threading.Condition()
+    
+    def put(self, query):
+        with self._condition:
+            self.push(query)
+            self._condition.notify()
+    
+    def get(self, timeout: Optional[float] = None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                query = self.pop()
+                if query is not None:
+                    return query
+                
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self._condition.wait(timeout=remaining)
+    
+    def get_nowait(self):
+        with self._condition:
+            query = self.pop()
+        if query is None:
+            raise queue.Empty
+        return query
+    
+    def qsize(self) -> int:
+        with self._condition:
+            return len(self)
+    
+    def depth_by_priority(self) -> Dict[int, int]:
+        with self._condition:
+            return super().depth_by_priority()
+    
+    def snapshot(self) -> Dict[int, Dict[str, float]]:
+        with self._condition:
+            return self.get_stats()
+
+
+class AsyncQueryScheduler(QueryScheduler):
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._ready = asyncio.Event()
+    
+    async def put(self, query):
+        self.push(query)
+        self._ready.set()
+    
+    async def get(self):
+        while True:
+            query = self.pop()
+            if query is not None:
+                return query
+            
+            self._ready.clear()
+            await self._ready.wait()
@@ -1,16 +1,30 @@
+import asyncio
 import json
 import os
 import re
+import time
 import unicodedata
 from pathlib import Path
 from typing import List, Dict, Any, Tuple, Optional
 import numpy as np
 from sentence_transformers import SentenceTransformer
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue
+from qdrant_client import QdrantClient, AsyncQdrantClient
+from qdrant_client.models import (Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue, MatchAny,
+                                  SearchParams, SearchRequest, CreateAliasOperation,
+                                  CreateAlias, DeleteAliasOperation, DeleteAlias)
 import uuid
-from dataclasses import dataclass
+import zlib
+import heapq
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
 from sklearn.metrics.pairwise import cosine_similarity
+from embedding_server import EmbeddingClient
+from event_log import get_logger
+
+INTERVIEWEE_FILTER_FIELD = "sources[].interviewee_id"
 
 
 @dataclass
@@ -23,7 +37,38 @@ class SemanticChunk:
     end_turn: int
     speaker_distribution: Dict[str, int]
     embedding: Optional[np.ndarray] = None
+    sources: List[Tuple[str, str]] = field(default_factory=list)
+
+
+class SearchTier(Enum):
+    FAST = "fast"
+    BALANCED = "balanced"
+    HIGH_RECALL = "high_recall"
+    EXACT = "exact"
+
+
+@dataclass
+class SearchProfile:
+    budget_ms: float
+    hnsw_ef: Optional[int] = None
+    exact: bool = False
+    exact_fallback: bool = False
     
+    def search_params(self) -> Optional[SearchParams]:
+        if self.hnsw_ef is None and not self.exact:
+            return None
+        return SearchParams(hnsw_ef=self.hnsw_ef, exact=self.exact)
+    
+    def needs_exact_fallback(self, hits: int, top_k: int, query_filter: Optional[Filter]) -> bool:
+        return self.exact_fallback and not self.exact and query_filter is not None and hits < top_k
+
+
+SEARCH_PROFILES = {
+    SearchTier.FAST: SearchProfile(budget_ms=25, hnsw_ef=32),
+    SearchTier.BALANCED: SearchProfile(budget_ms=75),
+    SearchTier.HIGH_RECALL: SearchProfile(budget_ms=250, hnsw_ef=256, exact_fallback=True),
+    SearchTier.EXACT: SearchProfile(budget_ms=1000, exact=True),
+}
 
 class TextProcessor:
     
@@ -58,10 +103,49 @@ class TextProcessor:
         return text.strip()
 
 
+class ProductCategorizer:
+    
+    CATEGORIES = {
+        "technology": ["headphones", "bluetooth", "speaker", "smart", "wi-fi", "wifi", "usb", "charger",
+                       "power bank", "gaming", "mouse", "keyboard", "projector", "camera", "robot",
+                       "led", "electronics", "3d"],
+        "healthcare": ["toothbrush", "fitness", "exercise", "yoga", "dumbbell", "resistance", "foam roller",
+                       "massage", "serum", "skin", "acne", "sleep", "melatonin", "health", "wellness",
+                       "medical", "vitamin", "beard", "hair"],
+        "home": ["kitchen", "cooker", "fryer", "airfryer", "kettle", "coffee", "vacuum", "blanket", "skillet",
+                 "knife", "cutting board", "food", "baking", "curtain", "garden", "candle", "diffuser",
+                 "compost", "tea", "appliance"],
+        "business": ["office", "desk", "chair", "notebook", "scanner", "stapler", "dry erase", "laptop",
+                     "productivity", "business"],
+        "lifestyle": ["watch", "travel", "wallet", "boot", "pet", "dog", "cat ", "puzzle", "lego", "paint",
+                      "nail", "fashion", "accessories", "glasses", "camping", "hammock", "car "],
+    }
+    DEFAULT_CATEGORY = "general"
+    
+    @staticmethod
+    def categorize(text: str) -> Optional[str]:
+        text = text.lower()
+        
+        best_category = None
+        best_hits = 0
+        for category, keywords in ProductCategorizer.CATEGORIES.items():
+            hits = sum(1 for keyword in keywords if keyword in text)
+            if hits > best_hits:
+                best_category = category
+                best_hits = hits
+        
+        return best_category
+    
+    @staticmethod
+    def all_categories() -> List[str]:
+        return list(ProductCategorizer.CATEGORIES.keys()) + [ProductCategorizer.DEFAULT_CATEGORY]
+
+
 class SemanticChunker:
     
-    def __init__(self, model_name: str = "BAAI/bge-base-en-v1.5", similarity_threshold: float = 0.7):
-        self.model = SentenceTransformer(model_name)
+    def __init__(self, model_name: str = "BAAI/bge-base-en-v1.5", similarity_threshold: float = 0.7,
+                 model=None):
+        self.model = model if model is not None else SentenceTransformer(model_name)
         self.similarity_threshold = similarity_threshold
         self.text_processor = TextProcessor()
     
@@ -86,7 +170,8 @@ class SemanticChunker:
     
     def create_semantic_chunks(self, transcript_data: Dict[str, Any]) -> List[SemanticChunk]:
         transcript = transcript_data.get('transcript', [])
-        metadata = transcript_data.get('metadata', {})
+        metadata = dict(transcript_data.get('metadata', {}))
+        metadata.setdefault('interviewId', transcript_data.get('interviewId', ''))
         
         if not transcript:
             return []
@@ -153,37 +238,218 @@ class SemanticChunker:
         return chunk
 
 
+class ChunkDeduplicator:
+    
+    _MAX_HASH = (1 << 32) - 1
+    _PRIME = 4294967291
+    
+    def __init__(self, num_perm: int = 128, bands: int = 32, shingle_size: int = 3,
+                 similarity_threshold: float = 0.8, seed: int = 42):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+        
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.similarity_threshold = similarity_threshold
+        
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+        
+        self.last_report = {}
+    
+    def _shingles(self, text: str) -> np.ndarray:
+        words = re.findall(r'[a-z0-9]+', text.lower())
+        if len(words) < self.shingle_size:
+            grams = {" ".join(words)} if words else set()
+        else:
+            grams = {
+                " ".join(words[i:i + self.shingle_size])
+                for i in range(len(words) - self.shingle_size + 1)
+            }
+        
+        return np.array([zlib.crc32(gram.encode('utf-8')) for gram in grams], dtype=np.uint64)
+    
+    def signature(self, text: str) -> np.ndarray:
+        hashes = self._shingles(text)
+        if hashes.size == 0:
+            return np.full(self.num_perm, self._MAX_HASH, dtype=np.uint64)
+        
+        permuted = (np.outer(hashes, self._a) + self._b) % self._PRIME
+        return permuted.min(axis=0)
+    
+    def deduplicate(self, chunks: List[SemanticChunk]) -> List[SemanticChunk]:
+        if not chunks:
+            self.last_report = {"input_chunks": 0, "output_chunks": 0, "duplicates_removed": 0}
+            return []
+        
+        signatures = np.vstack([self.signature(chunk.text) for chunk in chunks])
+        
+        parent = list(range(len(chunks)))
+        
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        for band in range(self.bands):
+            band_slice = signatures[:, band * self.rows:(band + 1) * self.rows]
+            buckets = {}
+            for i, row in enumerate(band_slice):
+                buckets.setdefault(row.tobytes(), []).append(i)
+            
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                
+                anchor = members[0]
+                for other in members[1:]:
+                    root_a, root_b = find(anchor), find(other)
+                    if root_a == root_b:
+                        continue
+                    
+                    similarity = float(np.mean(signatures[anchor] == signatures[other]))
+                    if similarity >= self.similarity_threshold:
+                        parent[max(root_a, root_b)] = min(root_a, root_b)
+        
+        clusters = {}
+        for i in range(len(chunks)):
+            clusters.setdefault(find(i), []).append(i)
+        
+        deduplicated = []
+        for root in sorted(clusters):
+            members = clusters[root]
+            representative = max((chunks[i] for i in members), key=lambda c: len(c.text))
+            
+            sources = []
+            for i in members:
+                for source in chunks[i].sources or [(chunks[i].interviewee_id, chunks[i].interview_id)]:
+                    if source not in sources:
+                        sources.append(source)
+            
+            representative.sources = sources
+            deduplicated.append(representative)
+        
+        removed = len(chunks) - len(deduplicated)
+        self.last_report = {
+            "input_chunks": len(chunks),
+            "output_chunks": len(deduplicated),
+            "duplicates_removed": removed,
+            "clusters_merged": sum(1 for members in clusters.values() if len(members) > 1),
+            "reduction_pct": round(removed / len(chunks) * 100, 2)
+        }
+        
+        get_logger().info("chunks_deduplicated",
+                          f"Deduplicated {len(chunks)} chunks into {len(deduplicated)} "
+                          f"({self.last_report['reduction_pct']}% near-duplicates removed)",
+                          **self.last_report)
+        
+        return deduplicated
+
+
 class QdrantRAG:
     
     def __init__(self, collection_name: str = "interview_transcripts", 
                  model_name: str = "BAAI/bge-base-en-v1.5",
-                 qdrant_host: str = "localhost", qdrant_port: int = 6333):
+                 qdrant_host: str = "localhost", qdrant_port: int = 6333,
+                 dedup_threshold: Optional[float] = 0.8,
+                 shard_by_category: bool = False,
+                 embedding_server: Optional[str] = None):
         
         self.collection_name = collection_name
-        self.model = SentenceTransformer(model_name)
-        self.chunker = SemanticChunker(model_name)
+        self.shard_by_category = shard_by_category
+        self.categorizer = ProductCategorizer()
+        if embedding_server:
+            self.model = EmbeddingClient(embedding_server)
+        else:
+            self.model = SentenceTransformer(model_name)
+        self.chunker = SemanticChunker(model_name, model=self.model)
+        self.deduplicator = ChunkDeduplicator(similarity_threshold=dedup_threshold) if dedup_threshold else None
         
+        self.qdrant_host = qdrant_host
+        self.qdrant_port = qdrant_port
         self.client = QdrantClient(host=qdrant_host, port=qdrant_port)
         
+        if shard_by_category:
+            self.shards = {
+                category: f"{collection_name}_{category}"
+                for category in self.categorizer.all_categories()
+            }
+            self.search_executor = ThreadPoolExecutor(max_workers=len(self.shards),
+                                                      thread_name_prefix="rag-shard")
+        else:
+            self.shards = {}
+            self.search_executor = None
+        
+        self.search_profiles = dict(SEARCH_PROFILES)
+        self.tier_latencies = {tier: deque(maxlen=1000) for tier in SearchTier}
+        self.batch_latencies = deque(maxlen=1000)
+        self.read_overrides: Dict[str, str] = {}
+        
         self._create_collection()
     
+    def _collection_names(self) -> List[str]:
+        return list(self.shards.values()) if self.shard_by_category else [self.collection_name]
+    
+    def _alias_targets(self) -> Dict[str, str]:
+        aliases = self.client.get_aliases().aliases
+        return {alias.alias_name: alias.collection_name for alias in aliases}
+    
     def _create_collection(self):
         try:
             collections = self.client.get_collections()
             collection_names = [col.name for col in collections.collections]
+            alias_targets = self._alias_targets()
             
-            if self.collection_name not in collection_names:
-                self.client.create_collection(
-                    collection_name=self.collection_name,
-                    vectors_config=VectorParams(size=768, distance=Distance.COSINE)
-                )
-                print(f"Created collection: {self.collection_name}")
-            else:
-                print(f"Collection {self.collection_name} already exists")
+            for name in self._collection_names():
+                if name in alias_targets:
+                    print(f"Collection alias {name} -> {alias_targets[name]}")
+                elif name not in collection_names:
+                    self.client.create_collection(
+                        collection_name=name,
+                        vectors_config=VectorParams(size=768, distance=Distance.COSINE)
+                    )
+                    self._create_payload_indexes(name)
+                    print(f"Created collection: {name}")
+                else:
+                    print(f"Collection {name} already exists")
                 
         except Exception as e:
             print(f"Error creating collection: {e}")
     
+    def _create_payload_indexes(self, collection_name: str):
+        self.client.create_payload_index(
+            collection_name=collection_name,
+            field_name=INTERVIEWEE_FILTER_FIELD,
+            field_schema="keyword"
+        )
+    
+    @staticmethod
+    def interviewee_filter(interviewee_ids: Optional[List[str]]) -> Optional[Filter]:
+        if interviewee_ids is None:
+            return None
+        
+        return Filter(must=[FieldCondition(key=INTERVIEWEE_FILTER_FIELD, match=MatchAny(any=list(interviewee_ids)))])
+    
+    def resolve_category(self, query: str, category: Optional[str] = None) -> Optional[str]:
+        if not self.shard_by_category:
+            return None
+        
+        if category and category != ProductCategorizer.DEFAULT_CATEGORY and category in self.shards:
+            return category
+        
+        return self.categorizer.categorize(query)
+    
+    def _collection_for_chunk(self, chunk: SemanticChunk) -> str:
+        if not self.shard_by_category:
+            return self.collection_name
+        
+        category = self.categorizer.categorize(chunk.product_name) or ProductCategorizer.DEFAULT_CATEGORY
+        return self.shards[category]
+    
     def load_and_process_transcripts(self, transcript_dir: str = "transcripts") -> List[SemanticChunk]:
         transcript_path = Path(transcript_dir)
         all_chunks = []
@@ -195,6 +461,8 @@ class QdrantRAG:
         json_files = list(transcript_path.glob("*.json"))
         print(f"Found {len(json_files)} transcript files")
         
+        log = get_logger()
+        
         for json_file in json_files:
             try:
                 with open(json_file, 'r', encoding='utf-8') as f:
@@ -202,15 +470,18 @@ class QdrantRAG:
                 
                 chunks = self.chunker.create_semantic_chunks(transcript_data)
                 all_chunks.extend(chunks)
-                print(f"Processed {json_file.name}: {len(chunks)} chunks")
+                log.info("transcript_processed", f"Processed {json_file.name}: {len(chunks)} chunks",
+                         file=json_file.name, chunks=len(chunks))
                 
             except Exception as e:
-                print(f"Error processing {json_file}: {e}")
+                log.error("transcript_failed", f"Error processing {json_file}: {e}", file=str(json_file))
         
+        log.flush()
         print(f"Total chunks created: {len(all_chunks)}")
         return all_chunks
     
-    def embed_and_store_chunks(self, chunks: List[SemanticChunk]):
+    def embed_and_store_chunks(self, chunks: List[SemanticChunk],
+                               target_collections: Optional[Dict[str, str]] = None):
         if not chunks:
             print("No chunks to store")
             return
@@ -219,67 +490,109 @@ class QdrantRAG:
         texts = [chunk.text for chunk in chunks]
         embeddings = self.model.encode(texts, show_progress_bar=True)
         
-        points = []
+        points_by_collection = {}
         for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
+            collection_name = self._collection_for_chunk(chunk)
+            if target_collections:
+                collection_name = target_collections[collection_name]
+            point_key = f"{chunk.interview_id}:{chunk.interviewee_id}:{chunk.start_turn}-{chunk.end_turn}"
             point = PointStruct(
-                id=str(uuid.uuid4()),
+                id=str(uuid.uuid5(uuid.NAMESPACE_URL, point_key)),
                 vector=embedding.tolist(),
                 payload={
                     "text": chunk.text,
                     "interviewee_id": chunk.interviewee_id,
                     "interview_id": chunk.interview_id,
                     "product_name": chunk.product_name,
+                    "category": self.categorizer.categorize(chunk.product_name) or ProductCategorizer.DEFAULT_CATEGORY,
                     "start_turn": chunk.start_turn,
                     "end_turn": chunk.end_turn,
-                    "speaker_distribution": chunk.speaker_distribution
+                    "speaker_distribution": chunk.speaker_distribution,
+                    "sources": [
+                        {"interviewee_id": interviewee_id, "interview_id": interview_id}
+                        for interviewee_id, interview_id in
+                        (chunk.sources or [(chunk.interviewee_id, chunk.interview_id)])
+                    ]
                 }
             )
-            points.append(point)
+            points_by_collection.setdefault(collection_name, []).append(point)
         
         batch_size = 100
-        for i in range(0, len(points), batch_size):
-            batch = points[i:i+batch_size]
-            self.client.upsert(
-                collection_name=self.collection_name,
-                points=batch
-            )
-        
-        print(f"Stored {len(points)} chunks in Qdrant")
+        for collection_name, points in points_by_collection.items():
+            for i in range(0, len(points), batch_size):
+                batch = points[i:i+batch_size]
+                self.client.upsert(
+                    collection_name=collection_name,
+                    points=batch
+                )
+            
+            get_logger().info("chunks_stored", f"Stored {len(points)} chunks in {collection_name}",
+                              collection=collection_name, chunks=len(points))
     
-    def search_relevant_transcripts(self, query: str, top_k: int = 10) -> List[str]:
-        query_embedding = self.model.encode([query])[0]
+    def _search_collection(self, collection_name: str, query_vector: List[float], top_k: int,
+                           profile: Optional[SearchProfile] = None, query_filter: Optional[Filter] = None):
+        profile = profile or self.search_profiles[SearchTier.BALANCED]
+        collection_name = self.read_overrides.get(collection_name, collection_name)
         
-        search_results = self.client.search(
-            collection_name=self.collection_name,
-            query_vector=query_embedding.tolist(),
+        results = self.client.search(
+            collection_name=collection_name,
+            query_vector=query_vector,
+            query_filter=query_filter,
             limit=top_k,
-            score_threshold=0.3
+            score_threshold=0.3,
+            search_params=profile.search_params()
         )
         
+        if profile.needs_exact_fallback(len(results), top_k, query_filter):
+            results = self.client.search(
+                collection_name=collection_name,
+                query_vector=query_vector,
+                query_filter=query_filter,
+                limit=top_k,
+                score_threshold=0.3,
+                search_params=SearchParams(exact=True)
+            )
+        
+        return results
+    
+    def _search(self, query_embedding: np.ndarray, top_k: int, category: Optional[str] = None,
+                profile: Optional[SearchProfile] = None, query_filter: Optional[Filter] = None):
+        query_vector = query_embedding.tolist()
+        
+        if not self.shard_by_category:
+            return self._search_collection(self.collection_name, query_vector, top_k, profile, query_filter)
+        
+        if category in self.shards:
+            return self._search_collection(self.shards[category], query_vector, top_k, profile, query_filter)
+        
+        futures = [
+            self.search_executor.submit(self._search_collection, name, query_vector, top_k, profile, query_filter)
+            for name in self.shards.values()
+        ]
+        shard_results = [future.result() for future in futures]
+        
+        return heapq.nlargest(top_k, (hit for hits in shard_results for hit in hits), key=lambda hit: hit.score)
+    
+    def _interviewees_from_results(self, search_results, allowed_interviewees: Optional[set] = None) -> List[str]:
         seen_interviewees = set()
         relevant_interviewees = []
         
         for result in search_results:
-            interviewee_id = result.payload.get("interviewee_id")
-            if interviewee_id and interviewee_id not in seen_interviewees:
-                seen_interviewees.add(interviewee_id)
-                relevant_interviewees.append(interviewee_id)
+            sources = result.payload.get("sources") or [{"interviewee_id": result.payload.get("interviewee_id")}]
+            for source in sources:
+                interviewee_id = source.get("interviewee_id")
+                if allowed_interviewees is not None and interviewee_id not in allowed_interviewees:
+                    continue
+                if interviewee_id and interviewee_id not in seen_interviewees:
+                    seen_interviewees.add(interviewee_id)
+                    relevant_interviewees.append(interviewee_id)
                 
                 if len(relevant_interviewees) >= 3:
-                    break
+                    return relevant_interviewees
         
         return relevant_interviewees
     
-    def get_detailed_results(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
-        query_embedding = self.model.encode([query])[0]
-        
-        search_results = self.client.search(
-            collection_name=self.collection_name,
-            query_vector=query_embedding.tolist(),
-            limit=top_k,
-            score_threshold=0.3
-        )
-        
+    def _detailed_from_results(self, search_results) -> List[Dict[str, Any]]:
         detailed_results = []
         for result in search_results:
             detailed_results.append({
@@ -288,29 +601,431 @@ class QdrantRAG:
                 "product_name": result.payload.get("product_name"),
                 "text_snippet": result.payload.get("text")[:200] + "...",
                 "interview_id": result.payload.get("interview_id"),
-                "turns": f"{result.payload.get('start_turn')}-{result.payload.get('end_turn')}"
+                "turns": f"{result.payload.get('start_turn')}-{result.payload.get('end_turn')}",
+                "duplicate_sources": len(result.payload.get("sources") or [])
             })
         
         return detailed_results
     
-    def build_index(self, transcript_dir: str = "transcripts"):
-        print("Starting RAG index building...")
+    def select_tier(self, latency_budget_ms: float) -> SearchTier:
+        for tier in (SearchTier.EXACT, SearchTier.HIGH_RECALL, SearchTier.BALANCED):
+            latencies = self.tier_latencies[tier]
+            if len(latencies) >= 20:
+                expected_ms = float(np.percentile(list(latencies), 95))
+            else:
+                expected_ms = self.search_profiles[tier].budget_ms
+            
+            if expected_ms <= latency_budget_ms:
+                return tier
+        
+        return SearchTier.FAST
+    
+    def _run_search(self, query: str, top_k: int, category: Optional[str],
+                    tier: Optional[SearchTier], latency_budget_ms: Optional[float],
+                    interviewee_ids: Optional[List[str]] = None):
+        if tier is None:
+            tier = self.select_tier(latency_budget_ms) if latency_budget_ms is not None else SearchTier.BALANCED
+        
+        start = time.perf_counter()
+        query_embedding = self.model.encode([query])[0]
+        if interviewee_ids is not None and not interviewee_ids:
+            return [], query_embedding
+        search_results = self._search(query_embedding, top_k, self.resolve_category(query, category),
+                                      self.search_profiles[tier], self.interviewee_filter(interviewee_ids))
+        self.tier_latencies[tier].append((time.perf_counter() - start) * 1000)
         
+        return search_results, query_embedding
+    
+    @staticmethod
+    def _latency_summary(latencies) -> Dict[str, float]:
+        samples = np.array(list(latencies))
+        return {
+            "count": len(samples),
+            "p50_ms": round(float(np.percentile(samples, 50)), 2),
+            "p95_ms": round(float(np.percentile(samples, 95)), 2),
+            "mean_ms": round(float(samples.mean()), 2)
+        }
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        stats = {}
+        for tier, latencies in self.tier_latencies.items():
+            if not latencies:
+                continue
+            stats[tier.value] = {"budget_ms": self.search_profiles[tier].budget_ms,
+                                 **self._latency_summary(latencies)}
+        if self.batch_latencies:
+            stats["batch"] = self._latency_summary(self.batch_latencies)
+        return stats
+    
+    def search_relevant_transcripts(self, query: str, top_k: int = 10,
+                                    category: Optional[str] = None,
+                                    tier: Optional[SearchTier] = None,
+                                    latency_budget_ms: Optional[float] = None) -> List[str]:
+        search_results, _ = self._run_search(query, top_k, category, tier, latency_budget_ms)
+        
+        return self._interviewees_from_results(search_results)
+    
+    def get_detailed_results(self, query: str, top_k: int = 10,
+                             category: Optional[str] = None,
+                             tier: Optional[SearchTier] = None,
+                             latency_budget_ms: Optional[float] = None) -> List[Dict[str, Any]]:
+        search_results, _ = self._run_search(query, top_k, category, tier, latency_budget_ms)
+        
+        return self._detailed_from_results(search_results)
+    
+    def _prepare_chunks(self, transcript_dir: str) -> List[SemanticChunk]:
         chunks = self.load_and_process_transcripts(transcript_dir)
         
         if not chunks:
             print("No chunks created. Check your transcript directory and files.")
+            return []
+        
+        if self.deduplicator:
+            chunks_by_collection = {}
+            for chunk in chunks:
+                chunks_by_collection.setdefault(self._collection_for_chunk(chunk), []).append(chunk)
+            
+            chunks = [
+                deduplicated
+                for collection_chunks in chunks_by_collection.values()
+                for deduplicated in self.deduplicator.deduplicate(collection_chunks)
+            ]
+        
+        return chunks
+    
+    def build_index(self, transcript_dir: str = "transcripts"):
+        print("Starting RAG index building...")
+        
+        chunks = self._prepare_chunks(transcript_dir)
+        if not chunks:
             return
         
         self.embed_and_store_chunks(chunks)
         
         print("RAG index building completed!")
     
-    def query(self, user_query: str) -> Tuple[List[str], List[Dict[str, Any]]]:
-        interviewee_ids = self.search_relevant_transcripts(user_query)
-        detailed_results = self.get_detailed_results(user_query)
+    def _warm_collections(self, collection_names: List[str], warmup_queries: List[str]):
+        embeddings = self.model.encode(warmup_queries)
+        for name in collection_names:
+            for embedding in embeddings:
+                self._search_collection(name, embedding.tolist(), 10)
+        
+        print(f"Warmed {len(collection_names)} collections with {len(warmup_queries)} queries")
+    
+    def _swap_aliases(self, target_collections: Dict[str, str]):
+        alias_targets = self._alias_targets()
+        existing_collections = {col.name for col in self.client.get_collections().collections}
+        
+        legacy_collections = {alias: collection_name for alias, collection_name in target_collections.items()
+                              if alias not in alias_targets and alias in existing_collections}
+        
+        operations = []
+        for alias, collection_name in target_collections.items():
+            if alias in legacy_collections:
+                continue
+            if alias in alias_targets:
+                operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=alias)))
+            operations.append(CreateAliasOperation(
+                create_alias=CreateAlias(collection_name=collection_name, alias_name=alias)
+            ))
+        
+        if operations:
+            self.client.update_collection_aliases(change_aliases_operations=operations)
         
-        return interviewee_ids, detailed_results
+        for alias, collection_name in legacy_collections.items():
+            print(f"Migrating legacy collection {alias} to an alias")
+            self.read_overrides[alias] = collection_name
+            self.client.delete_collection(collection_name=alias)
+            self.client.update_collection_aliases(change_aliases_operations=[CreateAliasOperation(
+                create_alias=CreateAlias(collection_name=collection_name, alias_name=alias)
+            )])
+            del self.read_overrides[alias]
+        
+        for alias, collection_name in target_collections.items():
+            print(f"Alias {alias} -> {collection_name}")
+    
+    def _collect_old_versions(self, target_collections: Dict[str, str], keep_previous: int):
+        existing_collections = sorted(col.name for col in self.client.get_collections().collections)
+        
+        for alias, live_collection in target_collections.items():
+            versions = [name for name in existing_collections
+                        if name.startswith(f"{alias}__v") and name != live_collection]
+            stale = versions[:-keep_previous] if keep_previous > 0 else versions
+            
+            for name in stale:
+                self.client.delete_collection(collection_name=name)
+                print(f"Deleted old collection version: {name}")
+    
+    def rebuild_index(self, transcript_dir: str = "transcripts",
+                      warmup_queries: Optional[List[str]] = None,
+                      keep_previous: int = 0) -> Dict[str, str]:
+        print("Starting blue/green RAG index rebuild...")
+        
+        chunks = self._prepare_chunks(transcript_dir)
+        if not chunks:
+            return {}
+        
+        version = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        target_collections = {alias: f"{alias}__v{version}" for alias in self._collection_names()}
+        
+        for collection_name in target_collections.values():
+            self.client.create_collection(
+                collection_name=collection_name,
+                vectors_config=VectorParams(size=768, distance=Distance.COSINE)
+            )
+            self._create_payload_indexes(collection_name)
+            print(f"Created collection: {collection_name}")
+        
+        self.embed_and_store_chunks(chunks, target_collections)
+        
+        if warmup_queries:
+            self._warm_collections(list(target_collections.values()), warmup_queries)
+        
+        self._swap_aliases(target_collections)
+        self._collect_old_versions(target_collections, keep_previous)
+        
+        print("RAG index rebuild completed!")
+        return target_collections
+    
+    def query_with_embedding(self, user_query: str, category: Optional[str] = None,
+                             tier: Optional[SearchTier] = None,
+                             latency_budget_ms: Optional[float] = None,
+                             interviewee_ids: Optional[List[str]] = None) -> Tuple[List[str], List[Dict[str, Any]], np.ndarray]:
+        search_results, query_embedding = self._run_search(user_query, 10, category, tier, latency_budget_ms,
+                                                           interviewee_ids)
+        
+        allowed_interviewees = set(interviewee_ids) if interviewee_ids is not None else None
+        relevant_interviewees = self._interviewees_from_results(search_results, allowed_interviewees)
+        detailed_results = self._detailed_from_results(search_results)
+        
+        return relevant_interviewees, detailed_results, query_embedding
+    
+    def query(self, user_query: str, category: Optional[str] = None,
+              tier: Optional[SearchTier] = None,
+              latency_budget_ms: Optional[float] = None,
+              interviewee_ids: Optional[List[str]] = None) -> Tuple[List[str], List[Dict[str, Any]]]:
+        relevant_interviewees, detailed_results, _ = self.query_with_embedding(
+            user_query, category, tier, latency_budget_ms, interviewee_ids
+        )
+        
+        return relevant_interviewees, detailed_results
+    
+    def _search_batch(self, query_embeddings: np.ndarray, top_k: int, categories: List[Optional[str]],
+                      profiles: List[SearchProfile], query_filters: Optional[List[Optional[Filter]]] = None) -> List[list]:
+        query_filters = query_filters or [None] * len(query_embeddings)
+        requests_by_collection = {}
+        for i, (embedding, category, profile, query_filter) in enumerate(
+                zip(query_embeddings, categories, profiles, query_filters)):
+            if not self.shard_by_category:
+                collection_names = [self.collection_name]
+            elif category in self.shards:
+                collection_names = [self.shards[category]]
+            else:
+                collection_names = list(self.shards.values())
+            
+            request = SearchRequest(
+                vector=embedding.tolist(),
+                filter=query_filter,
+                limit=top_k,
+                score_threshold=0.3,
+                params=profile.search_params(),
+                with_payload=True
+            )
+            for name in collection_names:
+                requests_by_collection.setdefault(name, []).append((i, request))
+        
+        def run_collection(name: str, indexed_requests: list):
+            return self.client.search_batch(
+                collection_name=self.read_overrides.get(name, name),
+                requests=[request for _, request in indexed_requests]
+            )
+        
+        if self.search_executor and len(requests_by_collection) > 1:
+            futures = {
+                name: self.search_executor.submit(run_collection, name, indexed_requests)
+                for name, indexed_requests in requests_by_collection.items()
+            }
+            batch_results = {name: future.result() for name, future in futures.items()}
+        else:
+            batch_results = {
+                name: run_collection(name, indexed_requests)
+                for name, indexed_requests in requests_by_collection.items()
+            }
+        
+        hits_per_query = [[] for _ in range(len(query_embeddings))]
+        for name, indexed_requests in requests_by_collection.items():
+            for (i, _), hits in zip(indexed_requests, batch_results[name]):
+                hits_per_query[i].extend(hits)
+        
+        results = []
+        for i, hits in enumerate(hits_per_query):
+            hits = heapq.nlargest(top_k, hits, key=lambda hit: hit.score)
+            profile = profiles[i]
+            if profile.needs_exact_fallback(len(hits), top_k, query_filters[i]):
+                hits = self._search(query_embeddings[i], top_k, categories[i], profile, query_filters[i])
+            results.append(hits)
+        
+        return results
+    
+    def query_batch_with_embeddings(self, user_queries: List[str],
+                                    categories: Optional[List[Optional[str]]] = None,
+                                    tiers: Optional[List[Optional[SearchTier]]] = None,
+                                    interviewee_ids: Optional[List[Optional[List[str]]]] = None
+                                    ) -> List[Tuple[List[str], List[Dict[str, Any]], np.ndarray]]:
+        if not user_queries:
+            return []
+        
+        categories = categories or [None] * len(user_queries)
+        tiers = [tier or SearchTier.BALANCED for tier in (tiers or [None] * len(user_queries))]
+        interviewee_ids = interviewee_ids or [None] * len(user_queries)
+        
+        start = time.perf_counter()
+        query_embeddings = self.model.encode(user_queries)
+        searchable = [i for i, ids in enumerate(interviewee_ids) if ids is None or ids]
+        searched = self._search_batch(
+            query_embeddings[searchable], 10,
+            [self.resolve_category(user_queries[i], categories[i]) for i in searchable],
+            [self.search_profiles[tiers[i]] for i in searchable],
+            [self.interviewee_filter(interviewee_ids[i]) for i in searchable]
+        ) if searchable else []
+        batch_results = [[] for _ in user_queries]
+        for i, search_results in zip(searchable, searched):
+            batch_results[i] = search_results
+        self.batch_latencies.append((time.perf_counter() - start) * 1000)
+        
+        return [
+            (self._interviewees_from_results(search_results, set(ids) if ids is not None else None),
+             self._detailed_from_results(search_results), query_embedding)
+            for search_results, query_embedding, ids in zip(batch_results, query_embeddings, interviewee_ids)
+        ]
+    
+    def query_batch(self, user_queries: List[str], categories: Optional[List[Optional[str]]] = None,
+                    tiers: Optional[List[Optional[SearchTier]]] = None,
+                    interviewee_ids: Optional[List[Optional[List[str]]]] = None) -> List[Tuple[List[str], List[Dict[str, Any]]]]:
+        return [
+            (relevant_interviewees, detailed_results)
+            for relevant_interviewees, detailed_results, _ in self.query_batch_with_embeddings(
+                user_queries, categories, tiers, interviewee_ids
+            )
+        ]
+
+
+class AsyncQdrantRAG(QdrantRAG):
+    
+    def __init__(self, *args, encode_workers: int = 2, **kwargs):
+        super().__init__(*args, **kwargs)
+        
+        self.async_client = AsyncQdrantClient(host=self.qdrant_host, port=self.qdrant_port)
+        self.encode_executor = ThreadPoolExecutor(max_workers=encode_workers, thread_name_prefix="rag-encode")
+    
+    async def _encode_async(self, texts: List[str]) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.encode_executor, self.model.encode, texts)
+    
+    async def _search_collection_async(self, collection_name: str, query_vector: List[float], top_k: int,
+                                       profile: Optional[SearchProfile] = None,
+                                       query_filter: Optional[Filter] = None):
+        profile = profile or self.search_profiles[SearchTier.BALANCED]
+        collection_name = self.read_overrides.get(collection_name, collection_name)
+        
+        results = await self.async_client.search(
+            collection_name=collection_name,
+            query_vector=query_vector,
+            query_filter=query_filter,
+            limit=top_k,
+            score_threshold=0.3,
+            search_params=profile.search_params()
+        )
+        
+        if profile.needs_exact_fallback(len(results), top_k, query_filter):
+            results = await self.async_client.search(
+                collection_name=collection_name,
+                query_vector=query_vector,
+                query_filter=query_filter,
+                limit=top_k,
+                score_threshold=0.3,
+                search_params=SearchParams(exact=True)
+            )
+        
+        return results
+    
+    async def _search_async(self, query_embedding: np.ndarray, top_k: int, category: Optional[str] = None,
+                            profile: Optional[SearchProfile] = None, query_filter: Optional[Filter] = None):
+        query_vector = query_embedding.tolist()
+        
+        if not self.shard_by_category:
+            return await self._search_collection_async(self.collection_name, query_vector, top_k, profile,
+                                                       query_filter)
+        
+        if category in self.shards:
+            return await self._search_collection_async(self.shards[category], query_vector, top_k, profile,
+                                                       query_filter)
+        
+        shard_results = await asyncio.gather(*[
+            self._search_collection_async(name, query_vector, top_k, profile, query_filter)
+            for name in self.shards.values()
+        ])
+        
+        return heapq.nlargest(top_k, (hit for hits in shard_results for hit in hits), key=lambda hit: hit.score)
+    
+    async def _run_search_async(self, query: str, top_k: int, category: Optional[str],
+                                tier: Optional[SearchTier], latency_budget_ms: Optional[float],
+                                interviewee_ids: Optional[List[str]] = None):
+        if tier is None:
+            tier = self.select_tier(latency_budget_ms) if latency_budget_ms is not None else SearchTier.BALANCED
+        
+        start = time.perf_counter()
+        query_embedding = (await self._encode_async([query]))[0]
+        if interviewee_ids is not None and not interviewee_ids:
+            return [], query_embedding
+        search_results = await self._search_async(query_embedding, top_k, self.resolve_category(query, category),
+                                                  self.search_profiles[tier], self.interviewee_filter(interviewee_ids))
+        self.tier_latencies[tier].append((time.perf_counter() - start) * 1000)
+        
+        return search_results, query_embedding
+    
+    async def search_relevant_transcripts(self, query: str, top_k: int = 10,
+                                          category: Optional[str] = None,
+                                          tier: Optional[SearchTier] = None,
+                                          latency_budget_ms: Optional[float] = None) -> List[str]:
+        search_results, _ = await self._run_search_async(query, top_k, category, tier, latency_budget_ms)
+        
+        return self._interviewees_from_results(search_results)
+    
+    async def get_detailed_results(self, query: str, top_k: int = 10,
+                                   category: Optional[str] = None,
+                                   tier: Optional[SearchTier] = None,
+                                   latency_budget_ms: Optional[float] = None) -> List[Dict[str, Any]]:
+        search_results, _ = await self._run_search_async(query, top_k, category, tier, latency_budget_ms)
+        
+        return self._detailed_from_results(search_results)
+    
+    async def query_with_embedding(self, user_query: str, category: Optional[str] = None,
+                                   tier: Optional[SearchTier] = None,
+                                   latency_budget_ms: Optional[float] = None,
+                                   interviewee_ids: Optional[List[str]] = None
+                                   ) -> Tuple[List[str], List[Dict[str, Any]], np.ndarray]:
+        search_results, query_embedding = await self._run_search_async(
+            user_query, 10, category, tier, latency_budget_ms, interviewee_ids
+        )
+        
+        allowed_interviewees = set(interviewee_ids) if interviewee_ids is not None else None
+        return (self._interviewees_from_results(search_results, allowed_interviewees),
+                self._detailed_from_results(search_results), query_embedding)
+    
+    async def query(self, user_query: str, category: Optional[str] = None,
+                    tier: Optional[SearchTier] = None,
+                    latency_budget_ms: Optional[float] = None,
+                    interviewee_ids: Optional[List[str]] = None) -> Tuple[List[str], List[Dict[str, Any]]]:
+        relevant_interviewees, detailed_results, _ = await self.query_with_embedding(
+            user_query, category, tier, latency_budget_ms, interviewee_ids
+        )
+        
+        return relevant_interviewees, detailed_results
+    
+    async def close(self):
+        await self.async_client.close()
+        self.encode_executor.shutdown(wait=False)
 
 
 if __name__ == "__main__":
@@ -1,14 +1,26 @@
 import json
+import os
 import time
 import threading
 import queue
 import random
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field, replace
 from enum import Enum
 import uuid
-from rag import QdrantRAG
+from collections import deque
+from rag import QdrantRAG, SearchTier, ProductCategorizer
+from scheduler import TimerScheduler
+from interviewer_index import InterviewerIndex
+from waiting_room import WaitingRoom
+from query_scheduler import BlockingQueryScheduler
+from assignment_history import AssignmentHistory, AssignmentRecord
+from query_journal import QueryJournal, ASSIGNED
+from metrics import RouterMetrics, MetricsExporter
+from event_log import get_logger
+from admission import AdmissionController, AdmissionDecision, AdmissionResult
+from demographic_index import DemographicIndex
 
 class InterviewerStatus(Enum):
     AVAILABLE = "available"
@@ -22,6 +34,43 @@ class QueryPriority(Enum):
     HIGH = 3
     URGENT = 4
 
+PRIORITY_SEARCH_TIERS = {
+    QueryPriority.LOW: SearchTier.HIGH_RECALL,
+    QueryPriority.NORMAL: SearchTier.BALANCED,
+    QueryPriority.HIGH: SearchTier.BALANCED,
+    QueryPriority.URGENT: SearchTier.FAST,
+}
+
+PRIORITY_WAIT_BUDGETS = {
+    QueryPriority.LOW: 600,
+    QueryPriority.NORMAL: 120,
+    QueryPriority.HIGH: 30,
+    QueryPriority.URGENT: 5,
+}
+
+def wait_budgets_by_level() -> Dict[int, float]:
+    return {priority.value: seconds for priority, seconds in PRIORITY_WAIT_BUDGETS.items()}
+
+PRIORITY_QUEUE_SHARES = {
+    QueryPriority.LOW: 0.5,
+    QueryPriority.NORMAL: 0.75,
+    QueryPriority.HIGH: 0.9,
+    QueryPriority.URGENT: 1.0,
+}
+
+PRIORITY_ADMISSION_WAIT = {
+    QueryPriority.LOW: 300,
+    QueryPriority.NORMAL: 60,
+}
+
+def default_admission_controller(max_queue: int = 10000, **kwargs) -> AdmissionController:
+    return AdmissionController(
+        max_queue=max_queue,
+        priority_shares={priority.value: share for priority, share in PRIORITY_QUEUE_SHARES.items()},
+        max_wait_s={priority.value: seconds for priority, seconds in PRIORITY_ADMISSION_WAIT.items()},
+        **kwargs
+    )
+
 @dataclass
 class CustomerQuery:
     query_id: str
@@ -32,6 +81,7 @@ class CustomerQuery:
     expected_duration: int
     category: str
     metadata: Dict[str, Any]
+    interviewee_ids: Optional[List[str]] = None
 
 @dataclass
 class Interviewer:
@@ -56,27 +106,42 @@ class InterviewAssignment:
     estimated_completion_time: datetime
     status: str
     priority_score: float
+    assigned_at: float = field(default_factory=time.monotonic)
 
-class InterviewRoutingSystem:
-    def __init__(self, rag_system: QdrantRAG):
+class RoutingCore:
+    def __init__(self, rag_system, history_dir: Optional[str] = "assignment_history",
+                 metrics_port: Optional[int] = None, clock=time.monotonic, metrics_host: str = "127.0.0.1"):
         self.rag_system = rag_system
+        self.clock = clock
+        self.verbose = True
+        self.log = get_logger()
+        self.interview_duration = lambda assignment: random.randint(30, 90)
+        self.mean_interview_s = 60.0
         self.interviewers = {}
-        self.query_queue = queue.PriorityQueue()
+        self.query_queue = None
         self.active_assignments = {}
-        self.completed_assignments = {}
+        self.assignment_history = AssignmentHistory(history_dir)
+        self.journal = None
+        self.admission = None
+        self.demographic_index = None
+        self.completion_timers = {}
+        self.state_lock = threading.RLock()
+        self.interviewer_index = InterviewerIndex(InterviewerStatus.AVAILABLE,
+                                                  encoder=getattr(rag_system, "model", None))
+        self.waiting_room = WaitingRoom()
+        self.metrics = RouterMetrics(clock)
+        self.metrics_exporter = None
+        if metrics_port is not None:
+            self.metrics_exporter = MetricsExporter(self.metrics, metrics_port, metrics_host)
+            self.metrics_exporter.start()
         
         self.total_queries_processed = 0
         self.average_wait_time = 0
         self.system_efficiency = 0
         
         self._initialize_interviewers()
-        
-        self.running = True
-        self.processor_thread = threading.Thread(target=self._process_queue, daemon=True)
-        self.processor_thread.start()
-        
-        self.monitor_thread = threading.Thread(target=self._monitor_system, daemon=True)
-        self.monitor_thread.start()
+        if self.interviewer_index.encoder is not None:
+            self.calibrate_specialty_threshold()
     
     def _initialize_interviewers(self):
         interviewer_data = [
@@ -125,6 +190,9 @@ class InterviewRoutingSystem:
         ]
         
         for data in interviewer_data:
+            if not self._owns_interviewer(data):
+                continue
+            
             interviewer = Interviewer(
                 interviewer_id=data["interviewer_id"],
                 name=data["name"],
@@ -147,43 +215,110 @@ class InterviewRoutingSystem:
                     "customer_satisfaction": random.uniform(4.0, 4.9),
                     "completion_rate": random.uniform(0.95, 0.99)
                 },
-                last_activity=datetime.now()
+                last_activity=self._now()
             )
             self.interviewers[data["interviewer_id"]] = interviewer
+            self.interviewer_index.add(interviewer)
+            self.metrics.add_capacity(interviewer.max_capacity)
     
-    def submit_query(self, customer_id: str, query_text: str, 
-                    priority: QueryPriority = QueryPriority.NORMAL,
-                    expected_duration: int = 60,
-                    category: str = "general") -> str:
+    def calibrate_specialty_threshold(self, products_path: str = "products.txt") -> Optional[float]:
+        if not os.path.exists(products_path):
+            return None
+        with open(products_path, 'r', encoding='utf-8') as f:
+            products = json.load(f)["products"]
+        
+        pairs = []
+        for product in products:
+            category = ProductCategorizer.categorize(product["product_name"]) or ProductCategorizer.DEFAULT_CATEGORY
+            for interviewer in self.interviewers.values():
+                relevant = category in interviewer.specialties
+                pairs.extend((product["product_name"], specialty, relevant) for specialty in interviewer.specialties)
+        
+        threshold = self.interviewer_index.calibrate_threshold(pairs)
+        self.log.info("specialty_threshold_calibrated",
+                      f"Calibrated specialty similarity threshold to {threshold:.3f} on {len(pairs)} pairs",
+                      threshold=round(threshold, 4), pairs=len(pairs))
+        return threshold
+    
+    def _owns_interviewer(self, data: Dict[str, Any]) -> bool:
+        return True
+    
+    def scale_fleet(self, copies: int = 1, max_capacity: Optional[int] = None):
+        with self.state_lock:
+            base_interviewers = list(self.interviewers.values())
+            for copy in range(1, copies):
+                for interviewer in base_interviewers:
+                    clone = replace(
+                        interviewer,
+                        interviewer_id=f"{interviewer.interviewer_id}_{copy:03d}",
+                        performance_metrics=dict(interviewer.performance_metrics)
+                    )
+                    self.interviewers[clone.interviewer_id] = clone
+                    self.interviewer_index.add(clone)
+                    self.metrics.add_capacity(clone.max_capacity)
+            
+            if max_capacity is not None:
+                for interviewer in self.interviewers.values():
+                    self.metrics.add_capacity(max_capacity - interviewer.max_capacity)
+                    interviewer.max_capacity = max_capacity
+                    self.interviewer_index.update(interviewer)
         
-        query = CustomerQuery(
+        self._seed_admission_rate()
+    
+    def _seed_admission_rate(self):
+        if self.admission:
+            self.admission.set_baseline_rate(self.metrics.total_capacity / max(self.mean_interview_s, 1e-9))
+    
+    def _create_query(self, customer_id: str, query_text: str, priority: QueryPriority,
+                      expected_duration: int, category: str) -> CustomerQuery:
+        return CustomerQuery(
             query_id=f"Q_{uuid.uuid4().hex[:8]}",
             customer_id=customer_id,
             query_text=query_text,
             priority=priority,
-            timestamp=datetime.now(),
+            timestamp=self._now(),
             expected_duration=expected_duration,
             category=category,
             metadata={}
         )
-        
-        self.query_queue.put((priority.value, query.timestamp, query))
-        
-        print(f"Query submitted: {query.query_id} - '{query_text[:50]}...'")
-        return query.query_id
     
-    def _process_query(self, query: CustomerQuery) -> InterviewAssignment:
-        target_interviewees, detailed_results = self.rag_system.query(query.query_text)
-        
-        best_interviewer = self._find_best_interviewer(query, target_interviewees)
-        
-        if not best_interviewer:
-            query.priority = QueryPriority.HIGH
-            self.query_queue.put((query.priority.value, query.timestamp, query))
-            return None
+    def _attach_demographics(self, query: CustomerQuery, demographics: Optional[Dict[str, Any]]):
+        if not demographics:
+            return
+        if self.demographic_index is None:
+            raise ValueError("Demographic filters require a demographic index")
         
+        query.interviewee_ids = self.demographic_index.select(demographics)
+        query.metadata["demographics"] = demographics
+    
+    def _query_record(self, query: CustomerQuery) -> Dict[str, Any]:
+        return {
+            "query_id": query.query_id,
+            "customer_id": query.customer_id,
+            "query_text": query.query_text,
+            "priority": query.priority.name,
+            "submitted_at": query.timestamp.timestamp(),
+            "expected_duration": query.expected_duration,
+            "category": query.category,
+            "metadata": query.metadata
+        }
+    
+    def _query_from_record(self, record: Dict[str, Any]) -> CustomerQuery:
+        return CustomerQuery(
+            query_id=record["query_id"],
+            customer_id=record["customer_id"],
+            query_text=record["query_text"],
+            priority=QueryPriority[record["priority"]],
+            timestamp=datetime.fromtimestamp(record["submitted_at"]),
+            expected_duration=record["expected_duration"],
+            category=record["category"],
+            metadata=record["metadata"]
+        )
+    
+    def _create_assignment(self, query: CustomerQuery, best_interviewer: Interviewer,
+                           target_interviewees: List[str]) -> InterviewAssignment:
         priority_score = self._calculate_priority_score(query, best_interviewer)
-        estimated_start = datetime.now() + timedelta(minutes=random.randint(5, 30))
+        estimated_start = self._now() + timedelta(minutes=random.randint(5, 30))
         estimated_completion = estimated_start + timedelta(minutes=query.expected_duration)
         
         assignment = InterviewAssignment(
@@ -197,155 +332,182 @@ class InterviewRoutingSystem:
             priority_score=priority_score
         )
         
-        best_interviewer.current_load += 1
-        if best_interviewer.current_load >= best_interviewer.max_capacity:
-            best_interviewer.status = InterviewerStatus.BUSY
-        
         return assignment
     
-    def _find_best_interviewer(self, query: CustomerQuery, target_interviewees: List[str]) -> Optional[Interviewer]:
-        available_interviewers = [
-            interviewer for interviewer in self.interviewers.values()
-            if interviewer.status == InterviewerStatus.AVAILABLE and 
-               interviewer.current_load < interviewer.max_capacity
-        ]
-        
-        if not available_interviewers:
-            return None
-        
-        scored_interviewers = []
-        
-        for interviewer in available_interviewers:
-            score = 0
-            
-            query_words = query.query_text.lower().split()
-            for specialty in interviewer.specialties:
-                if any(specialty_word in query.query_text.lower() 
-                      for specialty_word in specialty.split()):
-                    score += 10
+    def _reserve_best_interviewer(self, query: CustomerQuery, target_interviewees: List[str],
+                                  query_embedding=None) -> Optional[Interviewer]:
+        with self.state_lock:
+            best_interviewer = self._find_best_interviewer(query, target_interviewees, query_embedding)
+            if not best_interviewer:
+                return None
             
-            load_factor = (interviewer.max_capacity - interviewer.current_load) / interviewer.max_capacity
-            score += load_factor * 5
-            
-            score += interviewer.performance_metrics["customer_satisfaction"]
-            score += interviewer.performance_metrics["completion_rate"] * 3
-            
-            if query.priority in [QueryPriority.HIGH, QueryPriority.URGENT]:
-                if interviewer.performance_metrics["customer_satisfaction"] > 4.5:
-                    score += 5
+            best_interviewer.current_load += 1
+            if best_interviewer.current_load >= best_interviewer.max_capacity:
+                best_interviewer.status = InterviewerStatus.BUSY
+            self.interviewer_index.update(best_interviewer)
+            self.metrics.load_changed(1)
+            return best_interviewer
+    
+    def _reserve_or_park(self, query: CustomerQuery, rag_result: Tuple[List[str], List[Dict[str, Any]], Any]
+                         ) -> Optional[Interviewer]:
+        target_interviewees, _, query_embedding = rag_result
+        
+        with self.state_lock:
+            best_interviewer = self._reserve_best_interviewer(query, target_interviewees, query_embedding)
+            if best_interviewer:
+                return best_interviewer
             
-            cost_factor = (100 - interviewer.hourly_rate) / 100 * 2
-            score += cost_factor
+            specialties = self.interviewer_index.matching_specialties(query.query_text, query_embedding)
+            self.waiting_room.park(query, rag_result, specialties)
+            self.metrics.count("parked", query.priority.name)
+        
+        if self.verbose:
+            self.log.info("query_parked", f"No capacity, query parked in waiting room: {query.query_id}",
+                          sampled=True, query_id=query.query_id, priority=query.priority.name)
+        return None
+    
+    def _admit_waiting(self, interviewer: Optional[Interviewer] = None) -> List[InterviewAssignment]:
+        admitted = []
+        with self.state_lock:
+            specialties = interviewer.specialties if interviewer else ()
+            while self.waiting_room:
+                entry = self.waiting_room.peek(specialties)
+                target_interviewees, _, query_embedding = entry.rag_result
+                best_interviewer = self._reserve_best_interviewer(entry.query, target_interviewees, query_embedding)
+                if not best_interviewer:
+                    break
+                
+                self.waiting_room.pop(entry.query.query_id)
+                assignment = self._create_assignment(entry.query, best_interviewer, target_interviewees)
+                self._register_assignment(assignment)
+                admitted.append(assignment)
             
-            scored_interviewers.append((score, interviewer))
+            for assignment in admitted:
+                self._simulate_interview_progress(assignment)
+        
+        for assignment in admitted:
+            self._log_assignment(assignment)
         
-        scored_interviewers.sort(reverse=True)
-        return scored_interviewers[0][1]
+        return admitted
+    
+    def _register_assignment(self, assignment: InterviewAssignment):
+        with self.state_lock:
+            assignment.assigned_at = self.clock()
+            self.active_assignments[assignment.assignment_id] = assignment
+            self.total_queries_processed += 1
+        
+        if self.admission:
+            self.admission.record_dispatch()
+        if self.journal:
+            self.journal.record_assigned(assignment.query.query_id, assignment.interviewer.interviewer_id)
+        self.metrics.observe("assignment_latency_ms", self._query_age_ms(assignment.query))
+        self.metrics.count("assigned", assignment.query.priority.name)
+    
+    def _now(self) -> datetime:
+        return datetime.now()
+    
+    def _query_age_ms(self, query: CustomerQuery) -> float:
+        return (self._now() - query.timestamp).total_seconds() * 1000
+    
+    def _find_best_interviewer(self, query: CustomerQuery, target_interviewees: List[str],
+                               query_embedding=None) -> Optional[Interviewer]:
+        return self.interviewer_index.best(
+            query.query_text, query.priority in [QueryPriority.HIGH, QueryPriority.URGENT], query_embedding
+        )
     
     def _calculate_priority_score(self, query: CustomerQuery, interviewer: Interviewer) -> float:
         base_score = query.priority.value * 10
         
-        wait_time = (datetime.now() - query.timestamp).total_seconds() / 60
+        wait_time = (self._now() - query.timestamp).total_seconds() / 60
         urgency_bonus = min(wait_time * 0.1, 5)
         
         quality_score = interviewer.performance_metrics["customer_satisfaction"] * 2
         
         return base_score + urgency_bonus + quality_score
     
-    def _process_queue(self):
-        while self.running:
-            try:
-                priority, timestamp, query = self.query_queue.get(timeout=1)
-                
-                print(f"Processing query: {query.query_id}")
-                
-                assignment = self._process_query(query)
-                
-                if assignment:
-                    self.active_assignments[assignment.assignment_id] = assignment
-                    self.total_queries_processed += 1
-                    
-                    print(f"Assignment created: {assignment.assignment_id}")
-                    print(f"  Interviewer: {assignment.interviewer.name}")
-                    print(f"  Target Interviewees: {', '.join(assignment.target_interviewees)}")
-                    print(f"  Estimated Start: {assignment.estimated_start_time.strftime('%H:%M')}")
-                    print()
-                    
-                    self._simulate_interview_progress(assignment)
-                
-            except queue.Empty:
-                continue
-            except Exception as e:
-                print(f"Error processing query: {e}")
-    
-    def _simulate_interview_progress(self, assignment: InterviewAssignment):
-        def complete_interview():
-            delay = random.randint(30, 90)
-            time.sleep(delay)
+    def _release_assignment(self, assignment: InterviewAssignment, status: str) -> bool:
+        with self.state_lock:
+            self.completion_timers.pop(assignment.assignment_id, None)
+            if assignment.assignment_id not in self.active_assignments:
+                return False
             
-            if assignment.assignment_id in self.active_assignments:
-                del self.active_assignments[assignment.assignment_id]
-                assignment.status = "completed"
-                self.completed_assignments[assignment.assignment_id] = assignment
-                
-                assignment.interviewer.current_load -= 1
-                if assignment.interviewer.current_load < assignment.interviewer.max_capacity:
-                    assignment.interviewer.status = InterviewerStatus.AVAILABLE
-                
-                print(f"Interview completed: {assignment.assignment_id}")
-        
-        threading.Thread(target=complete_interview, daemon=True).start()
-    
-    def _monitor_system(self):
-        while self.running:
-            time.sleep(30)
+            del self.active_assignments[assignment.assignment_id]
+            assignment.status = status
+            self.assignment_history.add(assignment)
+            if self.journal:
+                self.journal.record_finished(assignment.query.query_id)
             
-            self._update_metrics()
-            self._simulate_status_changes()
+            assignment.interviewer.current_load -= 1
+            if assignment.interviewer.current_load < assignment.interviewer.max_capacity:
+                assignment.interviewer.status = InterviewerStatus.AVAILABLE
+            self.interviewer_index.update(assignment.interviewer)
+            self.metrics.load_changed(-1)
+            self.metrics.interview_finished(
+                assignment.interviewer.interviewer_id, assignment.query.priority.name,
+                (self.clock() - assignment.assigned_at) * 1000, status
+            )
+            
+            self._admit_waiting(assignment.interviewer)
+            return True
     
     def _update_metrics(self):
-        total_capacity = sum(i.max_capacity for i in self.interviewers.values())
-        current_load = sum(i.current_load for i in self.interviewers.values())
-        
-        self.system_efficiency = (current_load / total_capacity) * 100 if total_capacity > 0 else 0
-        
-        if self.active_assignments:
-            wait_times = [
-                (datetime.now() - assignment.query.timestamp).total_seconds() / 60
-                for assignment in self.active_assignments.values()
-            ]
-            self.average_wait_time = sum(wait_times) / len(wait_times)
+        self.system_efficiency = self.metrics.utilization()
+        self.average_wait_time = self.metrics.histograms["assignment_latency_ms"].mean() / 60000
     
     def _simulate_status_changes(self):
-        for interviewer in self.interviewers.values():
-            if random.random() < 0.1:
-                if interviewer.status == InterviewerStatus.AVAILABLE:
-                    if random.random() < 0.3:
-                        interviewer.status = InterviewerStatus.BREAK
-                elif interviewer.status == InterviewerStatus.BREAK:
-                    if random.random() < 0.7:
-                        interviewer.status = InterviewerStatus.AVAILABLE
-                elif interviewer.status == InterviewerStatus.BUSY:
-                    if random.random() < 0.2 and interviewer.current_load > 0:
-                        interviewer.current_load -= 1
-                        if interviewer.current_load < interviewer.max_capacity:
-                            interviewer.status = InterviewerStatus.AVAILABLE
-    
-    def get_system_status(self) -> Dict[str, Any]:
-        available_interviewers = sum(1 for i in self.interviewers.values() 
-                                   if i.status == InterviewerStatus.AVAILABLE)
-        
-        return {
-            "timestamp": datetime.now().isoformat(),
+        with self.state_lock:
+            for interviewer in self.interviewers.values():
+                if random.random() < 0.1:
+                    self._simulate_status_change(interviewer)
+                    self.interviewer_index.update(interviewer)
+            
+            self._admit_waiting()
+    
+    def _simulate_status_change(self, interviewer: Interviewer):
+        if interviewer.status == InterviewerStatus.AVAILABLE:
+            if random.random() < 0.3:
+                interviewer.status = InterviewerStatus.BREAK
+        elif interviewer.status == InterviewerStatus.BREAK:
+            if random.random() < 0.7:
+                interviewer.status = InterviewerStatus.AVAILABLE
+        elif interviewer.status == InterviewerStatus.BUSY:
+            if random.random() < 0.2 and interviewer.current_load > 0:
+                interviewer.current_load -= 1
+                self.metrics.load_changed(-1)
+                if interviewer.current_load < interviewer.max_capacity:
+                    interviewer.status = InterviewerStatus.AVAILABLE
+    
+    def get_system_status(self, include_interviewers: bool = False) -> Dict[str, Any]:
+        with self.state_lock:
+            return self._build_system_status(include_interviewers)
+    
+    def _build_system_status(self, include_interviewers: bool = False) -> Dict[str, Any]:
+        self._update_metrics()
+        status = {
+            "timestamp": self._now().isoformat(),
             "total_interviewers": len(self.interviewers),
-            "available_interviewers": available_interviewers,
+            "available_interviewers": self.interviewer_index.available_count,
             "active_assignments": len(self.active_assignments),
-            "completed_assignments": len(self.completed_assignments),
+            "completed_assignments": len(self.assignment_history),
             "total_queries_processed": self.total_queries_processed,
             "queue_size": self.query_queue.qsize(),
+            "queue_stats": {
+                QueryPriority(level).name: stats for level, stats in self.query_queue.snapshot().items()
+            },
+            "queue_promotions": self.query_queue.promotions,
+            "queue_deadline_misses": self.query_queue.deadline_misses,
+            "waiting_room_size": len(self.waiting_room),
+            "journal": self.journal.get_stats() if self.journal else None,
+            "event_log": self.log.get_stats(),
+            "admission": self._admission_status(),
             "system_efficiency": round(self.system_efficiency, 2),
             "average_wait_time": round(self.average_wait_time, 2),
-            "interviewer_details": {
+            "search_latency": self.rag_system.get_latency_stats(),
+            "metrics": self.metrics.snapshot()
+        }
+        
+        if include_interviewers:
+            status["interviewer_details"] = {
                 interviewer_id: {
                     "name": interviewer.name,
                     "status": interviewer.status.value,
@@ -355,44 +517,340 @@ class InterviewRoutingSystem:
                 }
                 for interviewer_id, interviewer in self.interviewers.items()
             }
-        }
+        return status
+    
+    def _admission_status(self) -> Optional[Dict[str, Any]]:
+        return self.admission.get_stats() if self.admission else None
     
     def get_assignment_details(self, assignment_id: str) -> Optional[Dict[str, Any]]:
-        assignment = (self.active_assignments.get(assignment_id) or 
-                     self.completed_assignments.get(assignment_id))
+        assignment = self.active_assignments.get(assignment_id)
+        if assignment:
+            record = AssignmentRecord.from_assignment(assignment)
+        else:
+            record = self.assignment_history.get(assignment_id)
         
-        if not assignment:
+        if not record:
             return None
         
+        interviewer = self.interviewers.get(record.interviewer_id)
+        
         return {
-            "assignment_id": assignment.assignment_id,
+            "assignment_id": record.assignment_id,
             "query": {
-                "query_id": assignment.query.query_id,
-                "customer_id": assignment.query.customer_id,
-                "query_text": assignment.query.query_text,
-                "priority": assignment.query.priority.name,
-                "timestamp": assignment.query.timestamp.isoformat()
+                "query_id": record.query_id,
+                "customer_id": record.customer_id,
+                "query_text": record.query_text,
+                "priority": record.priority,
+                "timestamp": datetime.fromtimestamp(record.submitted_at).isoformat()
             },
             "interviewer": {
-                "interviewer_id": assignment.interviewer.interviewer_id,
-                "name": assignment.interviewer.name,
-                "specialties": assignment.interviewer.specialties
+                "interviewer_id": record.interviewer_id,
+                "name": record.interviewer_name,
+                "specialties": interviewer.specialties if interviewer else []
             },
-            "target_interviewees": assignment.target_interviewees,
-            "estimated_start_time": assignment.estimated_start_time.isoformat(),
-            "estimated_completion_time": assignment.estimated_completion_time.isoformat(),
-            "status": assignment.status,
-            "priority_score": round(assignment.priority_score, 2)
+            "target_interviewees": list(record.target_interviewees),
+            "estimated_start_time": datetime.fromtimestamp(record.estimated_start_time).isoformat(),
+            "estimated_completion_time": datetime.fromtimestamp(record.estimated_completion_time).isoformat(),
+            "status": record.status,
+            "priority_score": round(record.priority_score, 2)
         }
     
+    def _log_assignment(self, assignment: InterviewAssignment):
+        if not self.verbose:
+            return
+        
+        self.log.info(
+            "assignment_created",
+            f"Assignment created: {assignment.assignment_id}\n"
+            f"  Interviewer: {assignment.interviewer.name}\n"
+            f"  Target Interviewees: {', '.join(assignment.target_interviewees)}\n"
+            f"  Estimated Start: {assignment.estimated_start_time.strftime('%H:%M')}\n",
+            sampled=True,
+            assignment_id=assignment.assignment_id,
+            query_id=assignment.query.query_id,
+            interviewer_id=assignment.interviewer.interviewer_id
+        )
+
+
+class InterviewRoutingSystem(RoutingCore):
+    def __init__(self, rag_system: QdrantRAG, num_workers: int = 4,
+                 batch_size: int = 16, batch_wait_ms: float = 10.0, aging_seconds: float = 30.0,
+                 history_dir: Optional[str] = "assignment_history", metrics_port: Optional[int] = None,
+                 journal_path: Optional[str] = None, journal_sync: bool = True,
+                 admission: Optional[AdmissionController] = None, admission_control: bool = True,
+                 demographic_index: Optional[DemographicIndex] = None, metrics_host: str = "127.0.0.1"):
+        super().__init__(rag_system, history_dir, metrics_port, metrics_host=metrics_host)
+        if admission is None and admission_control:
+            admission = default_admission_controller()
+        self.admission = admission
+        self._seed_admission_rate()
+        self.demographic_index = demographic_index
+        self.deferred: Dict[int, deque] = {}
+        self.deferred_count = 0
+        self.deferred_lock = threading.Lock()
+        self.query_queue = BlockingQueryScheduler(wait_budgets_by_level(), aging_seconds=aging_seconds)
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait_ms / 1000
+        self.journal_sync = journal_sync
+        self.replayed_queries = 0
+        if journal_path is not None:
+            self.journal = QueryJournal(journal_path)
+            self._replay_journal()
+        
+        self.running = True
+        self.scheduler = TimerScheduler()
+        self.processor_threads = [
+            threading.Thread(target=self._process_queue, name=f"router-worker-{i}", daemon=True)
+            for i in range(num_workers)
+        ]
+        for thread in self.processor_threads:
+            thread.start()
+        
+        self.monitor_thread = threading.Thread(target=self._monitor_system, daemon=True)
+        self.monitor_thread.start()
+    
+    def submit_query(self, customer_id: str, query_text: str, 
+                    priority: QueryPriority = QueryPriority.NORMAL,
+                    expected_duration: int = 60,
+                    category: str = "general",
+                    demographics: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        
+        return self.try_submit_query(customer_id, query_text, priority, expected_duration, category,
+                                     demographics).query_id
+    
+    def try_submit_query(self, customer_id: str, query_text: str,
+                         priority: QueryPriority = QueryPriority.NORMAL,
+                         expected_duration: int = 60,
+                         category: str = "general",
+                         demographics: Optional[Dict[str, Any]] = None) -> AdmissionResult:
+        
+        query = self._create_query(customer_id, query_text, priority, expected_duration, category)
+        self._attach_demographics(query, demographics)
+        
+        decision, reason, estimated_wait, retry_after = AdmissionDecision.ACCEPTED, "", 0.0, None
+        if self.admission:
+            with self.deferred_lock:
+                decision, reason, estimated_wait, retry_after = self.admission.admit(
+                    customer_id, priority.value, self._queued_depth(), self.deferred_count
+                )
+                if decision == AdmissionDecision.DEFERRED:
+                    self.deferred_count += 1
+            
+            if decision == AdmissionDecision.REJECTED:
+                self.metrics.count("rejected", priority.name)
+                if self.verbose:
+                    self.log.info("query_rejected", f"Query rejected ({reason}): '{query_text[:50]}...'",
+                                  sampled=True, customer_id=customer_id, priority=priority.name, reason=reason)
+                return AdmissionResult(decision, None, reason, estimated_wait, retry_after)
+        
+        self.metrics.count("submitted", priority.name)
+        if self.journal:
+            self.journal.record_submitted(query.query_id, self._query_record(query), wait=self.journal_sync)
+        
+        if decision == AdmissionDecision.DEFERRED:
+            with self.deferred_lock:
+                self.deferred.setdefault(priority.value, deque()).append(query)
+            self.metrics.count("deferred", priority.name)
+        else:
+            self.query_queue.put(query)
+        
+        if self.verbose:
+            action = "deferred" if decision == AdmissionDecision.DEFERRED else "submitted"
+            self.log.info("query_submitted", f"Query {action}: {query.query_id} - '{query_text[:50]}...'",
+                          sampled=True, query_id=query.query_id, priority=priority.name, decision=decision.value)
+        return AdmissionResult(decision, query.query_id, reason, estimated_wait, retry_after)
+    
+    def _queued_depth(self) -> Dict[int, int]:
+        depth = self.query_queue.depth_by_priority()
+        with self.state_lock:
+            for level, count in self.waiting_room.depth_by_priority().items():
+                depth[level] = depth.get(level, 0) + count
+        return depth
+    
+    def _resume_deferred(self):
+        if not self.deferred_count:
+            return
+        
+        with self.deferred_lock:
+            depth = self._queued_depth()
+            for level in sorted(self.deferred, reverse=True):
+                pending = self.deferred[level]
+                while pending and self.admission.can_resume(level, depth):
+                    query = pending.popleft()
+                    self.deferred_count -= 1
+                    self.query_queue.put(query)
+                    depth[level] = depth.get(level, 0) + 1
+                    self.metrics.count("resumed", query.priority.name)
+    
+    def _admission_status(self) -> Optional[Dict[str, Any]]:
+        if not self.admission:
+            return None
+        
+        status = self.admission.get_stats()
+        status["deferred"] = {QueryPriority(level).name: len(pending) for level, pending in self.deferred.items()}
+        return status
+    
+    def _replay_journal(self):
+        in_flight = 0
+        for state, record in self.journal.replay():
+            query = self._query_from_record(record)
+            self._attach_demographics(query, query.metadata.get("demographics"))
+            self.query_queue.put(query)
+            self.replayed_queries += 1
+            if state == ASSIGNED:
+                in_flight += 1
+        
+        if self.replayed_queries:
+            self.log.info("journal_replayed",
+                          f"Replayed {self.replayed_queries} queries from journal ({in_flight} were in flight)",
+                          replayed=self.replayed_queries, in_flight=in_flight)
+    
+    def _process_query(self, query: CustomerQuery,
+                       rag_result: Optional[Tuple[List[str], List[Dict[str, Any]], Any]] = None) -> InterviewAssignment:
+        if rag_result is None:
+            start = time.perf_counter()
+            rag_result = self.rag_system.query_with_embedding(
+                query.query_text, query.category, tier=PRIORITY_SEARCH_TIERS[query.priority],
+                interviewee_ids=query.interviewee_ids
+            )
+            self.metrics.observe("rag_latency_ms", (time.perf_counter() - start) * 1000)
+        
+        best_interviewer = self._reserve_or_park(query, rag_result)
+        
+        if not best_interviewer:
+            return None
+        
+        return self._create_assignment(query, best_interviewer, rag_result[0])
+    
+    def _collect_batch(self) -> List[CustomerQuery]:
+        batch = [self.query_queue.get(timeout=1)]
+        deadline = time.monotonic() + self.batch_wait
+        
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    query = self.query_queue.get(timeout=remaining)
+                else:
+                    query = self.query_queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(query)
+        
+        return batch
+    
+    def _batch_rag_results(self, queries: List[CustomerQuery]) -> List[Optional[Tuple[List[str], List[Dict[str, Any]], Any]]]:
+        if len(queries) == 1:
+            return [None]
+        
+        try:
+            start = time.perf_counter()
+            rag_results = self.rag_system.query_batch_with_embeddings(
+                [query.query_text for query in queries],
+                [query.category for query in queries],
+                [PRIORITY_SEARCH_TIERS[query.priority] for query in queries],
+                [query.interviewee_ids for query in queries]
+            )
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            for _ in queries:
+                self.metrics.observe("rag_latency_ms", elapsed_ms)
+            return rag_results
+        except Exception as e:
+            self.log.error("batch_failed", f"Error processing query batch, falling back to single queries: {e}",
+                           batch_size=len(queries))
+            return [None] * len(queries)
+    
+    def _process_queue(self):
+        while self.running:
+            self._resume_deferred()
+            try:
+                queries = self._collect_batch()
+            except queue.Empty:
+                continue
+            
+            for query in queries:
+                self.metrics.observe("queue_wait_ms", self._query_age_ms(query))
+            
+            rag_results = self._batch_rag_results(queries)
+            
+            for query, rag_result in zip(queries, rag_results):
+                try:
+                    if self.verbose:
+                        self.log.info("query_processing", f"Processing query: {query.query_id}",
+                                      sampled=True, query_id=query.query_id)
+                    
+                    assignment = self._process_query(query, rag_result)
+                    
+                    if assignment:
+                        self._register_assignment(assignment)
+                        
+                        self._log_assignment(assignment)
+                        
+                        self._simulate_interview_progress(assignment)
+                
+                except Exception as e:
+                    self.log.error("query_failed", f"Error processing query: {e}", query_id=query.query_id)
+    
+    def _simulate_interview_progress(self, assignment: InterviewAssignment):
+        delay = self.interview_duration(assignment)
+        with self.state_lock:
+            if assignment.assignment_id in self.active_assignments:
+                self.completion_timers[assignment.assignment_id] = self.scheduler.schedule(
+                    delay, self._complete_interview, assignment
+                )
+    
+    def _complete_interview(self, assignment: InterviewAssignment):
+        if self._release_assignment(assignment, "completed") and self.verbose:
+            self.log.info("interview_completed", f"Interview completed: {assignment.assignment_id}",
+                          sampled=True, assignment_id=assignment.assignment_id)
+    
+    def extend_assignment(self, assignment_id: str, extra_seconds: float) -> bool:
+        with self.state_lock:
+            timer_id = self.completion_timers.get(assignment_id)
+        if timer_id is None:
+            return False
+        
+        remaining = self.scheduler.time_remaining(timer_id)
+        if remaining is None:
+            return False
+        return self.scheduler.reschedule(timer_id, remaining + extra_seconds)
+    
+    def cancel_assignment(self, assignment_id: str) -> bool:
+        with self.state_lock:
+            timer_id = self.completion_timers.get(assignment_id)
+            if timer_id is not None:
+                self.scheduler.cancel(timer_id)
+            
+            assignment = self.active_assignments.get(assignment_id)
+            if not assignment or not self._release_assignment(assignment, "cancelled"):
+                return False
+        
+        self.log.info("assignment_cancelled", f"Assignment cancelled: {assignment_id}", assignment_id=assignment_id)
+        return True
+    
+    def _monitor_system(self):
+        while self.running:
+            time.sleep(30)
+            
+            self._update_metrics()
+            self._simulate_status_changes()
+    
     def shutdown(self):
-        print("Shutting down routing system...")
+        self.log.info("router_shutdown", "Shutting down routing system...")
         self.running = False
-        if self.processor_thread.is_alive():
-            self.processor_thread.join(timeout=2)
+        for thread in self.processor_threads:
+            if thread.is_alive():
+                thread.join(timeout=2)
         if self.monitor_thread.is_alive():
             self.monitor_thread.join(timeout=2)
-        print("Routing system shutdown complete.")
+        self.scheduler.shutdown()
+        self.assignment_history.close()
+        if self.journal:
+            self.journal.close()
+        if self.metrics_exporter:
+            self.metrics_exporter.shutdown()
+        self.log.info("router_stopped", "Routing system shutdown complete.")
+        self.log.flush()
 
 
 def run_demo():
@@ -439,11 +897,11 @@ def run_demo():
         print(f"  Average Wait Time: {status['average_wait_time']} min")
     
     print("\nFinal System Report:")
-    final_status = routing_system.get_system_status()
+    final_status = routing_system.get_system_status(include_interviewers=True)
     print(json.dumps(final_status, indent=2))
     
     print("\nAssignment Details:")
-    for assignment_id in list(routing_system.completed_assignments.keys())[:3]:
+    for assignment_id in routing_system.assignment_history.recent_ids(3):
         details = routing_system.get_assignment_details(assignment_id)
         if details:
             print(f"\nAssignment {assignment_id}:")
@@ -0,0 +1,122 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, Optional
+from event_log import get_logger
+
+
+class TimerHandle:
+    __slots__ = ("timer_id", "deadline", "callback", "args", "cancelled")
+    
+    def __init__(self, timer_id: int, deadline: float, callback: Callable, args: tuple):
+        self.timer_id = timer_id
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+
+class TimerScheduler:
+    
+    def __init__(self, clock: Callable[[], float] = time.monotonic, name: str = "timer-scheduler"):
+        self.clock = clock
+        self._heap = []
+        self._timers: Dict[int, TimerHandle] = {}
+        self._ids = itertools.count(1)
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        
+        self.fired = 0
+        self.cancelled = 0
+        
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+    
+    def schedule(self, delay_seconds: float, callback: Callable, *args) -> int:
+        with self._condition:
+            timer_id = next(self._ids)
+            handle = TimerHandle(timer_id, self.clock() + delay_seconds, callback, args)
+            self._timers[timer_id] = handle
+            self._push(handle)
+            return timer_id
+    
+    def cancel(self, timer_id: int) -> bool:
+        with self._condition:
+            handle = self._timers.pop(timer_id, None)
+            if handle is None:
+                return False
+            
+            handle.cancelled = True
+            self.cancelled += 1
+            self._condition.notify()
+            return True
+    
+    def reschedule(self, timer_id: int, delay_seconds: float) -> bool:
+        with self._condition:
+            handle = self._timers.get(timer_id)
+            if handle is None:
+                return False
+            
+            handle.cancelled = True
+            replacement = TimerHandle(timer_id, self.clock() + delay_seconds, handle.callback, handle.args)
+            self._timers[timer_id] = replacement
+            self._push(replacement)
+            return True
+    
+    def time_remaining(self, timer_id: int) -> Optional[float]:
+        with self._condition:
+            handle = self._timers.get(timer_id)
+            return None if handle is None else max(handle.deadline - self.clock(), 0.0)
+    
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._timers)
+    
+    def _push(self, handle: TimerHandle):
+        heapq.heappush(self._heap, (handle.deadline, next(self._sequence), handle))
+        if self._heap[0][2] is handle:
+            self._condition.notify()
+    
+    def _next_due(self) -> Optional[TimerHandle]:
+        with self._condition:
+            while self.running:
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)
+                
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                
+                deadline, _, handle = self._heap[0]
+                remaining = deadline - self.clock()
+                if remaining > 0:
+                    self._condition.wait(timeout=remaining)
+                    continue
+                
+                heapq.heappop(self._heap)
+                self._timers.pop(handle.timer_id, None)
+                return handle
+            
+            return None
+    
+    def _run(self):
+        while self.running:
+            handle = self._next_due()
+            if handle is None:
+                break
+            
+            try:
+                handle.callback(*handle.args)
+            except Exception as e:
+                get_logger().error("timer_failed", f"Error in scheduled timer {handle.timer_id}: {e}",
+                                   timer_id=handle.timer_id)
+            self.fired += 1
+    
+    def shutdown(self, timeout: float = 2):
+        with self._condition:
+            self.running = False
+            self._condition.notify_all()
+        if self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout=timeout)
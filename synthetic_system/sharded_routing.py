@@ -0,0 +1,371 @@
+import argparse
+import functools
+import json
+import multiprocessing as mp
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from rag import ProductCategorizer, QdrantRAG
+from load_generator import LatencyStubRAG, QueryCatalog
+from routing import InterviewRoutingSystem, QueryPriority
+
+SHARD_COUNTERS = ("ready", "depth", "free_capacity", "submitted", "assigned", "waiting", "stolen", "stolen_from")
+
+
+def category_shards(num_shards: int) -> Dict[str, int]:
+    return {category: index % num_shards for index, category in enumerate(ProductCategorizer.all_categories())}
+
+
+def interviewer_category(specialties: List[str]) -> str:
+    return ProductCategorizer.categorize(" ".join(specialties)) or ProductCategorizer.DEFAULT_CATEGORY
+
+
+class FixedInterviewDuration:
+    
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+    
+    def __call__(self, assignment) -> float:
+        return self.seconds
+
+
+class LocalBroker:
+    
+    def __init__(self, num_shards: int, context=None):
+        context = context or mp.get_context()
+        self.num_shards = num_shards
+        self.queues = [context.Queue() for _ in range(num_shards)]
+        self.counters = context.Array('q', num_shards * len(SHARD_COUNTERS))
+    
+    def _slot(self, shard: int, name: str) -> int:
+        return shard * len(SHARD_COUNTERS) + SHARD_COUNTERS.index(name)
+    
+    def get(self, shard: int, name: str) -> int:
+        return self.counters[self._slot(shard, name)]
+    
+    def set(self, shard: int, name: str, value: int):
+        with self.counters.get_lock():
+            self.counters[self._slot(shard, name)] = value
+    
+    def add(self, shard: int, name: str, delta: int = 1):
+        with self.counters.get_lock():
+            self.counters[self._slot(shard, name)] += delta
+    
+    def publish(self, shard: int, message: Dict[str, Any]):
+        with self.counters.get_lock():
+            self.counters[self._slot(shard, "depth")] += 1
+            self.counters[self._slot(shard, "submitted")] += 1
+        self.queues[shard].put(message)
+    
+    def consume(self, shard: int, timeout: float = 0.01) -> Optional[Dict[str, Any]]:
+        try:
+            message = self.queues[shard].get(timeout=timeout)
+        except queue.Empty:
+            return None
+        self.add(shard, "depth", -1)
+        return message
+    
+    def steal(self, thief: int, min_depth: int = 1) -> Optional[Dict[str, Any]]:
+        victims = [shard for shard in range(self.num_shards) if shard != thief]
+        if not victims:
+            return None
+        
+        victim = max(victims, key=lambda shard: self.get(shard, "depth"))
+        if self.get(victim, "depth") < min_depth:
+            return None
+        
+        try:
+            message = self.queues[victim].get_nowait()
+        except queue.Empty:
+            return None
+        
+        with self.counters.get_lock():
+            self.counters[self._slot(victim, "depth")] -= 1
+            self.counters[self._slot(victim, "stolen_from")] += 1
+            self.counters[self._slot(thief, "stolen")] += 1
+        return message
+    
+    def snapshot(self) -> List[Dict[str, int]]:
+        with self.counters.get_lock():
+            values = list(self.counters)
+        width = len(SHARD_COUNTERS)
+        return [dict(zip(SHARD_COUNTERS, values[shard * width:(shard + 1) * width]))
+                for shard in range(self.num_shards)]
+
+
+class ShardRoutingSystem(InterviewRoutingSystem):
+    
+    def __init__(self, shard_id: int, categories: List[str], broker: LocalBroker, rag_system,
+                 steal_threshold: int = 8, **router_kwargs):
+        self.shard_id = shard_id
+        self.categories = set(categories)
+        self.broker = broker
+        self.steal_threshold = steal_threshold
+        super().__init__(rag_system, **router_kwargs)
+        
+        self.feeder_thread = threading.Thread(target=self._feed, name=f"shard-{shard_id}-feeder", daemon=True)
+        self.feeder_thread.start()
+    
+    def _owns_interviewer(self, data: Dict[str, Any]) -> bool:
+        return interviewer_category(data["specialties"]) in self.categories
+    
+    def _free_capacity(self) -> int:
+        return self.metrics.total_capacity - self.metrics.current_load
+    
+    def _publish_counters(self, free_capacity: int):
+        self.broker.set(self.shard_id, "free_capacity", free_capacity)
+        self.broker.set(self.shard_id, "assigned", self.total_queries_processed)
+        self.broker.set(self.shard_id, "waiting", len(self.waiting_room))
+    
+    def _accept(self, message: Dict[str, Any]):
+        query = self._create_query(
+            message["customer_id"], message["query_text"], QueryPriority[message["priority"]],
+            message["expected_duration"], message["category"]
+        )
+        query.query_id = message["query_id"]
+        query.timestamp = datetime.fromtimestamp(message["submitted_at"])
+        self.query_queue.put(query)
+        self.metrics.count("submitted", query.priority.name)
+    
+    def _feed(self):
+        while self.running:
+            free_capacity = self._free_capacity()
+            self._publish_counters(free_capacity)
+            
+            if self.query_queue.qsize() >= min(free_capacity, self.batch_size):
+                time.sleep(0.005)
+                continue
+            
+            message = self.broker.consume(self.shard_id)
+            if message is None:
+                message = self.broker.steal(self.shard_id, self.steal_threshold)
+            if message is not None:
+                self._accept(message)
+    
+    def shutdown(self):
+        self.running = False
+        if self.feeder_thread.is_alive():
+            self.feeder_thread.join(timeout=2)
+        super().shutdown()
+
+
+def _run_shard(shard_id: int, categories: List[str], broker: LocalBroker, rag_factory: Callable,
+               router_kwargs: Dict[str, Any], fleet_copies: int, max_capacity: Optional[int],
+               interview_duration: Optional[Callable], steal_threshold: int, stop_event, results):
+    routing_system = ShardRoutingSystem(shard_id, categories, broker, rag_factory(),
+                                        steal_threshold=steal_threshold, **router_kwargs)
+    routing_system.verbose = False
+    routing_system.scale_fleet(fleet_copies, max_capacity)
+    if interview_duration is not None:
+        routing_system.interview_duration = interview_duration
+    broker.set(shard_id, "ready", 1)
+    
+    try:
+        stop_event.wait()
+    finally:
+        status = routing_system.get_system_status()
+        routing_system.shutdown()
+        results.put((shard_id, status))
+
+
+class ShardedRoutingSystem:
+    
+    def __init__(self, num_shards: Optional[int] = None, rag_factory: Callable = QdrantRAG,
+                 router_kwargs: Optional[Dict[str, Any]] = None, fleet_copies: int = 1,
+                 max_capacity: Optional[int] = None, interview_duration: Optional[Callable] = None,
+                 steal_threshold: int = 8, history_dir: Optional[str] = "assignment_history",
+                 start_method: Optional[str] = "spawn"):
+        categories = ProductCategorizer.all_categories()
+        self.num_shards = min(num_shards or os.cpu_count() or 1, len(categories))
+        self.category_shards = category_shards(self.num_shards)
+        
+        context = mp.get_context(start_method)
+        self.broker = LocalBroker(self.num_shards, context)
+        self.stop_event = context.Event()
+        self.results = context.Queue()
+        self.shard_categories = [
+            [category for category, shard in self.category_shards.items() if shard == shard_id]
+            for shard_id in range(self.num_shards)
+        ]
+        
+        self.processes = []
+        for shard_id in range(self.num_shards):
+            shard_kwargs = dict(router_kwargs or {})
+            shard_kwargs["history_dir"] = (os.path.join(history_dir, f"shard_{shard_id:02d}")
+                                           if history_dir is not None else None)
+            process = context.Process(
+                target=_run_shard,
+                args=(shard_id, self.shard_categories[shard_id], self.broker, rag_factory, shard_kwargs,
+                      fleet_copies, max_capacity, interview_duration, steal_threshold,
+                      self.stop_event, self.results),
+                name=f"router-shard-{shard_id}",
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+    
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not all(self.broker.get(shard, "ready") for shard in range(self.num_shards)):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            if not all(process.is_alive() for process in self.processes):
+                return False
+            time.sleep(0.05)
+        return True
+    
+    def _route(self, query_text: str, category: str) -> int:
+        if category == ProductCategorizer.DEFAULT_CATEGORY or category not in self.category_shards:
+            category = ProductCategorizer.categorize(query_text)
+        
+        shard = self.category_shards.get(category)
+        if shard is not None:
+            return shard
+        
+        return max(range(self.num_shards),
+                   key=lambda shard: self.broker.get(shard, "free_capacity") - self.broker.get(shard, "depth"))
+    
+    def submit_query(self, customer_id: str, query_text: str,
+                     priority: QueryPriority = QueryPriority.NORMAL,
+                     expected_duration: int = 60,
+                     category: str = "general") -> str:
+        
+        query_id = f"Q_{uuid.uuid4().hex[:8]}"
+        self.broker.publish(self._route(query_text, category), {
+            "query_id": query_id,
+            "customer_id": customer_id,
+            "query_text": query_text,
+            "priority": priority.name,
+            "expected_duration": expected_duration,
+            "category": category,
+            "submitted_at": time.time()
+        })
+        return query_id
+    
+    def get_system_status(self) -> Dict[str, Any]:
+        shards = self.broker.snapshot()
+        for shard_id, counters in enumerate(shards):
+            counters["categories"] = self.shard_categories[shard_id]
+            counters["alive"] = self.processes[shard_id].is_alive()
+        
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "num_shards": self.num_shards,
+            "queue_size": sum(shard["depth"] for shard in shards),
+            "waiting_room_size": sum(shard["waiting"] for shard in shards),
+            "total_queries_processed": sum(shard["assigned"] for shard in shards),
+            "stolen": sum(shard["stolen"] for shard in shards),
+            "shards": shards
+        }
+    
+    def shutdown(self, timeout: float = 10.0) -> Dict[int, Dict[str, Any]]:
+        print("Shutting down sharded routing system...")
+        self.stop_event.set()
+        
+        statuses = {}
+        deadline = time.monotonic() + timeout
+        while len(statuses) < len(self.processes) and time.monotonic() < deadline:
+            try:
+                shard_id, status = self.results.get(timeout=max(deadline - time.monotonic(), 0.01))
+            except queue.Empty:
+                break
+            statuses[shard_id] = status
+        
+        for process in self.processes:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+        print("Sharded routing system shutdown complete.")
+        return statuses
+
+
+def run_benchmark(num_shards: int, num_queries: int, workers_per_shard: int = 4, batch_size: int = 16,
+                  rag_latency_ms: float = 2.0, rag_per_query_ms: float = 0.5,
+                  max_capacity: int = 100000, interview_seconds: float = 60.0,
+                  steal_threshold: int = 8, category_mix: Optional[Dict[str, float]] = None,
+                  products_path: str = "products.txt", timeout: float = 120.0,
+                  seed: Optional[int] = None) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    catalog = QueryCatalog(products_path, category_mix)
+    queries = [catalog.sample(rng) for _ in range(num_queries)]
+    
+    routing_system = ShardedRoutingSystem(
+        num_shards,
+        rag_factory=functools.partial(LatencyStubRAG, rag_latency_ms, rag_per_query_ms),
+        router_kwargs={"num_workers": workers_per_shard, "batch_size": batch_size},
+        max_capacity=max_capacity,
+        interview_duration=FixedInterviewDuration(interview_seconds),
+        steal_threshold=steal_threshold,
+        history_dir=None
+    )
+    try:
+        if not routing_system.wait_ready(timeout=60):
+            raise RuntimeError("Router shards failed to start")
+        
+        started = time.monotonic()
+        for index, (query_text, category) in enumerate(queries):
+            routing_system.submit_query(f"BENCH_{index:07d}", query_text, category=category)
+        submitted_in = time.monotonic() - started
+        
+        deadline = started + timeout
+        while time.monotonic() < deadline:
+            status = routing_system.get_system_status()
+            if status["total_queries_processed"] + status["waiting_room_size"] >= num_queries:
+                break
+            time.sleep(0.01)
+        elapsed = time.monotonic() - started
+        status = routing_system.get_system_status()
+    finally:
+        shard_statuses = routing_system.shutdown()
+    
+    routed = status["total_queries_processed"] + status["waiting_room_size"]
+    return {
+        "num_shards": routing_system.num_shards,
+        "queries": num_queries,
+        "routed": routed,
+        "submit_seconds": round(submitted_in, 3),
+        "elapsed_seconds": round(elapsed, 3),
+        "routed_throughput": round(routed / elapsed, 2) if elapsed > 0 else 0.0,
+        "stolen": status["stolen"],
+        "shards": status["shards"],
+        "assignment_latency_ms": {
+            shard_id: shard_status["metrics"]["latency_ms"]["assignment_latency_ms"]
+            for shard_id, shard_status in sorted(shard_statuses.items())
+        }
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the multi-process sharded router")
+    parser.add_argument("--shards", default="1,2,4", help="Comma-separated shard counts to compare")
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=4, help="Router worker threads per shard")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--rag-latency-ms", type=float, default=2.0)
+    parser.add_argument("--rag-per-query-ms", type=float, default=0.5)
+    parser.add_argument("--max-capacity", type=int, default=100000)
+    parser.add_argument("--steal-threshold", type=int, default=8)
+    parser.add_argument("--products", default="products.txt")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    
+    for num_shards in [int(value) for value in args.shards.split(",")]:
+        result = run_benchmark(
+            num_shards, args.queries,
+            workers_per_shard=args.workers,
+            batch_size=args.batch_size,
+            rag_latency_ms=args.rag_latency_ms,
+            rag_per_query_ms=args.rag_per_query_ms,
+            max_capacity=args.max_capacity,
+            steal_threshold=args.steal_threshold,
+            products_path=args.products,
+            seed=args.seed
+        )
+        print(f"shards={result['num_shards']} routed={result['routed']}/{result['queries']} "
+              f"throughput={result['routed_throughput']:.1f}/s stolen={result['stolen']}")
+        print(json.dumps(result["shards"], indent=2))
@@ -0,0 +1,337 @@
+import argparse
+import heapq
+import itertools
+import json
+import random
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from routing import (RoutingCore, CustomerQuery, InterviewAssignment, QueryPriority,
+                     PRIORITY_SEARCH_TIERS, wait_budgets_by_level)
+from query_scheduler import QueryScheduler
+from demographic_index import DemographicIndex
+from bulk_profiles import load_demographic_index
+
+Arrival = Union[Tuple[float, str, str, QueryPriority, int, str],
+                Tuple[float, str, str, QueryPriority, int, str, Optional[Dict[str, Any]]]]
+
+
+class VirtualClock:
+    
+    def __init__(self, start: float = 0.0):
+        self.now = start
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance_to(self, timestamp: float):
+        self.now = max(self.now, timestamp)
+
+
+class StubRAG:
+    model = None
+    
+    def __init__(self, population: int = 500, interviewees_per_query: int = 3):
+        self.population = population
+        self.interviewees_per_query = interviewees_per_query
+        self._cache: Dict[str, List[str]] = {}
+    
+    def _interviewees(self, user_query: str, interviewee_ids: Optional[List[str]] = None) -> List[str]:
+        if interviewee_ids is not None:
+            rng = random.Random(zlib.crc32(user_query.encode('utf-8')))
+            return rng.sample(list(interviewee_ids), min(self.interviewees_per_query, len(interviewee_ids)))
+        
+        interviewees = self._cache.get(user_query)
+        if interviewees is None:
+            rng = random.Random(zlib.crc32(user_query.encode('utf-8')))
+            picks = rng.sample(range(self.population), min(self.interviewees_per_query, self.population))
+            interviewees = [f"INT_{pick:03d}" for pick in picks]
+            if len(self._cache) < 100000:
+                self._cache[user_query] = interviewees
+        return list(interviewees)
+    
+    def query_with_embedding(self, user_query: str, category: Optional[str] = None,
+                             tier=None, latency_budget_ms: Optional[float] = None,
+                             interviewee_ids: Optional[List[str]] = None):
+        return self._interviewees(user_query, interviewee_ids), [], None
+    
+    def query(self, user_query: str, category: Optional[str] = None,
+              tier=None, latency_budget_ms: Optional[float] = None,
+              interviewee_ids: Optional[List[str]] = None):
+        relevant_interviewees, detailed_results, _ = self.query_with_embedding(
+            user_query, category, tier, interviewee_ids=interviewee_ids
+        )
+        return relevant_interviewees, detailed_results
+    
+    def query_batch_with_embeddings(self, user_queries: List[str], categories=None, tiers=None,
+                                    interviewee_ids=None):
+        interviewee_ids = interviewee_ids or [None] * len(user_queries)
+        return [self.query_with_embedding(user_query, interviewee_ids=ids)
+                for user_query, ids in zip(user_queries, interviewee_ids)]
+    
+    def query_batch(self, user_queries: List[str], categories=None, tiers=None, interviewee_ids=None):
+        interviewee_ids = interviewee_ids or [None] * len(user_queries)
+        return [self.query(user_query, interviewee_ids=ids) for user_query, ids in zip(user_queries, interviewee_ids)]
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        return {}
+
+
+class RecordedRAG(StubRAG):
+    
+    def __init__(self, path: str, fallback: Optional[StubRAG] = None):
+        super().__init__()
+        self.fallback = fallback or StubRAG()
+        self.recordings: Dict[str, Tuple[List[str], List[Dict[str, Any]]]] = {}
+        self.hits = 0
+        self.misses = 0
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    self.recordings[record["query"]] = (record["interviewees"], record.get("detailed_results", []))
+    
+    @staticmethod
+    def record(rag_system, user_queries: Iterable[str], path: str) -> int:
+        count = 0
+        with open(path, 'w', encoding='utf-8') as f:
+            for user_query in user_queries:
+                interviewee_ids, detailed_results = rag_system.query(user_query)
+                f.write(json.dumps({
+                    "query": user_query,
+                    "interviewees": interviewee_ids,
+                    "detailed_results": detailed_results
+                }) + "\n")
+                count += 1
+        return count
+    
+    def query_with_embedding(self, user_query: str, category: Optional[str] = None,
+                             tier=None, latency_budget_ms: Optional[float] = None,
+                             interviewee_ids: Optional[List[str]] = None):
+        recorded = self.recordings.get(user_query)
+        if recorded is None:
+            self.misses += 1
+            return self.fallback.query_with_embedding(user_query, category, tier, interviewee_ids=interviewee_ids)
+        
+        self.hits += 1
+        if interviewee_ids is not None:
+            allowed = set(interviewee_ids)
+            return [interviewee for interviewee in recorded[0] if interviewee in allowed], recorded[1], None
+        return recorded[0], recorded[1], None
+
+
+class SimulatedRoutingSystem(RoutingCore):
+    
+    def __init__(self, rag_system=None, start_time: Optional[datetime] = None,
+                 monitor_interval: float = 30.0, aging_seconds: float = 30.0,
+                 interview_duration: Optional[Callable[[InterviewAssignment], float]] = None,
+                 seed: Optional[int] = None, history_dir: Optional[str] = None,
+                 demographic_index: Optional[DemographicIndex] = None):
+        if seed is not None:
+            random.seed(seed)
+        
+        self.virtual_clock = VirtualClock()
+        self.start_time = start_time or datetime.now()
+        self.events = []
+        self._sequence = itertools.count()
+        
+        super().__init__(rag_system or StubRAG(), history_dir, clock=self.virtual_clock)
+        self.demographic_index = demographic_index
+        self.verbose = False
+        self.query_queue = QueryScheduler(wait_budgets_by_level(), aging_seconds=aging_seconds,
+                                          clock=self.virtual_clock)
+        
+        if interview_duration is not None:
+            self.interview_duration = interview_duration
+        self.monitor_interval = monitor_interval
+        self.timeline: List[Dict[str, float]] = []
+        self.events_processed = 0
+        
+        self.schedule(monitor_interval, self._monitor_tick)
+    
+    def _now(self) -> datetime:
+        return self.start_time + timedelta(seconds=self.virtual_clock())
+    
+    def schedule(self, delay_seconds: float, callback: Callable, *args) -> int:
+        return self.schedule_at(self.virtual_clock() + delay_seconds, callback, *args)
+    
+    def schedule_at(self, timestamp: float, callback: Callable, *args) -> int:
+        event_id = next(self._sequence)
+        heapq.heappush(self.events, (timestamp, event_id, callback, args))
+        return event_id
+    
+    def submit_query(self, customer_id: str, query_text: str,
+                     priority: QueryPriority = QueryPriority.NORMAL,
+                     expected_duration: int = 60,
+                     category: str = "general",
+                     demographics: Optional[Dict[str, Any]] = None) -> str:
+        query = self._create_query(customer_id, query_text, priority, expected_duration, category)
+        self._attach_demographics(query, demographics)
+        self.query_queue.push(query)
+        self.metrics.count("submitted", priority.name)
+        self._dispatch()
+        return query.query_id
+    
+    def add_arrivals(self, arrivals: Iterable[Arrival]):
+        self._schedule_next_arrival(iter(arrivals))
+    
+    def _schedule_next_arrival(self, arrivals: Iterator[Arrival]):
+        arrival = next(arrivals, None)
+        if arrival is not None:
+            self.schedule_at(arrival[0], self._arrive, arrival, arrivals)
+    
+    def _arrive(self, arrival: Arrival, arrivals: Iterator[Arrival]):
+        self.submit_query(*arrival[1:])
+        self._schedule_next_arrival(arrivals)
+    
+    def _dispatch(self):
+        while True:
+            query = self.query_queue.pop()
+            if query is None:
+                return
+            
+            self.metrics.observe("queue_wait_ms", self._query_age_ms(query))
+            assignment = self._process_query(query)
+            if assignment:
+                self._register_assignment(assignment)
+                self._log_assignment(assignment)
+                self._simulate_interview_progress(assignment)
+    
+    def _process_query(self, query: CustomerQuery) -> Optional[InterviewAssignment]:
+        rag_result = self.rag_system.query_with_embedding(
+            query.query_text, query.category, tier=PRIORITY_SEARCH_TIERS[query.priority],
+            interviewee_ids=query.interviewee_ids
+        )
+        self.metrics.observe("rag_latency_ms", 0.0)
+        
+        best_interviewer = self._reserve_or_park(query, rag_result)
+        
+        if not best_interviewer:
+            return None
+        
+        return self._create_assignment(query, best_interviewer, rag_result[0])
+    
+    def _simulate_interview_progress(self, assignment: InterviewAssignment):
+        self.completion_timers[assignment.assignment_id] = self.schedule(
+            self.interview_duration(assignment), self._complete_interview, assignment
+        )
+    
+    def _complete_interview(self, assignment: InterviewAssignment):
+        self._release_assignment(assignment, "completed")
+    
+    def cancel_assignment(self, assignment_id: str) -> bool:
+        assignment = self.active_assignments.get(assignment_id)
+        return bool(assignment) and self._release_assignment(assignment, "cancelled")
+    
+    def _monitor_tick(self):
+        self._update_metrics()
+        self._simulate_status_changes()
+        self.timeline.append({
+            "time_s": self.virtual_clock(),
+            "queue_size": self.query_queue.qsize(),
+            "waiting_room_size": len(self.waiting_room),
+            "active_assignments": len(self.active_assignments),
+            "utilization": round(self.metrics.utilization(), 2)
+        })
+        
+        if self.events or self.active_assignments or self.waiting_room:
+            self.schedule(self.monitor_interval, self._monitor_tick)
+    
+    def run(self, until: Optional[float] = None, max_events: Optional[int] = None) -> Dict[str, Any]:
+        started = time.perf_counter()
+        processed = 0
+        
+        while self.events:
+            timestamp, _, callback, args = self.events[0]
+            if until is not None and timestamp > until:
+                break
+            if max_events is not None and processed >= max_events:
+                break
+            
+            heapq.heappop(self.events)
+            self.virtual_clock.advance_to(timestamp)
+            callback(*args)
+            processed += 1
+        
+        if until is not None:
+            self.virtual_clock.advance_to(until)
+        
+        self.events_processed += processed
+        return self.report(time.perf_counter() - started)
+    
+    def report(self, wall_seconds: Optional[float] = None) -> Dict[str, Any]:
+        snapshot = self.metrics.snapshot()
+        report = {
+            "virtual_seconds": round(self.virtual_clock(), 1),
+            "events_processed": self.events_processed,
+            "interviewers": len(self.interviewers),
+            "total_capacity": self.metrics.total_capacity,
+            "active_assignments": len(self.active_assignments),
+            "waiting_room_size": len(self.waiting_room),
+            "queue_stats": {
+                QueryPriority(level).name: stats for level, stats in self.query_queue.snapshot().items()
+            },
+            "events": snapshot["events"],
+            "latency_ms": snapshot["latency_ms"],
+            "peak_waiting_room": max((point["waiting_room_size"] for point in self.timeline), default=0),
+            "mean_utilization": round(
+                sum(point["utilization"] for point in self.timeline) / len(self.timeline), 2
+            ) if self.timeline else 0.0
+        }
+        if wall_seconds is not None:
+            report["wall_seconds"] = round(wall_seconds, 2)
+            report["events_per_second"] = round(self.events_processed / wall_seconds, 1) if wall_seconds > 0 else 0.0
+        return report
+
+
+def poisson_arrivals(count: int, rate_per_second: float, query_texts: List[str],
+                     priority_weights: Optional[Dict[QueryPriority, float]] = None,
+                     seed: Optional[int] = None,
+                     demographics: Optional[Dict[str, Any]] = None) -> Iterator[Arrival]:
+    rng = random.Random(seed)
+    priority_weights = priority_weights or {
+        QueryPriority.LOW: 0.2, QueryPriority.NORMAL: 0.5, QueryPriority.HIGH: 0.2, QueryPriority.URGENT: 0.1
+    }
+    priorities = list(priority_weights)
+    weights = list(priority_weights.values())
+    
+    timestamp = 0.0
+    for i in range(count):
+        timestamp += rng.expovariate(rate_per_second)
+        yield (timestamp, f"SIM_{i:07d}", rng.choice(query_texts),
+               rng.choices(priorities, weights)[0], rng.randint(45, 75), "general", demographics)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Discrete-event simulation of the interview routing system")
+    parser.add_argument("--queries", type=int, default=100000)
+    parser.add_argument("--rate", type=float, default=0.5, help="Mean arrivals per virtual second")
+    parser.add_argument("--fleet-copies", type=int, default=1, help="Replicate the interviewer fleet N times")
+    parser.add_argument("--max-capacity", type=int, default=None, help="Override max_capacity for every interviewer")
+    parser.add_argument("--recorded-rag", default=None, help="JSONL file of recorded RAG results")
+    parser.add_argument("--profiles-dir", default=None, help="bulk_profiles.py columnar output for demographic filters")
+    parser.add_argument("--demographics", default=None, help='JSON filter for every arrival, e.g. {"region": "west"}')
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    rag_system = RecordedRAG(args.recorded_rag) if args.recorded_rag else StubRAG()
+    demographic_index = load_demographic_index(args.profiles_dir) if args.profiles_dir else None
+    demographics = json.loads(args.demographics) if args.demographics else None
+    simulation = SimulatedRoutingSystem(rag_system, seed=args.seed, demographic_index=demographic_index)
+    simulation.scale_fleet(args.fleet_copies, args.max_capacity)
+    
+    query_texts = [
+        "What are some favorites in the headphones category and what makes them successful",
+        "What do users think of my airfryer lineup of the brand COSORI",
+        "What features do popular non-analog watches on the market have",
+        "How does battery life play into consumer appeal",
+        "Why are electric toothbrushes popular",
+        "What makes a good fitness tracker",
+        "Kitchen appliance preferences for small apartments",
+    ]
+    simulation.add_arrivals(poisson_arrivals(args.queries, args.rate, query_texts, seed=args.seed,
+                                             demographics=demographics))
+    
+    print(json.dumps(simulation.run(), indent=2))
@@ -0,0 +1,85 @@
+import itertools
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class WaitingEntry:
+    __slots__ = ("query", "rag_result", "specialties", "sequence")
+    
+    def __init__(self, query, rag_result: Any, specialties: List[str], sequence: int):
+        self.query = query
+        self.rag_result = rag_result
+        self.specialties = specialties
+        self.sequence = sequence
+
+
+class WaitingRoom:
+    
+    def __init__(self):
+        self._levels: Dict[int, "OrderedDict[str, WaitingEntry]"] = {}
+        self._by_specialty: Dict[Tuple[int, str], "OrderedDict[str, WaitingEntry]"] = {}
+        self._entries: Dict[str, WaitingEntry] = {}
+        self._sequence = itertools.count()
+        
+        self.parked = 0
+        self.admitted = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, query_id: str) -> bool:
+        return query_id in self._entries
+    
+    def park(self, query, rag_result: Any, specialties: List[str]) -> WaitingEntry:
+        entry = WaitingEntry(query, rag_result, specialties, next(self._sequence))
+        level = query.priority.value
+        self._entries[query.query_id] = entry
+        self._levels.setdefault(level, OrderedDict())[query.query_id] = entry
+        for specialty in specialties:
+            self._by_specialty.setdefault((level, specialty), OrderedDict())[query.query_id] = entry
+        
+        self.parked += 1
+        return entry
+    
+    def remove(self, query_id: str) -> Optional[WaitingEntry]:
+        entry = self._entries.pop(query_id, None)
+        if entry is None:
+            return None
+        
+        level = entry.query.priority.value
+        entries = self._levels[level]
+        del entries[query_id]
+        if not entries:
+            del self._levels[level]
+        
+        for specialty in entry.specialties:
+            waiting = self._by_specialty[(level, specialty)]
+            del waiting[query_id]
+            if not waiting:
+                del self._by_specialty[(level, specialty)]
+        
+        return entry
+    
+    def peek(self, specialties: Iterable[str] = ()) -> Optional[WaitingEntry]:
+        if not self._levels:
+            return None
+        
+        level = max(self._levels)
+        matching = [
+            next(iter(self._by_specialty[(level, specialty)].values()))
+            for specialty in specialties
+            if (level, specialty) in self._by_specialty
+        ]
+        if matching:
+            return min(matching, key=lambda entry: entry.sequence)
+        
+        return next(iter(self._levels[level].values()))
+    
+    def pop(self, query_id: str) -> Optional[WaitingEntry]:
+        entry = self.remove(query_id)
+        if entry is not None:
+            self.admitted += 1
+        return entry
+    
+    def depth_by_priority(self) -> Dict[int, int]:
+        return {priority: len(level) for priority, level in self._levels.items()}